@@ -6,17 +6,15 @@
 - time.py: أداة معرفة الوقت والتاريخ
 - web_search.py: أدوات البحث على الإنترنت
 - system_control.py: أدوات التحكم في النظام
+- registry.py: سجل الأدوات الكسول (لا تُستورد الأداة إلا عند أول استخدام)
+- intents.py: مواصفات النوايا (الكلمات المفتاحية، المستخرجات، الأداة ومعاملاتها)
+- intent_classifier.py: مصنف نوايا خفيف للأوامر التي لا تطابق الكلمات المفتاحية (قبل النموذج)
+- gazetteer.py: قواميس المدن والفنانين والتطبيقات والمواقع (من data/gazetteers/)
 
 المطور: المساعد الصوتي آدم
 """
 
-from .time import get_time
-from .web_search import search_google, get_website_info, search_and_read, get_news
-from .system_control import (
-    play_music, open_app, show_system_info, list_processes, close_program,
-    create_new_folder, list_files, shutdown_computer, restart_computer,
-    find_files, open_website, set_volume
-)
+from .registry import tool_registry
 
 __version__ = "1.0.0"
 __author__ = "المساعد الصوتي آدم"
@@ -48,14 +46,18 @@ __all__ = [
 ]
 
 
+def __getattr__(name):
+    """استيراد الأداة عند أول وصول إليها بدلاً من وقت استيراد الحزمة"""
+    if name in tool_registry:
+        return tool_registry[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def get_available_tools():
     """إرجاع قائمة بجميع الأدوات المتاحة"""
+    groups = tool_registry.by_intent()
     return {
-        'time_tools': ['get_time'],
-        'web_tools': ['search_google', 'get_website_info', 'search_and_read', 'get_news'],
-        'system_tools': [
-            'play_music', 'open_app', 'show_system_info', 'list_processes',
-            'close_program', 'create_new_folder', 'list_files', 'shutdown_computer',
-            'restart_computer', 'find_files', 'open_website', 'set_volume'
-        ]
+        'time_tools': groups.get('time', []),
+        'web_tools': groups.get('web', []),
+        'system_tools': groups.get('system', [])
     }
\ No newline at end of file
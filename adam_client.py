@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+عميل خفيف لخدمة آدم المقيمة (python main.py --daemon)
+
+الاستخدام:
+    python adam_client.py "افتح الحاسبة"
+    python adam_client.py --speak "ما الوقت" "شغل موسيقى فيروز"
+    python adam_client.py --session kitchen "ابحث عن وصفة كبة"   # أمر جديد بنفس الجلسة يلغي السابق
+"""
+
+import argparse
+import sys
+
+from tools.daemon import DEFAULT_SOCKET_PATH, send_request
+
+
+def main():
+    parser = argparse.ArgumentParser(description="إرسال أوامر إلى خدمة آدم المقيمة")
+    parser.add_argument("commands", nargs="+", help="الأوامر المطلوب تنفيذها (عدة أوامر تُرسل كدفعة واحدة)")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH, help="مسار Unix socket")
+    parser.add_argument("--speak", action="store_true", help="نطق الرد على جهاز الخدمة")
+    parser.add_argument("--session", help="اسم الجلسة: أمر جديد فيها يلغي انتظار أمرها السابق")
+    args = parser.parse_args()
+
+    if len(args.commands) == 1:
+        request = {"command": args.commands[0], "speak": args.speak}
+    else:
+        request = {"commands": args.commands, "speak": args.speak}
+    if args.session:
+        request["session"] = args.session
+
+    try:
+        reply = send_request(request, args.socket)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f"❌ خدمة آدم لا تعمل على {args.socket} - شغل: python main.py --daemon", file=sys.stderr)
+        return 1
+
+    if not reply.get("ok"):
+        print(f"❌ {reply.get('error')}", file=sys.stderr)
+        return 1
+
+    for response in reply.get("responses", [reply.get("response")]):
+        print(response)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
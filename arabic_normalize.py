@@ -0,0 +1,57 @@
+# tools/arabic_normalize.py
+
+"""
+توحيد كتابة النص العربي قبل أي مقارنة
+
+- توحيد الألف والهمزات: أ إ آ ٱ → ا ، ؤ → و ، ئ → ي
+- التاء المربوطة → هاء ، الألف المقصورة → ياء
+- حذف التشكيل والتطويل
+- تحويل الأرقام العربية الهندية (٠-٩ و ۰-۹) إلى 0-9
+
+هكذا "آدم" = "ادم" و"الحرارة" = "الحراره" بدون تكرار الصيغ في جداول الكلمات.
+"""
+
+import re
+
+_TRANSLATION = str.maketrans({
+    **{c: 'ا' for c in 'أإآٱ'},
+    'ؤ': 'و',
+    'ئ': 'ي',
+    'ة': 'ه',
+    'ى': 'ي',
+    'ـ': None,  # التطويل
+    **{chr(c): None for c in range(0x064B, 0x0660)},  # الحركات والشدة والسكون
+    'ٰ': None,  # الألف الخنجرية
+    **{chr(0x0660 + i): str(i) for i in range(10)},
+    **{chr(0x06F0 + i): str(i) for i in range(10)},
+})
+
+_SPACES = re.compile(r"\s+")
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+def normalize_arabic(text):
+    """الصيغة الموحدة للنص (للمقارنة فقط - لا تُعرض للمستخدم)"""
+    if not text:
+        return ""
+    return _SPACES.sub(" ", text.translate(_TRANSLATION).lower()).strip()
+
+
+def strip_punctuation(text):
+    """استبدال علامات الترقيم بمسافات ("القاهرة؟" ← "القاهرة")"""
+    return _PUNCTUATION.sub(" ", text)
+
+
+def normalized_words(text, normalized=False):
+    """كلمات النص بعد التوحيد وحذف علامات الترقيم"""
+    return strip_punctuation(text if normalized else normalize_arabic(text)).split()
+
+
+class NormalizedIndex:
+    """مجموعة كلمات بمفاتيح موحدة تُحسب مرة واحدة عند الإنشاء"""
+
+    def __init__(self, words):
+        self._keys = frozenset(normalize_arabic(word) for word in words)
+
+    def __contains__(self, text):
+        return normalize_arabic(text) in self._keys
@@ -0,0 +1,174 @@
+# tools/asr.py
+
+"""
+محركات التعرف على الكلام (ASR)
+
+- google: خدمة Google عبر speech_recognition (تحتاج إنترنت، تدعم اللهجات)
+- vosk:   محرك محلي على المعالج بدون إنترنت (pip install vosk + نموذج عربي)
+- fake:   محرك ثابت النتائج للاختبارات بدون ميكروفون أو شبكة
+
+يتم الاختيار من قسم "asr" في config.json، وكل محرك يقيس زمن كل استدعاء.
+"""
+
+import json
+import os
+import statistics
+import threading
+import time
+
+import speech_recognition as sr
+
+
+class ASRBackend:
+    """الواجهة المشتركة لمحركات التعرف على الكلام"""
+
+    name = "base"
+    supports_dialects = False  # هل يغير معامل language النتيجة؟
+
+    def __init__(self):
+        self.latencies = []
+        self._lock = threading.Lock()
+
+    def transcribe(self, audio, language):
+        """إرجاع قائمة بدائل [(النص، الثقة أو None)] أو رفع sr.UnknownValueError / sr.RequestError"""
+        raise NotImplementedError
+
+    def recognize(self, audio, language="ar-SA"):
+        """أفضل بديل (النص، الثقة) مع تسجيل زمن الاستدعاء"""
+        start = time.perf_counter()
+        try:
+            alternatives = self.transcribe(audio, language)
+        finally:
+            with self._lock:
+                self.latencies.append((time.perf_counter() - start) * 1000)
+
+        if not alternatives:
+            raise sr.UnknownValueError()
+        return max(alternatives, key=lambda alt: alt[1] or 0)
+
+    @property
+    def last_latency_ms(self):
+        return self.latencies[-1] if self.latencies else None
+
+    def latency_summary(self):
+        """ملخص الزمن (ms) لمقارنة المحركات على هذا الجهاز"""
+        with self._lock:
+            values = list(self.latencies)
+        if not values:
+            return {}
+        return {
+            "backend": self.name,
+            "count": len(values),
+            "mean_ms": round(statistics.mean(values), 1),
+            "median_ms": round(statistics.median(values), 1)
+        }
+
+
+class GoogleBackend(ASRBackend):
+    """التعرف عبر Google Speech API (المسار الأصلي)"""
+
+    name = "google"
+    supports_dialects = True
+
+    def __init__(self, recognizer=None):
+        super().__init__()
+        self.recognizer = recognizer or sr.Recognizer()
+
+    def transcribe(self, audio, language):
+        result = self.recognizer.recognize_google(audio, language=language, show_all=True)
+        # الإصدارات القديمة من speech_recognition ترجع [] بدلاً من UnknownValueError
+        alternatives = result.get("alternative", []) if isinstance(result, dict) else []
+        return [(alt["transcript"], alt.get("confidence")) for alt in alternatives if "transcript" in alt]
+
+
+class VoskBackend(ASRBackend):
+    """محرك Vosk المحلي على المعالج - بدون إنترنت"""
+
+    name = "vosk"
+    sample_rate = 16000
+
+    def __init__(self, model_path):
+        super().__init__()
+        self.model_path = model_path
+        self._model = None
+
+    @property
+    def model(self):
+        """تحميل النموذج مرة واحدة عند أول استخدام"""
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    try:
+                        from vosk import Model, SetLogLevel
+                    except ImportError:
+                        raise sr.RequestError("مكتبة vosk غير مثبتة - شغل: pip install vosk")
+                    if not os.path.isdir(self.model_path):
+                        raise sr.RequestError(f"نموذج Vosk غير موجود: {self.model_path}")
+                    SetLogLevel(-1)
+                    self._model = Model(self.model_path)
+        return self._model
+
+    def transcribe(self, audio, language):
+        from vosk import KaldiRecognizer
+
+        recognizer = KaldiRecognizer(self.model, self.sample_rate)
+        recognizer.SetWords(True)
+        recognizer.AcceptWaveform(audio.get_raw_data(convert_rate=self.sample_rate, convert_width=2))
+        result = json.loads(recognizer.FinalResult())
+
+        text = result.get("text", "").strip()
+        if not text:
+            return []
+        words = result.get("result", [])
+        confidence = statistics.mean(w["conf"] for w in words) if words else None
+        return [(text, confidence)]
+
+
+class FakeBackend(ASRBackend):
+    """محرك ثابت للاختبارات: يرجع النصوص المحددة بالترتيب"""
+
+    name = "fake"
+
+    def __init__(self, transcripts=None, default=None, latency_ms=0):
+        super().__init__()
+        self.transcripts = list(transcripts or [])
+        self.default = default
+        self.latency_ms = latency_ms
+        self.calls = []
+
+    def transcribe(self, audio, language):
+        self.calls.append(language)
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        if self.transcripts:
+            text = self.transcripts.pop(0)
+        else:
+            text = self.default
+        return [(text, 1.0)] if text else []
+
+
+def create_backend(config=None, recognizer=None):
+    """إنشاء محرك التعرف حسب قسم "asr" في config.json"""
+    config = config or {}
+    backend = config.get("backend", "google")
+
+    if backend == "vosk":
+        return VoskBackend(config.get("vosk_model_path", os.path.join("models", "vosk-model-ar")))
+    if backend == "fake":
+        return FakeBackend(config.get("fake_transcripts"), config.get("fake_default"))
+    if backend != "google":
+        print(f"⚠️ محرك تعرف غير معروف '{backend}' - سيتم استخدام google")
+    return GoogleBackend(recognizer)
+
+
+def compare_backends(audio, backends, language="ar-SA"):
+    """تشغيل نفس التسجيل على عدة محركات لاختيار الأسرع المناسب لهذا الجهاز"""
+    results = []
+    for backend in backends:
+        try:
+            text, confidence = backend.recognize(audio, language)
+        except (sr.UnknownValueError, sr.RequestError) as e:
+            text, confidence = None, None
+            print(f"⚠️ {backend.name}: {e or 'لم يتم التعرف'}")
+        results.append((backend.name, text, confidence, backend.last_latency_ms))
+    return results
@@ -0,0 +1,299 @@
+# tools/audio_capture.py
+
+"""
+التقاط مستمر من الميكروفون
+
+خيط واحد يبقي الميكروفون مفتوحاً ويكتب إطارات PCM في حلقة (ring buffer) ثابتة الحجم.
+عند اكتشاف الكلام تُضاف نافذة pre-roll من الحلقة إلى بداية المقطع حتى لا تُقص بداية الأمر،
+وتوضع المقاطع الكاملة في طابور يستهلكه باقي النظام بدلاً من فتح الجهاز في كل مرة.
+
+أثناء تشغيل صوت المساعد يستمر رصد الكلام بعتبة أعلى (لتجاهل صدى السماعات)،
+وإذا استمر كلام المستخدم يتم استدعاء on_barge_in ويبدأ مقطع الأمر المقاطِع فوراً.
+أثناء تنفيذ أداة بدون صوت (watch) تبقى العتبة العادية، وبداية أي مقطع تستدعي on_speech.
+"""
+
+import collections
+import queue
+import threading
+import time
+
+import numpy as np
+import speech_recognition as sr
+
+
+class EnergyEndpointer:
+    """تحديد الكلام بمستوى الطاقة - نفس منطق recognizer.listen مع العتبة الديناميكية"""
+
+    def __init__(self, recognizer):
+        self.recognizer = recognizer
+
+    def prepare(self, sample_rate):
+        pass
+
+    def is_speech(self, chunk, seconds):
+        samples = np.frombuffer(chunk, dtype=np.int16).astype(np.float32)
+        energy = float(np.sqrt(np.mean(samples ** 2))) if len(samples) else 0.0
+        speech = energy > self.recognizer.energy_threshold
+
+        if not speech and self.recognizer.dynamic_energy_threshold:
+            # تكيف العتبة مع الضوضاء أثناء إطارات الصمت فقط
+            damping = self.recognizer.dynamic_energy_adjustment_damping ** seconds
+            target = energy * self.recognizer.dynamic_energy_ratio
+            self.recognizer.energy_threshold = self.recognizer.energy_threshold * damping + target * (1 - damping)
+        return speech
+
+    def end_silence_seconds(self):
+        """مدة الصمت التي تنهي المقطع"""
+        return self.recognizer.pause_threshold
+
+    def reset(self):
+        pass
+
+
+class ContinuousCapture:
+    """خيط التقاط دائم مع حلقة إطارات وطابور مقاطع كلام"""
+
+    def __init__(self, recognizer, endpointer=None, ring_seconds=10.0, pre_roll_seconds=0.5,
+                 max_phrase_seconds=None, queue_size=8, barge_in_energy_ratio=3.0, barge_in_seconds=0.3):
+        self.recognizer = recognizer
+        self.endpointer = endpointer or EnergyEndpointer(recognizer)
+        self.ring_seconds = ring_seconds
+        self.pre_roll_seconds = pre_roll_seconds
+        self.max_phrase_seconds = max_phrase_seconds
+        self.utterances = queue.Queue(maxsize=queue_size)
+        self.barge_in_energy_ratio = barge_in_energy_ratio  # كم مرة يجب أن يعلو الكلام فوق العتبة أثناء التشغيل
+        self.barge_in_seconds = barge_in_seconds  # مدة الكلام المستمر قبل إيقاف التشغيل
+
+        self.sample_rate = None
+        self.sample_width = 2
+        self.chunk_seconds = None
+        self.error = None
+        self._ring = None
+        self._state = None
+        self._subscribers = []
+        self._subscribers_lock = threading.Lock()
+        self._muted = threading.Event()
+        self._on_barge_in = None
+        self._on_speech = None
+        self._barge_in_speech = 0.0
+        self._running = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._running.is_set()
+
+    @property
+    def in_utterance(self):
+        """هل يوجد مقطع كلام جارٍ لم ينتهِ بعد؟"""
+        return self._state is not None and self._state.frames is not None
+
+    @property
+    def active(self):
+        """هل خيط الالتقاط يعمل (أو ينتظر انتهاء ضبط الميكروفون)؟"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, mic, mic_lock=None):
+        """بدء خيط الالتقاط (ينتظر mic_lock حتى ينتهي ضبط الميكروفون)"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, args=(mic, mic_lock), name="mic-capture", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running.clear()
+
+    def _run(self, mic, mic_lock):
+        lock = mic_lock or threading.Lock()
+        with lock:
+            try:
+                source_mic = mic() if callable(mic) else mic
+                if source_mic is None:
+                    return
+                with source_mic as source:
+                    self.prepare(source.SAMPLE_RATE, source.SAMPLE_WIDTH, source.CHUNK)
+                    self._running.set()
+                    print("🎙️ بدأ الالتقاط المستمر من الميكروفون")
+
+                    while self._running.is_set():
+                        self.feed(source.stream.read(source.CHUNK))
+            except Exception as e:
+                self.error = e
+                print(f"❌ توقف الالتقاط المستمر: {e}")
+            finally:
+                self._running.clear()
+
+    def prepare(self, sample_rate, sample_width, chunk_size):
+        """تهيئة الحلقة وحالة المقطع لصيغة الجهاز (تُستخدم أيضاً للمحاكاة على ملفات WAV)"""
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.chunk_seconds = chunk_size / sample_rate
+        self._ring = collections.deque(maxlen=max(1, int(self.ring_seconds / self.chunk_seconds)))
+        self._state = _UtteranceState()
+        self.endpointer.prepare(sample_rate)
+
+    def feed(self, chunk):
+        """معالجة إطار PCM واحد: الحلقة، المشتركون، وتحديد حدود المقطع"""
+        chunk_seconds = self.chunk_seconds
+        state = self._state
+        self._ring.append(chunk)
+
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(chunk)
+            except queue.Full:
+                pass  # مستهلك بطيء - لا نوقف الالتقاط من أجله
+
+        speech = self.endpointer.is_speech(chunk, chunk_seconds)
+
+        if state.frames is None and self._on_barge_in is not None:
+            self._check_barge_in(chunk, speech)
+            return
+
+        if state.frames is None:
+            if speech and not self._muted.is_set():
+                # بداية مقطع: نضيف pre-roll من الحلقة (يتضمن الإطار الحالي)
+                pre_roll = max(1, int(self.pre_roll_seconds / chunk_seconds) + 1)
+                state.frames = list(self._ring)[-pre_roll:]
+                state.speech_seconds = chunk_seconds
+                state.silence_seconds = 0.0
+                self._speech_started()
+            return
+
+        state.frames.append(chunk)
+        duration = len(state.frames) * chunk_seconds
+        if speech:
+            state.speech_seconds += chunk_seconds
+            state.silence_seconds = 0.0
+        else:
+            state.silence_seconds += chunk_seconds
+
+        ended = state.silence_seconds >= self.endpointer.end_silence_seconds()
+        too_long = self.max_phrase_seconds and duration >= self.max_phrase_seconds
+        if ended or too_long:
+            if state.speech_seconds >= self.recognizer.phrase_threshold:
+                self._emit(b"".join(state.frames))
+            state.frames = None
+            self.endpointer.reset()
+
+    def _check_barge_in(self, chunk, speech):
+        """أثناء تشغيل صوت المساعد: بدء مقطع فقط عند كلام مستمر أعلى بوضوح من صدى السماعات"""
+        samples = np.frombuffer(chunk, dtype=np.int16).astype(np.float32)
+        energy = float(np.sqrt(np.mean(samples ** 2))) if len(samples) else 0.0
+        if speech and energy > self.recognizer.energy_threshold * self.barge_in_energy_ratio:
+            self._barge_in_speech += self.chunk_seconds
+        else:
+            self._barge_in_speech = 0.0
+            return
+        if self._barge_in_speech < self.barge_in_seconds:
+            return
+
+        # pre-roll يغطي الكلام الذي سبق التأكيد
+        state = self._state
+        frames = max(1, int((self.pre_roll_seconds + self._barge_in_speech) / self.chunk_seconds) + 1)
+        state.frames = list(self._ring)[-frames:]
+        state.speech_seconds = self._barge_in_speech
+        state.silence_seconds = 0.0
+
+        callback, self._on_barge_in = self._on_barge_in, None
+        self._barge_in_speech = 0.0
+        try:
+            callback()
+        except Exception as e:
+            print(f"⚠️ خطأ في إيقاف التشغيل عند المقاطعة: {e}")
+        self._speech_started()
+
+    def _speech_started(self):
+        callback, self._on_speech = self._on_speech, None
+        if callback is None:
+            return
+        try:
+            callback()
+        except Exception as e:
+            print(f"⚠️ خطأ في إلغاء الأمر الجاري عند الكلام: {e}")
+
+    def begin_playback(self, on_barge_in):
+        """تشغيل صوت المساعد: رصد المقاطعة بدلاً من كتم الالتقاط"""
+        self._barge_in_speech = 0.0
+        self._on_barge_in = on_barge_in
+
+    def end_playback(self):
+        self._on_barge_in = None
+
+    def begin_watch(self, on_speech):
+        """أثناء تنفيذ أمر: on_speech عند بداية أي مقطع كلام (بالعتبة العادية، أو بعتبة المقاطعة إذا كان صوت يعمل)"""
+        self._on_speech = on_speech
+
+    def end_watch(self):
+        self._on_speech = None
+
+    def _emit(self, frame_data):
+        audio = sr.AudioData(frame_data, self.sample_rate, self.sample_width)
+        try:
+            self.utterances.put_nowait(audio)
+        except queue.Full:
+            # نحتفظ بالأحدث: إسقاط أقدم مقطع
+            try:
+                self.utterances.get_nowait()
+            except queue.Empty:
+                pass
+            self.utterances.put_nowait(audio)
+
+    def get_utterance(self, timeout=None):
+        """أخذ المقطع التالي من الطابور أو None عند انتهاء المهلة"""
+        try:
+            return self.utterances.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def wait_for_utterance(self, start_timeout, max_seconds=None):
+        """انتظار المقطع التالي: start_timeout لبدء الكلام فقط، والمقطع الجاري يُنتظر حتى ينتهي
+        (بحد أقصى max_seconds، أو max_phrase_seconds)"""
+        now = time.monotonic()
+        start_deadline = now + start_timeout
+        limit = now + (max_seconds or self.max_phrase_seconds or 15.0) + self.endpointer.end_silence_seconds()
+        while True:
+            audio = self.get_utterance(timeout=0.1)
+            if audio is not None:
+                return audio
+            now = time.monotonic()
+            if now >= limit or (now >= start_deadline and not self.in_utterance):
+                return None
+
+    def clear(self):
+        """إسقاط المقاطع المنتظرة (مثلاً بعد التفعيل)"""
+        while True:
+            try:
+                self.utterances.get_nowait()
+            except queue.Empty:
+                return
+
+    def subscribe(self, maxsize=500):
+        """طابور بالإطارات الخام لمستهلك إضافي (مثل رصد كلمة التفعيل)"""
+        subscriber = queue.Queue(maxsize=maxsize)
+        with self._subscribers_lock:
+            self._subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._subscribers_lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+    def mute(self):
+        """عدم بدء مقاطع جديدة (أثناء تشغيل صوت المساعد) - الحلقة تستمر في التسجيل"""
+        self._muted.set()
+
+    def unmute(self):
+        self._muted.clear()
+
+
+class _UtteranceState:
+    __slots__ = ('frames', 'speech_seconds', 'silence_seconds')
+
+    def __init__(self):
+        self.frames = None
+        self.speech_seconds = 0.0
+        self.silence_seconds = 0.0
@@ -0,0 +1,153 @@
+# tools/audio_preprocess.py
+
+"""
+معالجة الصوت قبل التعرف على الكلام (NumPy فقط، بدون حلقات على العينات)
+
+1. تحويل إلى قناة واحدة
+2. إعادة أخذ العينات إلى 16 kHz (بالـ FFT لتجنب التشويه)
+3. إزالة المركبة المستمرة (DC)
+4. بوابة طيفية لكبح الضوضاء باستخدام طيف الضوضاء المحفوظ للميكروفون
+5. توحيد مستوى الصوت
+
+النتيجة مقطع أصغر وأوضح يُرسل إلى محرك التعرف.
+"""
+
+import time
+
+import numpy as np
+import speech_recognition as sr
+
+from .wake_word import pcm_to_float
+
+TARGET_RATE = 16000
+N_FFT = 512
+HOP = N_FFT // 2
+
+
+def resample_fft(signal, rate, target_rate=TARGET_RATE):
+    """إعادة أخذ العينات في مجال التردد (يقص ما فوق تردد نايكويست الجديد)"""
+    if rate == target_rate or len(signal) == 0:
+        return signal
+    length = max(1, int(round(len(signal) * target_rate / rate)))
+    spectrum = np.fft.rfft(signal)
+    bins = length // 2 + 1
+    if bins <= len(spectrum):
+        spectrum = spectrum[:bins]
+    else:
+        spectrum = np.pad(spectrum, (0, bins - len(spectrum)))
+    return (np.fft.irfft(spectrum, length) * (length / len(signal))).astype(np.float32)
+
+
+def _window():
+    # نافذة hann دورية: مجموعها مع تداخل 50% يساوي 1 فيعاد بناء الإشارة بدون تشويه
+    return (0.5 - 0.5 * np.cos(2 * np.pi * np.arange(N_FFT) / N_FFT)).astype(np.float32)
+
+
+def _frames(signal):
+    """إطارات متداخلة (نصف إطار) مع حشو الأطراف"""
+    padded = np.pad(signal, (HOP, HOP + (-len(signal)) % HOP))
+    n_frames = (len(padded) - N_FFT) // HOP + 1
+    index = np.arange(N_FFT)[None, :] + HOP * np.arange(n_frames)[:, None]
+    return padded, index
+
+
+def _smooth(mask, time_width=3, freq_width=5):
+    """تنعيم قناع البوابة في الزمن والتردد لتجنب الضوضاء الموسيقية"""
+    for axis, width in ((0, time_width), (1, freq_width)):
+        pad = [(0, 0), (0, 0)]
+        pad[axis] = (width // 2, width // 2)
+        padded = np.pad(mask, pad, mode='edge')
+        cumsum = np.cumsum(padded, axis=axis, dtype=np.float32)
+        cumsum = np.insert(cumsum, 0, 0, axis=axis)
+        upper = np.take(cumsum, np.arange(width, cumsum.shape[axis]), axis=axis)
+        lower = np.take(cumsum, np.arange(0, cumsum.shape[axis] - width), axis=axis)
+        mask = (upper - lower) / width
+    return mask
+
+
+class AudioPreprocessor:
+    """تجهيز مقاطع الكلام قبل إرسالها لمحرك التعرف"""
+
+    def __init__(self, target_dbfs=-20.0, gate_db=6.0, floor_db=-18.0, max_gain_db=20.0,
+                 noise_spectrum=None, noise_adaptation=0.1):
+        self.target_dbfs = target_dbfs
+        self.gate_db = gate_db  # كم يجب أن يعلو الطيف فوق الضوضاء ليمر
+        self.floor = 10 ** (floor_db / 20)  # تخفيف الضوضاء بدلاً من حذفها كلياً
+        self.max_gain = 10 ** (max_gain_db / 20)
+        self.noise_adaptation = noise_adaptation
+        self.noise_spectrum = None
+        self.timings = []
+        self._window = _window()
+        if noise_spectrum is not None:
+            self.set_noise_spectrum(noise_spectrum)
+
+    def set_noise_spectrum(self, spectrum):
+        spectrum = np.asarray(spectrum, dtype=np.float32)
+        if spectrum.shape == (N_FFT // 2 + 1,):
+            self.noise_spectrum = spectrum
+
+    def noise_from_threshold(self, energy_threshold, dynamic_energy_ratio=1.5):
+        """طيف ضوضاء مسطح من مستوى الطاقة المحفوظ (عند عدم وجود طيف محفوظ)"""
+        noise_rms = energy_threshold / dynamic_energy_ratio / 32768
+        power = noise_rms ** 2 * float(np.sum(self._window ** 2))
+        self.noise_spectrum = np.full(N_FFT // 2 + 1, power, dtype=np.float32)
+
+    def estimate_noise(self, raw, sample_rate, sample_width=2, channels=1):
+        """طيف الضوضاء من تسجيل صمت (أثناء ضبط الميكروفون)"""
+        signal = resample_fft(pcm_to_float(raw, sample_width, channels), sample_rate)
+        signal = signal - signal.mean()
+        padded, index = _frames(signal)
+        power = np.abs(np.fft.rfft(padded[index] * self._window, axis=1)) ** 2
+        self.noise_spectrum = power.mean(axis=0).astype(np.float32)
+        return self.noise_spectrum
+
+    def spectral_gate(self, signal):
+        padded, index = _frames(signal)
+        spectrum = np.fft.rfft(padded[index] * self._window, axis=1)
+        power = np.abs(spectrum) ** 2
+
+        # أهدأ الإطارات في المقطع نفسه (pre-roll والوقفات) تحدّث طيف الضوضاء المحفوظ
+        observed = np.percentile(power, 20, axis=0).astype(np.float32)
+        if self.noise_spectrum is None:
+            self.noise_spectrum = observed
+        else:
+            self.noise_spectrum += self.noise_adaptation * (observed - self.noise_spectrum)
+
+        mask = (power > self.noise_spectrum * 10 ** (self.gate_db / 10)).astype(np.float32)
+        gain = self.floor + (1 - self.floor) * _smooth(mask)
+        frames = np.fft.irfft(spectrum * gain, N_FFT, axis=1).astype(np.float32)
+
+        output = np.zeros(len(padded), dtype=np.float32)
+        np.add.at(output, index, frames)
+        return output[HOP:HOP + len(signal)]
+
+    def normalize(self, signal):
+        """توحيد مستوى الكلام (RMS للإطارات الأعلى) مع حماية من القص"""
+        if len(signal) < HOP:
+            return signal
+        frames = signal[:len(signal) // HOP * HOP].reshape(-1, HOP)
+        energy = np.mean(frames ** 2, axis=1)
+        loud = energy[energy >= np.median(energy)]
+        rms = float(np.sqrt(loud.mean())) if len(loud) else 0.0
+        if rms < 1e-6:
+            return signal
+        gain = min(10 ** (self.target_dbfs / 20) / rms, self.max_gain)
+        peak = float(np.abs(signal).max())
+        gain = min(gain, 0.89 / peak) if peak > 0 else gain  # -1 dBFS
+        return signal * gain
+
+    def process_signal(self, signal, sample_rate):
+        """الإشارة float32 أحادية القناة → إشارة 16 kHz جاهزة للتعرف"""
+        signal = resample_fft(signal, sample_rate)
+        signal = signal - signal.mean()
+        signal = self.spectral_gate(signal)
+        return self.normalize(signal)
+
+    def process(self, audio, channels=1):
+        """AudioData خام → AudioData أحادي 16 kHz بعد كبح الضوضاء وتوحيد المستوى"""
+        start = time.perf_counter()
+        signal = pcm_to_float(audio.get_raw_data(), audio.sample_width, channels)
+        signal = self.process_signal(signal, audio.sample_rate)
+        pcm = (np.clip(signal, -1.0, 1.0) * 32767).astype(np.int16)
+        self.timings.append((time.perf_counter() - start) * 1000)
+        return sr.AudioData(pcm.tobytes(), TARGET_RATE, 2)
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+قياس زمن تحديد النية في process_command: المسح الخطي القديم مقابل IntentMatcher (Aho-Corasick)
+
+الاستخدام:
+    python benchmark_intents.py                    # مجموعة أوامر مولدة (~3000 أمر)
+    python benchmark_intents.py commands.txt       # أمر في كل سطر
+    python benchmark_intents.py logs/history.jsonl # سجل المحادثات (حقل "input")
+"""
+
+import itertools
+import json
+import random
+import statistics
+import sys
+import time
+
+from tools.arabic_normalize import normalize_arabic
+from tools.intent_matcher import IntentMatcher
+
+# نسخة ثابتة من جداول process_command قبل IntentMatcher (للمقارنة)
+WEATHER_KEYWORDS = ['درجة الحرارة', 'درجه الحراره', 'الحرارة', 'الحراره', 'الطقس', 'طقس', 'حرارة', 'حراره']
+TOOL_KEYWORDS = ['شغل', 'تشغيل', 'موسيقى', 'أغنية', 'افتح', 'فتح', 'ابحث', 'بحث', 'أخبار', 'معلومات',
+                 'درجة الحرارة', 'درجه الحراره', 'الحرارة', 'الحراره', 'الطقس', 'طقس', 'حرارة', 'حراره',
+                 'كم درجة', 'كم درجه', 'معلومات النظام', 'العمليات', 'الوقت', 'اطفئ', 'اعد تشغيل', 'انشئ مجلد']
+QUESTION_WORDS = ['ما', 'متى', 'أين', 'لماذا', 'كيف', 'هل']
+KEYWORD_PRIORITY = {
+    'معلومات النظام': 25, 'العمليات': 25, 'الوقت': 25,
+    'اطفئ': 25, 'اعد تشغيل': 25, 'انشئ مجلد': 25,
+    'موسيقى': 15, 'أغنية': 15, 'أخبار': 15,
+}
+
+
+def legacy_intent(command, tool_keywords=TOOL_KEYWORDS):
+    command_lower = command.lower()
+    if any(keyword in command_lower for keyword in WEATHER_KEYWORDS):
+        return 'weather'
+    for keyword in tool_keywords:
+        if keyword in command_lower:
+            return keyword
+    if any(word in command_lower for word in QUESTION_WORDS):
+        return 'question'
+    return None
+
+
+def build_matcher(tool_keywords=TOOL_KEYWORDS):
+    matcher = IntentMatcher()
+    for keyword in WEATHER_KEYWORDS:
+        matcher.add(keyword, 'weather', 30)
+    for keyword in tool_keywords:
+        matcher.add(keyword, keyword, KEYWORD_PRIORITY.get(keyword, 10))
+    for word in QUESTION_WORDS:
+        matcher.add(word, 'question', 0, whole_word=True)
+    return matcher.compile()
+
+
+def matcher_intent(matcher, command):
+    match = matcher.best(normalize_arabic(command), normalized=True)
+    return match.payload if match else None
+
+
+def extra_keywords(count, seed=2):
+    """كلمات إضافية لا تطابق (لقياس أثر نمو جداول الكلمات مع إضافة الأدوات والقواميس)"""
+    rng = random.Random(seed)
+    letters = 'ابتثجحخدذرزسشصضطظعغفقكلمنهوي'
+    return [''.join(rng.choice(letters) for _ in range(rng.randint(4, 9))) for _ in range(count)]
+
+
+def generate_corpus(size=3000, seed=1):
+    """أوامر مولدة من قوالب شائعة مع اختلاف الكتابة (ة/ه، أ/ا، التشكيل)"""
+    rng = random.Random(seed)
+    apps = ['الحاسبة', 'المفكرة', 'الرسام', 'كروم', 'فايرفوكس', 'مدير المهام', 'مستكشف الملفات', 'وورد']
+    cities = ['بغداد', 'القاهرة', 'الرياض', 'دبي', 'الكويت', 'بيروت', 'عمان', 'الدوحة', 'جدة', 'دمشق']
+    artists = ['فيروز', 'أم كلثوم', 'عمرو دياب', 'كاظم الساهر', 'بيتهوفن', 'موسيقى هادئة']
+    topics = ['الذكاء الاصطناعي', 'تاريخ بغداد', 'كرة القدم', 'أسعار الذهب', 'وصفة كبة', 'برمجة بايثون']
+    templates = [
+        "افتح {app}", "شغل {app} لو سمحت", "ممكن تفتح {app}", "شغل أغنية ل{artist}", "شغل {artist}",
+        "ما هي درجة الحرارة في {city}", "كم درجه الحراره اليوم في {city}", "الطقس في {city} بكرة",
+        "ابحث عن {topic}", "اعطني معلومات عن {topic}", "أخبار {topic}", "كم الساعة في {city}",
+        "اعرض معلومات النظام", "شغل معلومات النظام", "اعرض العمليات", "ما الوقت الآن في {city}",
+        "اطفئ الحاسوب", "اعد تشغيل الجهاز", "انشئ مجلد جديد باسم {topic}", "كيف حالك اليوم",
+        "لماذا السماء زرقاء", "متى يبدأ رمضان", "احكي لي نكتة", "شكرا جزيلا", "هل تعرف {artist}",
+    ]
+    corpus = []
+    for template in itertools.islice(itertools.cycle(templates), size):
+        command = template.format(app=rng.choice(apps), city=rng.choice(cities),
+                                  artist=rng.choice(artists), topic=rng.choice(topics))
+        if rng.random() < 0.3:
+            command = command.replace('ة', 'ه').replace('أ', 'ا')
+        corpus.append(command)
+    rng.shuffle(corpus)
+    return corpus
+
+
+def load_corpus(path):
+    commands = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if path.endswith('.jsonl'):
+                line = json.loads(line).get('input', '')
+            if line:
+                commands.append(line)
+    return commands
+
+
+def measure(function, corpus, repeats=5):
+    """أفضل زمن من عدة تكرارات (µs لكل أمر)"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for command in corpus:
+            function(command)
+        timings.append((time.perf_counter() - start) / len(corpus) * 1e6)
+    return min(timings), statistics.mean(timings)
+
+
+def main():
+    corpus = load_corpus(sys.argv[1]) if len(sys.argv) > 1 else generate_corpus()
+    if not corpus:
+        print("❌ لا توجد أوامر للقياس")
+        return 1
+
+    build_start = time.perf_counter()
+    matcher = build_matcher()
+    build_ms = (time.perf_counter() - build_start) * 1000
+
+    print(f"📋 {len(corpus)} أمر - بناء الآلة: {build_ms:.2f} ms\n")
+    print(f"{'الكلمات':>8s} {'الطريقة':20s} {'الأفضل µs/أمر':>14s} {'المتوسط µs/أمر':>15s}")
+    for extra in (0, 300, 1000):
+        keywords = TOOL_KEYWORDS + extra_keywords(extra)
+        scaled = build_matcher(keywords)
+        count = len(WEATHER_KEYWORDS) + len(keywords) + len(QUESTION_WORDS)
+        legacy_best, legacy_mean = measure(lambda c: legacy_intent(c, keywords), corpus)
+        matcher_best, matcher_mean = measure(lambda c: matcher_intent(scaled, c), corpus)
+        print(f"{count:8d} {'المسح الخطي':20s} {legacy_best:14.2f} {legacy_mean:15.2f}")
+        print(f"{count:8d} {'Aho-Corasick':20s} {matcher_best:14.2f} {matcher_mean:15.2f}")
+
+    changed = [(c, legacy_intent(c), matcher_intent(matcher, c)) for c in corpus]
+    changed = [row for row in changed if row[1] != row[2]]
+
+    print(f"\n🔀 أوامر تغيرت نيتها: {len(changed)}")
+    for command, old, new in sorted(set(changed))[:10]:
+        print(f"   {command!r}: {old} → {new}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
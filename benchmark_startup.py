@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+قياس زمن بدء تشغيل المساعد آدم (تقرير بأسلوب python -X importtime)
+
+يقارن بين:
+- الوضع الكسول: import main فقط (الأدوات تُستورد عند أول استخدام)
+- الوضع الفوري: استيراد جميع الأدوات والمكتبات الثقيلة كما كان سابقاً ثم import main
+
+يُحسب زمن حزمة tools والمكتبات الثقيلة التي كانت تستوردها فقط (بدون المكتبة القياسية و site).
+يجب تشغيله من مجلد main.py (الذي تكون tools بجانبه)، وأي خطأ في الاستيراد يوقف القياس.
+
+الاستخدام:
+    python benchmark_startup.py [عدد_التكرارات]
+"""
+
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+EAGER_DEPENDENCIES = ("langchain_ollama", "langchain_core", "edge_tts", "pygame")
+EAGER_IMPORTS = (
+    "import tools.time, tools.web_search, tools.system_control; "
+    "import langchain_ollama, langchain_core.prompts, langchain_core.messages; "
+    "import edge_tts, pygame; "
+)
+
+SCENARIOS = {
+    "lazy": "import main",
+    "eager": EAGER_IMPORTS + "import main",
+}
+
+LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def is_measured(name):
+    """وحدات حزمة tools والمكتبات الثقيلة التي كانت الأدوات تستوردها عند البدء"""
+    root = name.split(".")[0]
+    return root == "tools" or root in EAGER_DEPENDENCIES
+
+
+def run_importtime(code):
+    """تشغيل عملية Python جديدة وتحليل مخرجات -X importtime"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_DIR,
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+    )
+
+    if result.returncode != 0 or "Traceback (most recent call last)" in result.stderr:
+        errors = [line for line in result.stderr.splitlines() if not line.startswith("import time:")]
+        raise SystemExit(f"❌ فشل الاستيراد ({code}):\n" + "\n".join(errors[-15:]))
+
+    # المخرجات بترتيب ما بعد الأبناء (الابن قبل أبيه)؛ بعكسها يظهر الأب أولاً
+    measured = {}
+    stack = []  # (العمق، هل هو داخل وحدة محسوبة)
+    for line in reversed(result.stderr.splitlines()):
+        match = LINE_RE.match(line)
+        if not match:
+            continue
+        _, cumulative_us, indent, name = match.groups()
+        depth = len(indent)
+        while stack and stack[-1][0] >= depth:
+            stack.pop()
+        inside = bool(stack) and stack[-1][1]
+        # أعلى وحدة محسوبة فقط: زمنها التراكمي يشمل ما تحتها
+        if is_measured(name) and not inside:
+            measured[name] = measured.get(name, 0) + int(cumulative_us)
+        stack.append((depth, inside or is_measured(name)))
+
+    return sum(measured.values()), measured
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    print(f"⏱️ قياس زمن الاستيراد ({runs} تكرارات لكل وضع)...\n")
+
+    report = {}
+    for scenario, code in SCENARIOS.items():
+        totals = []
+        last_modules = {}
+        for _ in range(runs):
+            total_us, last_modules = run_importtime(code)
+            totals.append(total_us)
+        report[scenario] = (statistics.median(totals), last_modules)
+
+    for scenario, (median_us, modules) in report.items():
+        print(f"📦 الوضع {scenario}: {median_us / 1000:.1f} ms (الوسيط)")
+        heaviest = sorted(modules.items(), key=lambda item: item[1], reverse=True)[:8]
+        for name, cumulative_us in heaviest:
+            print(f"   {cumulative_us / 1000:8.1f} ms  {name}")
+        print()
+
+    lazy_us = report["lazy"][0]
+    eager_us = report["eager"][0]
+    if eager_us:
+        saved = eager_us - lazy_us
+        print(f"🚀 التوفير حتى 'في انتظار كلمة التفعيل': {saved / 1000:.1f} ms "
+              f"({100 * saved / eager_us:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+مقارنة تحديد نهاية الكلام: VAD الجديد مقابل الإعدادات الحالية (طاقة + pause_threshold 0.8 + حد 4 ثوانٍ)
+
+يقيس لكل تسجيل:
+- زمن نهاية الكلام: الوقت بين آخر كلمة فعلية وتسليم المقطع
+- القص: تسليم المقطع قبل نهاية الكلام (قطع الأمر أو تقسيمه)
+
+الاستخدام:
+    python benchmark_vad.py                   # تسجيلات اصطناعية مولدة
+    python benchmark_vad.py fixtures_dir/     # ملفات WAV مع ملف JSON بجانب كل منها: {"speech_end": 3.2}
+"""
+
+import glob
+import json
+import os
+import statistics
+import sys
+
+import numpy as np
+import speech_recognition as sr
+
+from tools.audio_capture import ContinuousCapture
+from tools.vad import SpectralVAD
+from tools.wake_word import load_wav
+
+CHUNK = 1024
+
+
+def synthetic_fixtures(count=40, rate=16000, seed=7):
+    """أوامر اصطناعية شبيهة بالكلام: مقاطع صوتية متتالية بوقفات قصيرة وضوضاء خلفية"""
+    rng = np.random.default_rng(seed)
+    fixtures = []
+    for i in range(count):
+        parts = [np.zeros(int(rng.uniform(0.6, 1.2) * rate))]
+        n_syllables = int(rng.integers(3, 20))  # من أمر قصير إلى أمر طويل (~6 ثوانٍ)
+        for _ in range(n_syllables):
+            duration = rng.uniform(0.12, 0.25)
+            t = np.arange(int(duration * rate)) / rate
+            f0 = rng.uniform(110, 210)
+            voiced = sum(np.sin(2 * np.pi * f0 * h * t) / h for h in range(1, 12))
+            parts.append(0.15 * voiced * np.hanning(len(t)))
+            pause = rng.choice([0.03, 0.06, 0.1, 0.3]) if rng.random() < 0.8 else rng.uniform(0.3, 0.55)
+            parts.append(np.zeros(int(pause * rate)))
+        parts[-1] = np.zeros(int(2.0 * rate))
+        speech_end = sum(len(p) for p in parts[:-1]) / rate
+
+        signal = np.concatenate(parts)
+        noise_level = rng.choice([0.003, 0.01, 0.02])
+        signal = signal + noise_level * rng.standard_normal(len(signal))
+        fixtures.append((f"synthetic_{i:02d}", signal.astype(np.float32), rate, speech_end))
+    return fixtures
+
+
+def load_fixtures(directory):
+    fixtures = []
+    for wav_path in sorted(glob.glob(os.path.join(directory, "*.wav"))):
+        label_path = os.path.splitext(wav_path)[0] + ".json"
+        if not os.path.exists(label_path):
+            print(f"⚠️ تم تخطي {wav_path}: لا يوجد ملف {label_path}")
+            continue
+        with open(label_path, 'r', encoding='utf-8') as f:
+            speech_end = json.load(f)["speech_end"]
+        signal, rate = load_wav(wav_path)
+        fixtures.append((os.path.basename(wav_path), signal, rate, speech_end))
+    return fixtures
+
+
+def make_recognizer(signal, rate):
+    """نفس ضبط الميكروفون الحالي مع عتبة من أول نصف ثانية (مثل adjust_for_ambient_noise)"""
+    recognizer = sr.Recognizer()
+    recognizer.dynamic_energy_threshold = True
+    recognizer.pause_threshold = 0.8
+    noise = signal[:rate // 2] * 32768
+    recognizer.energy_threshold = max(float(np.sqrt(np.mean(noise ** 2))) * recognizer.dynamic_energy_ratio, 50)
+    return recognizer
+
+
+def simulate(signal, rate, mode):
+    """تمرير التسجيل على الالتقاط المستمر وإرجاع قائمة (بداية، نهاية) المقاطع المسلّمة بالثواني"""
+    recognizer = make_recognizer(signal, rate)
+    if mode == "vad":
+        capture = ContinuousCapture(recognizer, SpectralVAD(recognizer), max_phrase_seconds=15)
+    else:
+        capture = ContinuousCapture(recognizer, max_phrase_seconds=4)
+
+    pcm = (np.clip(signal, -1, 1) * 32767).astype(np.int16)
+    capture.prepare(rate, 2, CHUNK)
+    emitted = []
+    for index, start in enumerate(range(0, len(pcm) - CHUNK + 1, CHUNK)):
+        capture.feed(pcm[start:start + CHUNK].tobytes())
+        audio = capture.get_utterance(timeout=0)
+        if audio is not None:
+            end = (index + 1) * CHUNK / rate
+            emitted.append((end - len(audio.frame_data) / 2 / rate, end))
+    return emitted
+
+
+def evaluate(fixtures, mode):
+    latencies, truncated, missed = [], 0, 0
+    for name, signal, rate, speech_end in fixtures:
+        utterances = simulate(signal, rate, mode)
+        if any(end < speech_end - 0.05 for _, end in utterances):
+            truncated += 1
+        complete = [end for _, end in utterances if end >= speech_end - 0.05]
+        if complete:
+            latencies.append(complete[0] - speech_end)
+        else:
+            missed += 1
+    return latencies, truncated, missed
+
+
+def main():
+    if len(sys.argv) > 1:
+        fixtures = load_fixtures(sys.argv[1])
+    else:
+        fixtures = synthetic_fixtures()
+    if not fixtures:
+        print("❌ لا توجد تسجيلات للقياس")
+        return 1
+
+    print(f"🎧 {len(fixtures)} تسجيلات\n")
+    print(f"{'الوضع':10s} {'زمن النهاية (الوسيط)':>22s} {'المتوسط':>10s} {'القص':>8s} {'مفقود':>6s}")
+    for mode, label in (("energy", "الحالي"), ("vad", "VAD")):
+        latencies, truncated, missed = evaluate(fixtures, mode)
+        median_ms = statistics.median(latencies) * 1000 if latencies else float("nan")
+        mean_ms = statistics.mean(latencies) * 1000 if latencies else float("nan")
+        print(f"{label:10s} {median_ms:20.0f} ms {mean_ms:8.0f} ms {100 * truncated / len(fixtures):7.0f}% {missed:6d}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+# tools/command_cache.py
+
+"""
+ذاكرة مؤقتة للأوامر المحلولة: الأمر الموحد ← (النية، المعاملات)
+
+الأوامر تتكرر كثيراً ("افتح كروم"، "ما الوقت")، والأمر المكرر يتخطى المطابقة
+والمستخرجات وينتقل مباشرة إلى تنفيذ الأداة. تُحفظ القرارات فقط وليس نتائج الأدوات
+(الوقت يُحسب من جديد في كل مرة)، وقرارات الكلمات المفتاحية والقواميس فقط: قرار
+المصنف تقديري ولا يُحفظ. الأقدم استخداماً يُحذف أولاً (LRU)، وكل قرار ينتهي بعد
+مدة (TTL)، وتُحفظ الذاكرة بين مرات التشغيل مع بصمة مواصفات النوايا والقواميس
+(version): تعديل الكلمات المفتاحية أو القواميس يمسح القرارات القديمة عند التحميل.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class CommandCache:
+    """LRU بمدة صلاحية وعدادات إصابة/إخفاق، محفوظ في ملف JSON"""
+
+    def __init__(self, path="command_cache.json", max_entries=500, ttl=7 * 24 * 3600, save_interval=60,
+                 version=None):
+        self.path = path
+        self.version = version
+        self.max_entries = max_entries
+        self.ttl = ttl  # بالثواني
+        self.save_interval = save_interval
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._last_save = time.time()
+        self._dirty = False
+        self._entries = self._load()  # {الأمر الموحد: [النية، المعاملات، وقت التخزين]}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _load(self):
+        entries = OrderedDict()
+        try:
+            if self.path and os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    content = json.load(f)
+                if content.get("version") != self.version:
+                    print("🔄 تغيرت مواصفات النوايا أو القواميس، تم مسح ذاكرة الأوامر")
+                    self._dirty = True
+                    return entries
+                now = time.time()
+                for key, intent, args, stored in content.get("entries", []):
+                    if now - stored < self.ttl:
+                        entries[key] = [intent, args, stored]
+        except Exception as e:
+            print(f"⚠️ خطأ في تحميل ذاكرة الأوامر: {e}")
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+        return entries
+
+    def save(self):
+        """كتابة الذاكرة إلى القرص (إذا تغيرت)"""
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps({"version": self.version,
+                               "entries": [[key, *entry] for key, entry in self._entries.items()]},
+                              ensure_ascii=False)
+            self._dirty = False
+            self._last_save = time.time()
+
+        try:
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"⚠️ لم يتم حفظ ذاكرة الأوامر: {e}")
+
+    def get(self, normalized):
+        """(النية، نسخة من المعاملات) للأمر الموحد، أو None"""
+        with self._lock:
+            entry = self._entries.get(normalized)
+            if entry is not None and time.time() - entry[2] >= self.ttl:
+                del self._entries[normalized]
+                self._dirty = True
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(normalized)
+            self.hits += 1
+            return entry[0], dict(entry[1])
+
+    def put(self, normalized, intent, args):
+        with self._lock:
+            self._entries[normalized] = [intent, dict(args), time.time()]
+            self._entries.move_to_end(normalized)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._dirty = True
+            due = time.time() - self._last_save > self.save_interval
+
+        if due:
+            self.save()
+
+    def summary(self):
+        """ملخص الإصابات لطباعته عند الإغلاق"""
+        total = self.hits + self.misses
+        if not total:
+            return ""
+        return f"{self.hits}/{total} إصابة ({self.hits / total * 100:.0f}%)، {len(self)} أمر محفوظ"
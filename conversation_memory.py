@@ -0,0 +1,162 @@
+# tools/conversation_memory.py
+
+"""
+ذاكرة الجلسة للنموذج: أسئلة المتابعة ("وبكرة؟") تحتاج الأدوار السابقة
+
+ترتيب الرسائل: موجه النظام الثابت ← ملخص الأدوار القديمة ← آخر الأدوار ← الأمر الحالي.
+البداية لا تتغير بين الأدوار فيعيد Ollama استخدام ذاكرة المعالجة (KV cache) للجزء
+المشترك ويعالج الدور الجديد فقط. عندما يتجاوز السياق ميزانية الرموز تُنقل أقدم
+الأدوار دفعة واحدة إلى الملخص في الخلفية (وليس دوراً كل مرة، حتى تبقى البداية
+ثابتة أطول فترة ممكنة)، وتبقى في السياق حتى يكتمل الملخص.
+
+لكل دور يُسجل عدد رموز السياق (من Ollama: prompt_eval_count) والزمن في
+logs/session_turns.jsonl لمتابعة أثر نمو الجلسة.
+"""
+
+import json
+import os
+import statistics
+import threading
+import time
+
+DEFAULT_SYSTEM_PROMPT = (
+    "أنت آدم، مساعد صوتي ذكي يتحدث العربية. "
+    "أجب باختصار وبجمل قصيرة واضحة تصلح للنطق، بدون قوائم أو رموز. "
+    "استخدم سياق المحادثة السابقة لفهم أسئلة المتابعة."
+)
+SUMMARY_PROMPT = (
+    "لخص المحادثة التالية بين المستخدم والمساعد آدم في ثلاث جمل على الأكثر، "
+    "واحتفظ بالأسماء والأماكن والتفضيلات المهمة. اكتب الملخص فقط."
+)
+CHARS_PER_TOKEN = 3.0  # تقدير تقريبي للنص العربي مع مُرمّزات النماذج الحالية
+MESSAGE_OVERHEAD = 4  # رموز القالب لكل رسالة
+
+
+def estimate_tokens(text):
+    return int(len(text) / CHARS_PER_TOKEN) + MESSAGE_OVERHEAD
+
+
+class ConversationMemory:
+    """موجه ثابت + ملخص متجدد + نافذة أدوار حديثة ضمن ميزانية رموز"""
+
+    def __init__(self, summarize=None, system_prompt=DEFAULT_SYSTEM_PROMPT, token_budget=1200,
+                 compact_to=0.5, max_turn_chars=400, log_path=os.path.join("logs", "session_turns.jsonl")):
+        self.summarize = summarize  # دالة (الملخص السابق، الأدوار) -> ملخص جديد، أو None = حذف الأدوار القديمة
+        self.system_prompt = system_prompt
+        self.token_budget = token_budget
+        self.compact_to = compact_to  # بعد التلخيص تبقى النافذة عند هذه النسبة من الميزانية
+        self.max_turn_chars = max_turn_chars  # نتائج الأدوات الطويلة (نتائج بحث) تُختصر
+        self.log_path = log_path
+        self.summary = ""
+        self._turns = []  # [(الأمر، الرد)]
+        self._compacting = []  # أدوار تُلخص الآن (تبقى في السياق حتى ينتهي التلخيص)
+        self._lock = threading.Lock()
+        self._summarizer = None
+        self.stats = []  # [{"turn", "estimated_tokens", "prompt_tokens", "latency_ms"}]
+
+    def __len__(self):
+        return len(self._turns)
+
+    def _window_tokens(self, turns):
+        return sum(estimate_tokens(user) + estimate_tokens(assistant) for user, assistant in turns)
+
+    def estimated_tokens(self, command=""):
+        """تقدير رموز السياق الكامل للأمر"""
+        with self._lock:
+            turns = self._compacting + self._turns
+            summary = self.summary
+        tokens = estimate_tokens(self.system_prompt) + self._window_tokens(turns) + estimate_tokens(command)
+        return tokens + (estimate_tokens(summary) if summary else 0)
+
+    def messages(self, command):
+        """رسائل LangChain للأمر مع السياق"""
+        from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+        with self._lock:
+            turns = self._compacting + self._turns
+            summary = self.summary
+
+        messages = [SystemMessage(content=self.system_prompt)]
+        if summary:
+            messages.append(SystemMessage(content=f"ملخص ما سبق من المحادثة: {summary}"))
+        for user, assistant in turns:
+            messages.append(HumanMessage(content=user))
+            messages.append(AIMessage(content=assistant))
+        messages.append(HumanMessage(content=command))
+        return messages
+
+    def add_turn(self, command, response):
+        """إضافة دور مكتمل، والتلخيص في الخلفية عند تجاوز الميزانية"""
+        if not command or not response:
+            return
+        if len(response) > self.max_turn_chars:
+            response = response[:self.max_turn_chars] + "..."
+
+        with self._lock:
+            self._turns.append((command, response))
+            if self._compacting or self._window_tokens(self._turns) <= self.token_budget:
+                return
+            # نقل أقدم الأدوار دفعة واحدة حتى تنزل النافذة إلى compact_to من الميزانية
+            target = self.token_budget * self.compact_to
+            count = 0
+            while count < len(self._turns) - 1 and self._window_tokens(self._turns[count:]) > target:
+                count += 1
+            self._compacting, self._turns = self._turns[:count], self._turns[count:]
+
+        self._summarizer = threading.Thread(target=self._compact, name="memory-summary", daemon=True)
+        self._summarizer.start()
+
+    def _compact(self):
+        start = time.perf_counter()
+        summary = self.summary
+        try:
+            if self.summarize is not None:
+                summary = self.summarize(self.summary, list(self._compacting)).strip() or self.summary
+                print(f"🧾 تم تلخيص {len(self._compacting)} أدوار قديمة ({(time.perf_counter() - start) * 1000:.0f} ms)")
+        except Exception as e:
+            print(f"⚠️ تعذر تلخيص المحادثة، سيتم حذف الأدوار القديمة: {e}")
+        with self._lock:
+            self.summary = summary
+            self._compacting = []
+
+    def record(self, estimated_tokens, latency_ms, usage=None):
+        """قياس دور واحد: الرموز التقديرية والفعلية (من Ollama) والزمن"""
+        usage = usage or {}
+        entry = {
+            "turn": len(self.stats) + 1,
+            "window_turns": len(self._turns) + len(self._compacting),
+            "has_summary": bool(self.summary),
+            "estimated_tokens": estimated_tokens,
+            "prompt_tokens": usage.get("prompt_tokens"),
+            "prompt_eval_ms": usage.get("prompt_eval_ms"),
+            "latency_ms": round(latency_ms, 1),
+        }
+        self.stats.append(entry)
+        tokens = entry["prompt_tokens"] or estimated_tokens
+        print(f"🧮 السياق: {tokens} رمز ({entry['window_turns']} أدوار{' + ملخص' if entry['has_summary'] else ''})، "
+              f"{latency_ms:.0f} ms")
+
+        if not self.log_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({**entry, "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")},
+                                   ensure_ascii=False) + "\n")
+        except Exception as e:
+            print(f"⚠️ لم يتم حفظ قياس الدور: {e}")
+
+    def reset(self):
+        with self._lock:
+            self.summary = ""
+            self._turns = []
+            self._compacting = []
+
+    def stats_summary(self):
+        """ملخص نمو السياق والزمن خلال الجلسة لطباعته عند الإغلاق"""
+        if not self.stats:
+            return ""
+        tokens = [s["prompt_tokens"] or s["estimated_tokens"] for s in self.stats]
+        latencies = [s["latency_ms"] for s in self.stats]
+        return (f"{len(self.stats)} استدعاء، رموز السياق {tokens[0]} ← {tokens[-1]} (الأقصى {max(tokens)})، "
+                f"متوسط الزمن {statistics.mean(latencies):.0f} ms")
@@ -0,0 +1,145 @@
+# tools/daemon.py
+
+"""
+خدمة آدم المقيمة عبر Unix domain socket
+
+البروتوكول: سطر JSON واحد لكل طلب وسطر JSON واحد لكل رد (UTF-8)
+    {"command": "افتح الحاسبة"}                  -> {"ok": true, "response": "...", "elapsed_ms": 12.3}
+    {"commands": ["ما الوقت", "افتح كروم"]}      -> {"ok": true, "responses": ["...", "..."], "elapsed_ms": 20.1}
+    {"command": "...", "speak": true}            -> ينطق الرد أيضاً على جهاز الخدمة
+    {"command": "...", "session": "kitchen"}     -> الأمر الجديد يلغي انتظار الأمر السابق لنفس الجلسة فقط
+                                                    (الافتراضي: الاتصال نفسه، فلا يلغي عميل أوامر عميل آخر)
+    {"ping": true}                               -> {"ok": true, "pong": true}
+"""
+
+import json
+import os
+import socket
+import socketserver
+import stat
+import tempfile
+import threading
+import time
+
+DEFAULT_SOCKET_PATH = os.environ.get("ADAM_SOCKET", os.path.join(tempfile.gettempdir(), "adam.sock"))
+
+
+def handle_request(request, handler, session=None):
+    """تنفيذ طلب واحد (أو دفعة أوامر) وإرجاع الرد كقاموس"""
+    start = time.perf_counter()
+    speak = bool(request.get("speak", False))
+    session = request.get("session") or session
+    if not isinstance(session, (str, type(None))):
+        return {"ok": False, "error": "'session' يجب أن تكون نصاً"}
+
+    if request.get("ping"):
+        return {"ok": True, "pong": True}
+
+    if "commands" in request:
+        commands = request["commands"]
+        if not isinstance(commands, list) or not all(isinstance(c, str) for c in commands):
+            return {"ok": False, "error": "'commands' يجب أن تكون قائمة نصوص"}
+        responses = [handler(command, speak, session) for command in commands]
+        return {"ok": True, "responses": responses, "elapsed_ms": round((time.perf_counter() - start) * 1000, 1)}
+
+    command = request.get("command")
+    if not isinstance(command, str) or not command.strip():
+        return {"ok": False, "error": "الطلب يجب أن يحتوي على 'command' أو 'commands'"}
+
+    response = handler(command, speak, session)
+    return {"ok": True, "response": response, "elapsed_ms": round((time.perf_counter() - start) * 1000, 1)}
+
+
+class _CommandRequestHandler(socketserver.StreamRequestHandler):
+    """قراءة أسطر JSON من العميل والرد على كل منها"""
+
+    def handle(self):
+        for line in self.rfile:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                request = json.loads(line.decode("utf-8"))
+                if not isinstance(request, dict):
+                    raise ValueError("الطلب يجب أن يكون كائن JSON")
+                reply = handle_request(request, self.server.command_handler, session=f"connection-{id(self)}")
+            except Exception as e:
+                reply = {"ok": False, "error": str(e)}
+
+            self.wfile.write((json.dumps(reply, ensure_ascii=False) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+    class CommandServer(socketserver.ThreadingUnixStreamServer):
+        """خادم أوامر آدم - عملاء متعددون، وتنفيذ الأوامر بالتسلسل (الأمر الجديد يلغي انتظار سابقه من نفس الجلسة)"""
+
+        daemon_threads = True
+
+        def __init__(self, socket_path, process_command, cancel=None):
+            self._lock = threading.Lock()
+            self._process_command = process_command
+            self._cancel = cancel
+            super().__init__(socket_path, _CommandRequestHandler)
+
+        def server_bind(self):
+            # الملف يُنشأ بصلاحيات 0600 من البداية (chmod بعد bind يترك فترة يتصل فيها أي مستخدم)
+            previous = os.umask(0o177)
+            try:
+                super().server_bind()
+            finally:
+                os.umask(previous)
+
+        def command_handler(self, command, speak=False, session=None):
+            if self._cancel is not None:
+                self._cancel(session)
+            with self._lock:
+                return self._process_command(command, speak, session)
+else:
+    CommandServer = None  # Windows بدون دعم AF_UNIX
+
+
+def _remove_stale_socket(socket_path):
+    """حذف ملف socket قديم إن لم تكن هناك خدمة تستمع عليه (الملفات العادية لا تُحذف أبداً)"""
+    if not os.path.lexists(socket_path):
+        return
+    if not stat.S_ISSOCK(os.lstat(socket_path).st_mode):
+        raise RuntimeError(f"المسار {socket_path} موجود وليس socket - اختر مساراً آخر بـ --socket")
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            probe.connect(socket_path)
+        raise RuntimeError(f"خدمة آدم تعمل بالفعل على {socket_path}")
+    except (ConnectionRefusedError, FileNotFoundError):
+        os.remove(socket_path)
+
+
+def serve_forever(process_command, socket_path=DEFAULT_SOCKET_PATH, cancel=None):
+    """تشغيل الخدمة حتى الإيقاف. process_command(command, speak, session) -> str،
+    و cancel(session) يُستدعى عند وصول كل أمر"""
+    if CommandServer is None:
+        raise RuntimeError("Unix domain sockets غير مدعومة على هذا النظام")
+
+    _remove_stale_socket(socket_path)
+    server = CommandServer(socket_path, process_command, cancel)  # المستخدم الحالي فقط يمكنه إرسال الأوامر
+
+    print(f"🛰️ خدمة آدم تستمع على: {socket_path}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+
+
+def send_request(request, socket_path=DEFAULT_SOCKET_PATH, timeout=120):
+    """إرسال طلب واحد إلى الخدمة وإرجاع الرد (للعميل والسكربتات)"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(socket_path)
+        client.sendall((json.dumps(request, ensure_ascii=False) + "\n").encode("utf-8"))
+
+        with client.makefile("rb") as reader:
+            line = reader.readline()
+    if not line:
+        raise ConnectionError("أغلقت الخدمة الاتصال بدون رد")
+    return json.loads(line.decode("utf-8"))
@@ -0,0 +1,155 @@
+# tools/dialect_recognition.py
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import speech_recognition as sr
+
+DEFAULT_DIALECTS = ("ar-IQ", "ar-SA", "ar-EG")
+
+
+class DialectStats:
+    """نسب نجاح كل لهجة للمستخدم - تُحفظ بين الجلسات لترتيب اللهجات واختيارها"""
+
+    def __init__(self, path="dialect_stats.json", min_attempts=20, min_rate=0.05):
+        self.path = path
+        self.min_attempts = min_attempts  # لا نستبعد لهجة قبل هذا العدد من المحاولات
+        self.min_rate = min_rate
+        self._lock = threading.Lock()
+        self.stats = self._load()
+
+    def _load(self):
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"⚠️ خطأ في تحميل إحصائيات اللهجات: {e}")
+        return {}
+
+    def save(self):
+        with self._lock:
+            data = json.dumps(self.stats, ensure_ascii=False, indent=2)
+        try:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                f.write(data)
+        except Exception as e:
+            print(f"⚠️ لم يتم حفظ إحصائيات اللهجات: {e}")
+
+    def _rate(self, dialect, key):
+        entry = self.stats.get(dialect, {})
+        # تنعيم لابلاس حتى تحصل اللهجات الجديدة على فرصة
+        return (entry.get(key, 0) + 1) / (entry.get("attempts", 0) + 2)
+
+    def win_rate(self, dialect):
+        """نسبة المرات التي اختيرت فيها نتيجة هذه اللهجة"""
+        return self._rate(dialect, "wins")
+
+    def success_rate(self, dialect):
+        """نسبة المرات التي أرجعت فيها هذه اللهجة أي نص"""
+        return self._rate(dialect, "successes")
+
+    def record(self, completed, succeeded, winner):
+        with self._lock:
+            for dialect in completed:
+                entry = self.stats.setdefault(dialect, {"attempts": 0, "successes": 0, "wins": 0})
+                entry["attempts"] += 1
+                entry["successes"] = entry.get("successes", 0) + (dialect in succeeded)
+                entry["wins"] += dialect == winner
+
+    def ordered(self, dialects):
+        """ترتيب اللهجات حسب الفوز واستبعاد التي لا تنجح أبداً مع هذا المستخدم"""
+        ranked = sorted(dialects, key=self.win_rate, reverse=True)
+        kept = [d for d in ranked
+                if self.stats.get(d, {}).get("attempts", 0) < self.min_attempts
+                or self.success_rate(d) >= self.min_rate]
+        return kept or ranked[:1]
+
+
+class DialectRecognizer:
+    """التعرف على الكلام بعدة لهجات في نفس الوقت بدلاً من تجربتها واحدة تلو الأخرى"""
+
+    def __init__(self, backend, dialects=DEFAULT_DIALECTS, stats=None,
+                 confident=0.85, timeout=10, explore_every=20):
+        self.backend = backend  # محرك من tools.asr
+        self.dialects = tuple(dialects)
+        self.stats = stats or DialectStats()
+        self.confident = confident  # ثقة كافية لإرجاع النتيجة فوراً
+        self.timeout = timeout
+        self.explore_every = explore_every  # تجربة كل اللهجات دورياً لتحديث الإحصائيات
+        self._calls = 0
+        self._executor = ThreadPoolExecutor(max_workers=len(self.dialects), thread_name_prefix="asr")
+
+    def recognize(self, audio):
+        """إرسال كل اللهجات معاً وإرجاع (النص، اللهجة) أو (None, None)"""
+        self._calls += 1
+        if not self.backend.supports_dialects:
+            # المحركات المحلية لا تتأثر باللهجة - استدعاء واحد يكفي
+            dialects = self.dialects[:1]
+        elif self.explore_every and self._calls % self.explore_every == 0:
+            dialects = self.dialects
+        else:
+            dialects = self.stats.ordered(self.dialects)
+
+        start = time.perf_counter()
+        futures = {self._executor.submit(self.backend.recognize, audio, lang): lang for lang in dialects}
+        pending = set(futures)
+        completed, succeeded = [], []
+        best = None  # (الثقة، ترتيب اللهجة، النص، اللهجة)
+        deadline = time.time() + self.timeout
+
+        while pending:
+            done, pending = wait(pending, timeout=max(0.0, deadline - time.time()), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                lang = futures[future]
+                try:
+                    text, confidence = future.result()
+                except sr.UnknownValueError:
+                    completed.append(lang)
+                    continue
+                except sr.RequestError as e:
+                    # أخطاء الشبكة لا تُحسب ضد اللهجة
+                    print(f"❌ خطأ في طلب التعرف على الكلام ({lang}): {e}")
+                    continue
+                except Exception as e:
+                    # مهلة socket، خطأ في نموذج Vosk، صوت غير صالح... = لا نتيجة من هذه اللهجة
+                    print(f"❌ خطأ في محرك التعرف ({lang}): {e}")
+                    continue
+
+                completed.append(lang)
+                succeeded.append(lang)
+
+                if confidence is None:
+                    # لا توجد درجات ثقة - أول إجابة ناجحة هي النتيجة
+                    best = (1.0, 0, text, lang)
+                    pending = set()
+                    break
+                # الأولوية للثقة الأعلى، ثم للهجة الأنجح تاريخياً عند التعادل
+                candidate = (confidence, -dialects.index(lang), text, lang)
+                if best is None or candidate > best:
+                    best = candidate
+
+            if best is not None and best[0] >= self.confident:
+                break
+
+        # اللهجات التي لم تبدأ بعد لا حاجة لها (التي بدأت تكمل في الخلفية وتُهمل نتيجتها)
+        for future in futures:
+            future.cancel()
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        winner = best[3] if best else None
+        self.stats.record(completed, succeeded, winner)
+        if self._calls % 10 == 0:
+            self.stats.save()
+
+        if best is None:
+            print(f"❌ لم يتم التعرف على أي نص ({elapsed_ms:.0f} ms)")
+            return None, None
+
+        print(f"✅ تم التعرف على النص ({self.backend.name}/{winner}، {elapsed_ms:.0f} ms): {best[2]}")
+        return best[2], winner
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+تسجيل كلمة التفعيل "ادم" بصوتك لرصدها محلياً بدون إنترنت
+
+الاستخدام:
+    python enroll_wake_word.py                 # تسجيل 4 عينات من الميكروفون
+    python enroll_wake_word.py a.wav b.wav     # استخدام تسجيلات WAV موجودة
+"""
+
+import json
+import os
+import sys
+
+import speech_recognition as sr
+
+from tools.wake_word import WakeWordDetector, load_wav
+
+MODEL_PATH = "wake_word.npz"
+SAMPLES_DIR = "wake_word_samples"
+SAMPLE_COUNT = 4
+
+
+def record_samples(mic_index=None):
+    """تسجيل عدة عينات لكلمة التفعيل وحفظها كملفات WAV"""
+    os.makedirs(SAMPLES_DIR, exist_ok=True)
+    recognizer = sr.Recognizer()
+    recognizer.pause_threshold = 0.5
+    mic = sr.Microphone(device_index=mic_index, sample_rate=16000)
+
+    paths = []
+    with mic as source:
+        print("🔧 ضبط الميكروفون للضوضاء المحيطة...")
+        recognizer.adjust_for_ambient_noise(source, duration=1)
+
+        for i in range(SAMPLE_COUNT):
+            print(f"🎤 ({i + 1}/{SAMPLE_COUNT}) قل 'ادم' مرة واحدة...")
+            audio = recognizer.listen(source, timeout=8, phrase_time_limit=2)
+            path = os.path.join(SAMPLES_DIR, f"adam_{i + 1}.wav")
+            with open(path, "wb") as f:
+                f.write(audio.get_wav_data(convert_rate=16000, convert_width=2))
+            paths.append(path)
+            print(f"✅ تم الحفظ: {path}")
+    return paths
+
+
+def main():
+    paths = sys.argv[1:]
+    if not paths:
+        mic_index = None
+        try:
+            if os.path.exists('mic_config.json'):
+                with open('mic_config.json', 'r', encoding='utf-8') as f:
+                    mic_index = json.load(f).get("microphone_index")
+        except Exception as e:
+            print(f"⚠️ خطأ في تحميل إعدادات الميكروفون: {e}")
+        paths = record_samples(mic_index)
+
+    detector = WakeWordDetector.enroll_wav(paths)
+    detector.save(MODEL_PATH)
+    print(f"🎉 تم حفظ نموذج كلمة التفعيل في {MODEL_PATH} (العتبة {detector.threshold:.2f})")
+
+    # اختبار ذاتي: كل عينة يجب أن تُرصد بالقوالب الأخرى
+    if len(paths) > 2:
+        hits = 0
+        for i, path in enumerate(paths):
+            others = WakeWordDetector([t for j, t in enumerate(detector.templates) if j != i], detector.threshold)
+            signal, rate = load_wav(path)
+            hits += others.score(signal, rate) <= detector.threshold
+        print(f"🧪 الاختبار الذاتي: {hits}/{len(paths)} عينات تم رصدها")
+
+
+if __name__ == "__main__":
+    main()
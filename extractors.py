@@ -0,0 +1,89 @@
+# tools/extractors.py
+
+"""
+مستخرجات القيم (slots) من نص الأمر
+
+كل مستخرج يأخذ (الأمر الأصلي، الأمر الموحد) ويرجع القيمة أو None،
+وعندها تُستخدم القيمة الافتراضية في مواصفة النية (tools/intents.py).
+أسماء المدن والفنانين والتطبيقات والمواقع من القاموس المشترك (tools/gazetteer.py).
+"""
+
+import re
+
+from .arabic_normalize import NormalizedIndex
+from .gazetteer import get_gazetteer
+
+OPEN_VERBS = NormalizedIndex(['افتح', 'شغل', 'فتح'])
+SENTENCE_PUNCTUATION = ".,!?؟،؛:;"  # تُحذف من أطراف الكلمة فقط ("youtube.com" تبقى كما هي)
+
+
+def _without_words(command, words):
+    """حذف كلمات كاملة من الأمر (بدون المساس بكلمات تحتويها مثل "عن" داخل "عنوان")"""
+    pattern = r"(?<!\w)(?:" + "|".join(map(re.escape, words)) + r")(?!\w)"
+    return re.sub(r"\s+", " ", re.sub(pattern, " ", command)).strip()
+
+
+def _entity(normalized, *types):
+    match = get_gazetteer().find(normalized, types, normalized=True)
+    return match.value if match else None
+
+
+def city(command, normalized):
+    """اسم المدينة المذكورة في الأمر"""
+    return _entity(normalized, 'city')
+
+
+def weather_query(command, normalized):
+    """استعلام بحث الطقس للمدينة المذكورة (بغداد افتراضياً)"""
+    return f"طقس {city(command, normalized) or 'بغداد'} اليوم درجة الحرارة"
+
+
+def music_query(command, normalized):
+    """اسم فنان أو نوع موسيقي، أو "" للبحث العام"""
+    return _entity(normalized, 'artist', 'genre') or ""
+
+
+def app_name(command, normalized):
+    """اسم التطبيق بالإنجليزية إن كان معروفاً، أو الكلمة بعد "افتح"/"شغل"، أو الأمر كاملاً"""
+    match = get_gazetteer().find(normalized, ('app',), normalized=True)
+    if match:
+        print(f"🎯 تم تحديد التطبيق: {match.surface} → {match.value}")
+        return match.value
+
+    # تطبيق غير موجود في القاموس: الكلمة بعد "افتح" أو "شغل"
+    words = command.split()
+    for i, word in enumerate(words[:-1]):
+        if word in OPEN_VERBS:
+            return words[i + 1].strip(SENTENCE_PUNCTUATION)
+
+    return command  # إرجاع الأمر كاملاً كاسم التطبيق
+
+
+def url(command, normalized):
+    """رابط الموقع المذكور"""
+    return _entity(normalized, 'site')
+
+
+def search_query(command, normalized):
+    """كلمات البحث بعد "ابحث عن" """
+    return _without_words(command, ('ابحث', 'بحث', 'عن'))
+
+
+def info_query(command, normalized):
+    """موضوع طلب المعلومات"""
+    return _without_words(command, ('معلومات', 'عن'))
+
+
+def quantity_query(command, normalized):
+    """سؤال "كم ..." بدون أداة الاستفهام"""
+    return _without_words(command, ('كم',))
+
+
+def folder_name(command, normalized):
+    """اسم المجلد بعد "انشئ مجلد" """
+    match = re.search(r"مجلد\s+(?:جديد\s+)?(?:باسم\s+|اسمه\s+)?(.+)", command)
+    return match.group(1).strip() if match else None
+
+
+def full_command(command, normalized):
+    return command
@@ -0,0 +1,195 @@
+# tools/gazetteer.py
+
+"""
+قواميس الكيانات (مدن، فنانون، تطبيقات، مواقع...) من ملفات بيانات
+
+كل ملف في data/gazetteers/ (أو gazetteers/ في مجلد التشغيل) نوع كيان واحد:
+- JSON: {"type": "city", "entries": [{"name": "بغداد", "aliases": ["baghdad"], "timezone": "Asia/Baghdad"}]}
+- TXT:  اسم في كل سطر، ونوع الكيان من اسم الملف (artist.txt)
+
+الأسماء تُوحد كتابتها وتُخزن في شجرة كلمات (token trie)، والبحث مرور واحد على كلمات الأمر
+يرجع أطول تطابق مع نوعه. زمن البحث لا يتأثر بعدد الكيانات (آلاف المدن أو الفنانين).
+"""
+
+import glob
+import hashlib
+import json
+import os
+import threading
+
+from .arabic_normalize import normalized_words
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "gazetteers")
+USER_DIR = "gazetteers"
+
+PROCLITICS = "وفبلك"  # حروف تلتصق ببداية الكلمة: "وبغداد"، "لفيروز"
+_END = object()
+
+
+class Entity:
+    """كيان واحد: النوع، القيمة المستخدمة (مثل calculator) والاسم المعروض وبيانات إضافية"""
+
+    __slots__ = ('type', 'value', 'name', 'data')
+
+    def __init__(self, entity_type, value, name, data=None):
+        self.type = entity_type
+        self.value = value
+        self.name = name
+        self.data = data or {}
+
+    def __repr__(self):
+        return f"Entity({self.type!r}, {self.value!r})"
+
+
+class GazetteerMatch:
+    """تطابق كيان في النص (مواقع الكلمات [start, end))"""
+
+    __slots__ = ('entity', 'start', 'end', 'surface')
+
+    def __init__(self, entity, start, end, surface):
+        self.entity = entity
+        self.start = start
+        self.end = end
+        self.surface = surface
+
+    @property
+    def type(self):
+        return self.entity.type
+
+    @property
+    def value(self):
+        return self.entity.value
+
+    def __repr__(self):
+        return f"GazetteerMatch({self.entity!r}, {self.surface!r})"
+
+
+def _token_variants(token):
+    """صيغ الكلمة الأولى بعد نزع حرف الجر/العطف و"ال" ("وللمفكره" ← "المفكره" ← "مفكره")"""
+    variants = [token]
+    if len(token) > 2 and token[0] in PROCLITICS:
+        variants.append(token[1:])
+    if len(token) > 4 and token.startswith("لل"):
+        variants.append("ال" + token[2:])
+    for variant in list(variants):
+        if len(variant) > 4 and variant.startswith("ال"):
+            variants.append(variant[2:])
+    return variants
+
+
+class Gazetteer:
+    """شجرة كلمات موحدة لكل أنواع الكيانات"""
+
+    def __init__(self):
+        self._root = {}
+        self.counts = {}
+        self._digest = hashlib.sha256()  # محتوى الملفات المحملة بترتيب تحميلها
+
+    @property
+    def fingerprint(self):
+        """بصمة الملفات المحملة: تتغير مع أي تعديل في القواميس"""
+        return self._digest.hexdigest()
+
+    def __len__(self):
+        return sum(self.counts.values())
+
+    def add(self, entity_type, name, value=None, aliases=(), **data):
+        """إضافة كيان بكل أسمائه (تُضاف أيضاً الصيغة بدون "ال")"""
+        entity = Entity(entity_type, value if value is not None else name, name, data)
+        for surface in (name, *aliases):
+            tokens = normalized_words(surface)
+            if not tokens:
+                continue
+            self._insert(tokens, entity)
+            if len(tokens[0]) > 4 and tokens[0].startswith("ال"):
+                self._insert([tokens[0][2:], *tokens[1:]], entity)
+        self.counts[entity_type] = self.counts.get(entity_type, 0) + 1
+        return entity
+
+    def _insert(self, tokens, entity):
+        node = self._root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        entities = node.setdefault(_END, [])
+        if entity not in entities:
+            entities.append(entity)
+
+    def load_file(self, path):
+        """تحميل ملف JSON أو TXT واحد"""
+        entity_type = os.path.splitext(os.path.basename(path))[0]
+        with open(path, 'rb') as f:
+            self._digest.update(os.path.basename(path).encode('utf-8') + b"\0" + f.read())
+        if path.endswith(".txt"):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip() and not line.startswith("#"):
+                        self.add(entity_type, line.strip())
+            return
+
+        with open(path, 'r', encoding='utf-8') as f:
+            content = json.load(f)
+        entity_type = content.get("type", entity_type)
+        for entry in content.get("entries", []):
+            entry = dict(entry)
+            name = entry.pop("name")
+            self.add(entity_type, name, entry.pop("value", None), entry.pop("aliases", ()), **entry)
+
+    def load_dir(self, directory):
+        for path in sorted(glob.glob(os.path.join(directory, "*.json")) + glob.glob(os.path.join(directory, "*.txt"))):
+            try:
+                self.load_file(path)
+            except Exception as e:
+                print(f"⚠️ خطأ في تحميل القاموس {path}: {e}")
+
+    def find_all(self, text, types=None, normalized=False):
+        """أطول تطابق يبدأ من كل كلمة في النص"""
+        tokens = normalized_words(text, normalized)
+        matches = []
+        for start in range(len(tokens)):
+            best = None
+            for first in _token_variants(tokens[start]):
+                node = self._root.get(first)
+                end = start + 1
+                while node is not None:
+                    entities = [e for e in node.get(_END, ()) if types is None or e.type in types]
+                    if entities and (best is None or end > best[1]):
+                        best = (entities[0], end)
+                    if end >= len(tokens):
+                        break
+                    node = node.get(tokens[end])
+                    end += 1
+            if best is not None:
+                matches.append(GazetteerMatch(best[0], start, best[1], " ".join(tokens[start:best[1]])))
+        return matches
+
+    def find(self, text, types=None, normalized=False):
+        """أطول تطابق في النص (والأسبق عند التساوي)، أو None"""
+        matches = self.find_all(text, types, normalized)
+        if not matches:
+            return None
+        return max(matches, key=lambda m: (m.end - m.start, -m.start))
+
+    def get(self, text, entity_type=None):
+        """الكيان إذا كان النص كله اسماً معروفاً"""
+        match = self.find(text, (entity_type,) if entity_type else None)
+        if match is None or match.start != 0 or match.end != len(normalized_words(text)):
+            return None
+        return match.entity
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def get_gazetteer():
+    """القاموس المشترك: يُحمّل مرة واحدة من data/gazetteers ثم من gazetteers/ في مجلد التشغيل"""
+    global _default
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                gazetteer = Gazetteer()
+                for directory in (DATA_DIR, USER_DIR):
+                    if os.path.isdir(directory):
+                        gazetteer.load_dir(directory)
+                _default = gazetteer
+    return _default
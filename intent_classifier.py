@@ -0,0 +1,242 @@
+# tools/intent_classifier.py
+
+"""
+مصنف نوايا خفيف على المعالج (NumPy فقط) بين الكلمات المفتاحية والنموذج اللغوي
+
+الأوامر التي لا تطابق أي كلمة مفتاحية ("شلون الجو اليوم"، "خليني اسمع فيروز")
+كانت تذهب كلها إلى النموذج (ثوانٍ لكل أمر). المصنف يمثل الأمر بأجزاء حروف (2-4)
+موزونة بـ TF-IDF، ويقارنه بمركز كل نية (nearest centroid، تشابه جيب التمام).
+إذا كان التشابه فوق العتبة وبفارق واضح عن النية الثانية تُنفذ الأداة مباشرة،
+وإلا يبقى الأمر للنموذج.
+
+بيانات التدريب:
+- data/intent_seed.jsonl: أمثلة مكتوبة يدوياً {"text": ..., "intent": ...}
+  (النية "llm" = محادثة عامة تبقى للنموذج)
+- logs/history.jsonl: الأوامر المسجلة التي طابقتها الكلمات المفتاحية (تُوسم بـ IntentRouter)
+
+الاستخدام من سطر الأوامر (كم استدعاء للنموذج كان سيُستغنى عنه في السجل):
+    python -m tools.intent_classifier report [logs/history.jsonl]
+"""
+
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+from .arabic_normalize import normalize_arabic
+
+SEED_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "intent_seed.jsonl")
+HISTORY_PATH = os.path.join("logs", "history.jsonl")
+LLM_LABEL = "llm"  # محادثة عامة: لا أداة
+NGRAM_RANGE = (2, 4)
+DEFAULT_THRESHOLD = 0.3
+DEFAULT_MARGIN = 0.05
+
+
+def char_ngrams(normalized, ngram_range=NGRAM_RANGE):
+    """أجزاء الحروف لكل كلمة مع حدودها (" جو " ← " ج"، "جو"، "و "، " جو"...)"""
+    low, high = ngram_range
+    grams = []
+    for word in normalized.split():
+        padded = f" {word} "
+        for n in range(low, high + 1):
+            grams.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+    return grams
+
+
+class IntentClassifier:
+    """TF-IDF لأجزاء الحروف + أقرب مركز لكل نية"""
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, margin=DEFAULT_MARGIN, ngram_range=NGRAM_RANGE):
+        self.threshold = threshold
+        self.margin = margin
+        self.ngram_range = ngram_range
+        self.vocabulary = {}
+        self.idf = None
+        self.labels = []
+        self.centroids = None  # (عدد النوايا × حجم المفردات)، كل صف بطول 1
+        self.timings = []
+
+    def __len__(self):
+        return len(self.labels)
+
+    def _weights(self, normalized):
+        """(فهارس المفردات، الأوزان) لأمر واحد بعد TF-IDF وتوحيد الطول"""
+        indices = [self.vocabulary[g] for g in char_ngrams(normalized, self.ngram_range) if g in self.vocabulary]
+        if not indices:
+            return None, None
+        indices, counts = np.unique(np.array(indices), return_counts=True)
+        weights = (1.0 + np.log(counts)) * self.idf[indices]
+        return indices, weights / np.linalg.norm(weights)
+
+    def fit(self, texts, labels):
+        """بناء المفردات وأوزان IDF ومركز كل نية"""
+        documents = [char_ngrams(normalize_arabic(text), self.ngram_range) for text in texts]
+        self.vocabulary = {}
+        for grams in documents:
+            for gram in grams:
+                self.vocabulary.setdefault(gram, len(self.vocabulary))
+
+        document_frequency = np.zeros(len(self.vocabulary))
+        for grams in documents:
+            document_frequency[[self.vocabulary[g] for g in set(grams)]] += 1
+        self.idf = np.log((1 + len(documents)) / (1 + document_frequency)) + 1.0
+
+        self.labels = sorted(set(labels))
+        label_index = {label: i for i, label in enumerate(self.labels)}
+        centroids = np.zeros((len(self.labels), len(self.vocabulary)))
+        for text, label in zip(texts, labels):
+            indices, weights = self._weights(normalize_arabic(text))
+            if indices is not None:
+                centroids[label_index[label], indices] += weights
+        norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+        self.centroids = centroids / np.where(norms > 0, norms, 1.0)
+        return self
+
+    def scores(self, text, normalized=False):
+        """تشابه الأمر مع كل نية {النية: التشابه}"""
+        indices, weights = self._weights(text if normalized else normalize_arabic(text))
+        if indices is None:
+            return {label: 0.0 for label in self.labels}
+        return dict(zip(self.labels, (self.centroids[:, indices] @ weights).tolist()))
+
+    def predict(self, text, normalized=False):
+        """(النية، الثقة) - النية None إذا كانت الثقة منخفضة أو الأمر محادثة عامة"""
+        if self.centroids is None or not self.labels:
+            return None, 0.0
+        start = time.perf_counter()
+        ranked = sorted(self.scores(text, normalized).items(), key=lambda item: item[1], reverse=True)
+        self.timings.append((time.perf_counter() - start) * 1000)
+
+        label, confidence = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+        if label == LLM_LABEL or confidence < self.threshold or confidence - runner_up < self.margin:
+            return None, confidence
+        return label, confidence
+
+
+def load_seed(path=SEED_PATH, router=None):
+    """أمثلة التدريب اليدوية [(النص، النية)] - مع router: فقط النوايا التي يُسمح للمصنف بتوقعها"""
+    examples = []
+    if not os.path.exists(path):
+        return examples
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                examples.append((entry["text"], entry["intent"]))
+    if router is not None:
+        examples = [(text, intent) for text, intent in examples
+                    if intent == LLM_LABEL or (intent in router.table and router.table[intent].classifiable)]
+    return examples
+
+
+def load_history(path=HISTORY_PATH):
+    """الأوامر المسجلة في سجل المحادثات (حقل "input")"""
+    commands = []
+    if not os.path.exists(path):
+        return commands
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                command = json.loads(line).get("input", "").strip()
+            except ValueError:
+                continue
+            if command:
+                commands.append(command)
+    return commands
+
+
+def label_history(commands, router):
+    """وسم الأوامر المسجلة بالكلمات المفتاحية: [(الأمر، النية)] للمطابقة، و[الأوامر] التي ذهبت للنموذج"""
+    labelled, unmatched = [], []
+    for command in commands:
+        spec = router.match(normalize_arabic(command))
+        if spec is None:
+            unmatched.append(command)
+        elif spec.classifiable:
+            labelled.append((command, spec.name))
+    return labelled, unmatched
+
+
+def train(router, seed_path=SEED_PATH, history_path=HISTORY_PATH,
+          threshold=DEFAULT_THRESHOLD, margin=DEFAULT_MARGIN):
+    """تدريب المصنف من الأمثلة اليدوية وسجل المحادثات (بضع عشرات من ms)"""
+    examples = load_seed(seed_path, router)
+    labelled, _ = label_history(load_history(history_path), router)
+    examples.extend(dict(labelled).items())  # أمر مكرر في السجل = مثال واحد
+    classifier = IntentClassifier(threshold, margin)
+    if examples:
+        texts, labels = zip(*examples)
+        classifier.fit(list(texts), list(labels))
+    return classifier
+
+
+def cross_validate(examples, folds=5, threshold=DEFAULT_THRESHOLD, margin=DEFAULT_MARGIN):
+    """دقة المصنف على أمثلة لم يتدرب عليها: (صحيح، خطأ، تُرك للنموذج)"""
+    correct = wrong = deferred = 0
+    for fold in range(folds):
+        train_set = [e for i, e in enumerate(examples) if i % folds != fold]
+        test_set = [e for i, e in enumerate(examples) if i % folds == fold]
+        classifier = IntentClassifier(threshold, margin).fit(*map(list, zip(*train_set)))
+        for text, intent in test_set:
+            predicted, _ = classifier.predict(text)
+            expected = None if intent == LLM_LABEL else intent
+            if predicted is None and expected is not None:
+                deferred += 1
+            elif predicted == expected:
+                correct += 1
+            else:
+                wrong += 1
+    return correct, wrong, deferred
+
+
+def _main(argv):
+    if not argv or argv[0] != "report":
+        print(__doc__)
+        return 1
+
+    from .intents import IntentRouter
+
+    history_path = argv[1] if len(argv) > 1 else HISTORY_PATH
+    router = IntentRouter()
+    commands = load_history(history_path)
+    labelled, unmatched = label_history(commands, router)
+
+    start = time.perf_counter()
+    classifier = train(router, history_path=history_path)
+    train_ms = (time.perf_counter() - start) * 1000
+    print(f"🧠 المصنف: {len(classifier)} نية، {len(classifier.vocabulary)} جزء حروف، التدريب {train_ms:.1f} ms")
+
+    seed = load_seed(router=router)
+    if seed:
+        correct, wrong, deferred = cross_validate(seed)
+        print(f"🧪 الأمثلة اليدوية (5 أجزاء): صحيح {correct}، خطأ {wrong}، تُرك للنموذج {deferred}")
+
+    print(f"\n📋 السجل {history_path}: {len(commands)} أمر، الكلمات المفتاحية {len(commands) - len(unmatched)}، "
+          f"النموذج {len(unmatched)} (منها {len(labelled)} مثال تدريب)")
+    if not unmatched:
+        return 0
+
+    eliminated = []
+    for command in unmatched:
+        intent, confidence = classifier.predict(command)
+        if intent is not None:
+            eliminated.append((command, intent, confidence))
+
+    share = len(eliminated) / len(unmatched) * 100
+    print(f"✂️ استدعاءات النموذج التي يحلها المصنف: {len(eliminated)} من {len(unmatched)} ({share:.0f}%)")
+    for intent, count in Counter(intent for _, intent, _ in eliminated).most_common():
+        print(f"   {intent}: {count}")
+    for command, intent, confidence in eliminated[:15]:
+        print(f"   {command!r} → {intent} ({confidence:.2f})")
+    if classifier.timings:
+        print(f"⏱️ زمن التصنيف: {sum(classifier.timings) / len(classifier.timings):.3f} ms لكل أمر")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main(sys.argv[1:]))
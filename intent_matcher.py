@@ -0,0 +1,127 @@
+# tools/intent_matcher.py
+
+"""
+مطابقة كل الكلمات المفتاحية في مرور واحد على الأمر (خوارزمية Aho-Corasick)
+
+الآلة تُبنى مرة واحدة من الكلمات بصيغتها الموحدة، وعند تعدد التطابقات يُختار:
+الأولوية الأعلى، ثم الأطول ("معلومات النظام" قبل "معلومات")، ثم الأسبق في الجملة.
+"""
+
+from collections import deque
+
+from .arabic_normalize import normalize_arabic
+
+
+class Match:
+    """تطابق كلمة مفتاحية داخل النص"""
+
+    __slots__ = ('start', 'end', 'keyword', 'payload', 'priority')
+
+    def __init__(self, start, end, keyword, payload, priority):
+        self.start = start
+        self.end = end
+        self.keyword = keyword
+        self.payload = payload
+        self.priority = priority
+
+    def __repr__(self):
+        return f"Match({self.keyword!r}, {self.start}, {self.end}, priority={self.priority})"
+
+
+class _Pattern:
+    __slots__ = ('keyword', 'length', 'payload', 'priority', 'whole_word', 'at_start')
+
+    def __init__(self, keyword, payload, priority, whole_word, at_start):
+        self.keyword = keyword
+        self.length = len(keyword)
+        self.payload = payload
+        self.priority = priority
+        self.whole_word = whole_word
+        self.at_start = at_start
+
+
+class IntentMatcher:
+    """آلة Aho-Corasick للكلمات المفتاحية مع أولويات وأطول تطابق"""
+
+    def __init__(self, patterns=()):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        self._delta = None
+        self._compiled = False
+        for pattern in patterns:
+            self.add(*pattern)
+
+    def add(self, keyword, payload=None, priority=0, whole_word=False, at_start=False):
+        """إضافة كلمة (تُوحد كتابتها). whole_word: لا تطابق داخل كلمة أطول، at_start: في بداية الأمر فقط"""
+        keyword = normalize_arabic(keyword)
+        if not keyword:
+            return
+        node = 0
+        for char in keyword:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+        payload = payload if payload is not None else keyword
+        self._output[node].append(_Pattern(keyword, payload, priority, whole_word, at_start))
+        self._compiled = False
+
+    def compile(self):
+        """حساب روابط الفشل (BFS) ودمج المخرجات وجدول الانتقالات الكامل - مرة واحدة بعد إضافة الكلمات"""
+        # جدول انتقالات كامل (DFA): حرف واحد = قراءة قاموس واحدة بدون تتبع روابط الفشل أثناء البحث
+        self._delta = [None] * len(self._goto)
+        self._delta[0] = dict(self._goto[0])
+        queue = deque()
+        for node in self._goto[0].values():
+            self._fail[node] = 0
+            queue.append(node)
+        while queue:
+            node = queue.popleft()
+            self._delta[node] = {**self._delta[self._fail[node]], **self._goto[node]}
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+        self._compiled = True
+        return self
+
+    def find_all(self, text, normalized=False):
+        """كل التطابقات في مرور واحد على النص"""
+        if not self._compiled:
+            self.compile()
+        if not normalized:
+            text = normalize_arabic(text)
+
+        delta, output = self._delta, self._output
+        matches = []
+        node = 0
+        for index, char in enumerate(text):
+            node = delta[node].get(char, 0)
+            for pattern in output[node]:
+                start = index + 1 - pattern.length
+                if pattern.at_start and start != 0:
+                    continue
+                if pattern.whole_word and not _is_word(text, start, index + 1):
+                    continue
+                matches.append(Match(start, index + 1, pattern.keyword, pattern.payload, pattern.priority))
+        return matches
+
+    def best(self, text, normalized=False):
+        """أفضل تطابق: الأولوية ثم الطول ثم الموقع، أو None"""
+        matches = self.find_all(text, normalized)
+        if not matches:
+            return None
+        return max(matches, key=lambda m: (m.priority, m.end - m.start, -m.start))
+
+
+def _is_word(text, start, end):
+    return (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum())
@@ -0,0 +1,237 @@
+# tools/intents.py
+
+"""
+مواصفات النوايا: الكلمات المفتاحية، مستخرجات القيم، الأداة الهدف ومعاملاتها
+
+المواصفات بيانات فقط (لا تستورد وحدات الأدوات) حتى يبقى سجل الأدوات كسولاً.
+إضافة أداة جديدة = ToolEntry في registry.py + IntentSpec هنا، بدون تعديل main.py.
+IntentRouter يحولها مرة واحدة إلى آلة مطابقة وجدول توجيه، والأوامر التي لا تطابق
+أي كلمة تمر على مصنف النوايا (tools/intent_classifier.py) قبل النموذج اللغوي.
+القرارات تُحفظ في ذاكرة الأوامر (tools/command_cache.py) فيتخطى الأمر المكرر كل ذلك.
+الأمر المركب ("افتح كروم وشغل موسيقى ثم قل لي الوقت") يُقسم إلى أوامر فرعية (split).
+
+التحقق من أمثلة القدرات المعروضة للمستخدم (بعد تعديل الكلمات أو القواميس):
+    python -m tools.intents check
+"""
+
+import hashlib
+import re
+import sys
+
+from . import extractors
+from .arabic_normalize import normalize_arabic
+from .gazetteer import get_gazetteer
+from .intent_matcher import IntentMatcher
+
+
+class IntentSpec:
+    """نية واحدة: متى تُختار (keywords/priority) وكيف تُستدعى الأداة (slots/defaults)"""
+
+    __slots__ = ('name', 'tool', 'keywords', 'priority', 'slots', 'defaults', 'whole_word', 'at_start',
+                 'classifiable')
+
+    def __init__(self, name, tool, keywords, priority=10, slots=None, defaults=None,
+                 whole_word=False, at_start=False, classifiable=True):
+        self.name = name
+        self.tool = tool
+        self.keywords = tuple(keywords)
+        self.priority = priority
+        self.slots = tuple((slots or {}).items())  # (اسم المعامل، المستخرج)
+        self.defaults = dict(defaults or {})
+        self.whole_word = whole_word
+        self.at_start = at_start
+        self.classifiable = classifiable  # False: بالكلمة المفتاحية فقط، لا يختارها المصنف
+
+    def __repr__(self):
+        return f"IntentSpec({self.name!r}, {self.tool!r})"
+
+
+# الأولويات: الأعلى يفوز عند تعدد التطابقات، ثم أطول كلمة
+INTENT_SPECS = (
+    # أدوات البحث والإنترنت (tools/web_search.py)
+    IntentSpec('weather', 'search_google', ('درجة الحرارة', 'الحرارة', 'الطقس', 'طقس', 'حرارة', 'كم درجة'),
+               priority=30, slots={'query': extractors.weather_query}),
+    IntentSpec('quantity_question', 'search_google', ('كم',), priority=28, whole_word=True, at_start=True,
+               classifiable=False, slots={'query': extractors.quantity_query}),
+    IntentSpec('search', 'search_google', ('ابحث', 'بحث'),
+               slots={'query': extractors.search_query}),
+    IntentSpec('info', 'search_google', ('معلومات',),
+               slots={'query': extractors.info_query}, defaults={'query': 'معلومات عامة'}),
+    IntentSpec('news', 'get_news', ('أخبار',), priority=15,
+               defaults={'topic': 'أخبار اليوم'}),
+    IntentSpec('question', 'search_google', ('ما', 'متى', 'أين', 'لماذا', 'كيف', 'هل'), priority=0, whole_word=True,
+               classifiable=False, slots={'query': extractors.full_command}),
+
+    # أدوات الوقت (tools/time.py)
+    IntentSpec('time', 'get_time', ('الوقت',), priority=25,
+               slots={'city': extractors.city}, defaults={'city': 'بغداد'}),
+
+    # أدوات التحكم في النظام (tools/system_control.py)
+    # تشغيل الصوت وفتح التطبيقات والمواقع بالكلمة المفتاحية فقط: المصنف يخلط معها
+    # الدردشة ("اريد اسمع صوتك" → play_music بثقة 0.45، مثل "ابي اسمع فيروز" 0.42)
+    IntentSpec('play_music', 'play_music', ('موسيقى', 'أغنية', 'نغمة'), priority=15, classifiable=False,
+               slots={'query': extractors.music_query}, defaults={'query': ''}),
+    IntentSpec('open_app', 'open_app', ('شغل', 'تشغيل', 'افتح', 'فتح'), classifiable=False,
+               slots={'app_name': extractors.app_name}),
+    IntentSpec('open_website', 'open_website', ('افتح موقع', 'فتح موقع'), priority=12, classifiable=False,
+               slots={'url': extractors.url}, defaults={'url': 'google.com'}),
+    IntentSpec('system_info', 'show_system_info', ('معلومات النظام',), priority=25),
+    IntentSpec('processes', 'list_processes', ('العمليات',), priority=25),
+    # أوامر لها أثر على الجهاز: بالكلمة المفتاحية الصريحة فقط
+    IntentSpec('shutdown', 'shutdown_computer', ('اطفئ',), priority=25, defaults={'delay_minutes': 1},
+               classifiable=False),
+    IntentSpec('restart', 'restart_computer', ('اعد تشغيل',), priority=25, defaults={'delay_minutes': 1},
+               classifiable=False),
+    IntentSpec('create_folder', 'create_new_folder', ('انشئ مجلد',), priority=25, classifiable=False,
+               slots={'folder_name': extractors.folder_name}, defaults={'folder_name': 'مجلد جديد'}),
+)
+
+
+# أمثلة display_capabilities في main.py مع النية والمعاملات المتوقعة
+CAPABILITY_EXAMPLES = (
+    ("شغل موسيقى باخ", 'play_music', {'query': 'باخ'}),
+    ("شغل أغنية حزينة", 'play_music', {'query': 'حزين'}),
+    ("افتح الحاسبة", 'open_app', {'app_name': 'calculator'}),
+    ("افتح كروم", 'open_app', {'app_name': 'chrome'}),
+    ("كم درجة الحرارة اليوم؟", 'weather', {'query': 'طقس بغداد اليوم درجة الحرارة'}),
+    ("ما أخبار التكنولوجيا؟", 'news', {}),
+    ("اعرض معلومات النظام", 'system_info', {}),
+    ("ما الوقت الآن؟", 'time', {'city': 'بغداد'}),
+    ("كم درجة الحرارة في القاهرة؟", 'weather', {'query': 'طقس القاهرة اليوم درجة الحرارة'}),
+    ("ما الوقت في دبي؟", 'time', {'city': 'دبي'}),
+    ("افتح كروم.", 'open_app', {'app_name': 'chrome'}),
+    ("شغل موسيقى فيروز.", 'play_music', {'query': 'فيروز'}),
+)
+
+CONJUNCTIONS = ('ثم', 'و')  # كلمات فاصلة، و"و" أيضاً ملتصقة ببداية الكلمة ("وشغل")
+_COMMAS = re.compile(r"[،,؛;]")
+
+
+def _segments(command):
+    """تقسيم الأمر عند الفواصل و"ثم" و"و" بدون التحقق من المعنى: [(النص كما قيل، النص بدون أداة العطف)]"""
+    segments = []
+    for clause in _COMMAS.split(command):
+        segments.append(["", ""])
+        for word in clause.split():
+            normalized = normalize_arabic(word)
+            if normalized in CONJUNCTIONS:
+                segments.append([word, ""])
+                continue
+            if len(normalized) > 2 and normalized[0] == 'و':
+                segments.append([word, word[1:]])
+                continue
+            segments[-1][0] = (segments[-1][0] + " " + word).strip()
+            segments[-1][1] = (segments[-1][1] + " " + word).strip()
+    return [(original, text) for original, text in segments if text]
+
+
+def routing_fingerprint(specs=INTENT_SPECS):
+    """بصمة المواصفات والقواميس: القرارات المحفوظة بغير هذه البصمة قديمة"""
+    digest = hashlib.sha256()
+    for spec in specs:
+        slots = [(arg, getattr(extractor, '__name__', repr(extractor))) for arg, extractor in spec.slots]
+        digest.update(repr((spec.name, spec.tool, spec.keywords, spec.priority, slots,
+                            sorted(spec.defaults.items()), spec.whole_word, spec.at_start)).encode('utf-8'))
+    digest.update(get_gazetteer().fingerprint.encode('ascii'))
+    return digest.hexdigest()[:16]
+
+
+class IntentRouter:
+    """آلة مطابقة واحدة + جدول توجيه {اسم النية: المواصفة} مبنيان مرة واحدة"""
+
+    def __init__(self, specs=INTENT_SPECS, classifier=None, cache=None):
+        self.table = {spec.name: spec for spec in specs}
+        self.matcher = IntentMatcher()
+        for spec in specs:
+            for keyword in spec.keywords:
+                self.matcher.add(keyword, spec.name, spec.priority, spec.whole_word, spec.at_start)
+        self.matcher.compile()
+        self.classifier = classifier  # يمكن تعيينه لاحقاً (تدريب في الخلفية)
+        self.cache = cache
+
+    def match(self, normalized):
+        """مواصفة النية بالكلمات المفتاحية فقط، أو None"""
+        match = self.matcher.best(normalized, normalized=True)
+        return self.table[match.payload] if match else None
+
+    def split(self, command):
+        """الأوامر الفرعية بالترتيب - جزء لا يطابق كلمة مفتاحية يبقى مع الجزء الذي قبله
+        ("ابحث عن القاهرة والرياض" أمر واحد، "افتح كروم وشغل موسيقى" أمران)"""
+        parts = []  # [النص، هل يطابق نية]
+        for original, text in _segments(command):
+            resolved = self.match(normalize_arabic(text)) is not None
+            if not parts:
+                parts.append([text, resolved])
+            elif not resolved:
+                parts[-1][0] += " " + original
+            elif not parts[-1][1]:
+                # بداية غير مفهومة ("لو سمحت، افتح كروم") تُضم للأمر الأول
+                parts[-1] = [parts[-1][0] + " " + text, True]
+            else:
+                parts.append([text, resolved])
+        return [text for text, _ in parts] or [command]
+
+    def classify(self, normalized):
+        """مواصفة النية من المصنف إذا كان واثقاً، أو None"""
+        if self.classifier is None:
+            return None
+        intent, confidence = self.classifier.predict(normalized, normalized=True)
+        spec = self.table.get(intent)
+        if spec is None or not spec.classifiable:
+            return None
+        print(f"🧠 المصنف: {spec.name} (الثقة {confidence:.2f})")
+        return spec
+
+    def route(self, command):
+        """(المواصفة، المعاملات) للأمر، أو (None, None) إذا لم تطابق أي نية"""
+        normalized = normalize_arabic(command)
+        if self.cache is not None:
+            cached = self.cache.get(normalized)
+            if cached is not None and cached[0] in self.table:
+                print(f"⚡ قرار محفوظ: {cached[0]}")
+                return self.table[cached[0]], cached[1]
+
+        spec = self.match(normalized)
+        matched = spec is not None
+        if not matched:
+            spec = self.classify(normalized)
+        if spec is None:
+            return None, None
+
+        args = dict(spec.defaults)
+        for arg, extractor in spec.slots:
+            value = extractor(command, normalized)
+            if value is not None and value != "":
+                args[arg] = value
+        # قرار المصنف تقديري: لا يُحفظ حتى لا يتكرر خطؤه طوال مدة الصلاحية
+        if self.cache is not None and matched:
+            self.cache.put(normalized, spec.name, args)
+        return spec, args
+
+
+def check_examples(router=None, examples=CAPABILITY_EXAMPLES):
+    """الأمثلة التي لا تصل إلى النية أو المعاملات المتوقعة: [(الأمر، المتوقع، الناتج)]"""
+    router = router or IntentRouter()
+    failures = []
+    for command, intent, expected in examples:
+        spec, args = router.route(command)
+        name = spec.name if spec is not None else None
+        if name != intent or any(args.get(key) != value for key, value in expected.items()):
+            failures.append((command, (intent, expected), (name, args)))
+    return failures
+
+
+def _main(argv):
+    if argv != ["check"]:
+        print(__doc__)
+        return 1
+
+    failures = check_examples()
+    for command, expected, actual in failures:
+        print(f"❌ {command}: المتوقع {expected}، الناتج {actual}")
+    print(f"{'✅' if not failures else '❌'} {len(CAPABILITY_EXAMPLES) - len(failures)}/{len(CAPABILITY_EXAMPLES)} من أمثلة القدرات")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main(sys.argv[1:]))
@@ -0,0 +1,223 @@
+# tools/llm_manager.py
+
+import json
+import os
+import statistics
+import threading
+import time
+
+from .llm_scheduler import BACKGROUND, INTERACTIVE, RequestScheduler, request_key
+
+
+def parse_duration(value):
+    """تحويل مدة بصيغة Ollama ("10m", "1h", "30s", 300, -1) إلى ثوانٍ (None = للأبد)"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return None if value < 0 else float(value)
+
+    value = str(value).strip().lower()
+    units = {'s': 1, 'm': 60, 'h': 3600}
+    try:
+        if value[-1] in units:
+            seconds = float(value[:-1]) * units[value[-1]]
+        else:
+            seconds = float(value)
+    except (ValueError, IndexError):
+        return None
+    return None if seconds < 0 else seconds
+
+
+class ModelManager:
+    """إدارة نموذج Ollama: التسخين المسبق، مدة البقاء في الذاكرة، التفريغ عند الخمول وقياس الزمن
+
+    كل الاستدعاءات تمر عبر RequestScheduler: عدد محدود من التوليدات المتزامنة،
+    أدوار المستخدم قبل أعمال الخلفية، والطلبات المتطابقة المتزامنة تُدمج."""
+
+    def __init__(self, model="command-r7b-arabic", temperature=0.1, reasoning=False,
+                 keep_alive="30m", idle_unload_minutes=20, num_ctx=None, num_predict=None, max_in_flight=1,
+                 latency_log=os.path.join("logs", "llm_latency.jsonl")):
+        self.model = model
+        self.temperature = temperature
+        self.reasoning = reasoning
+        self.keep_alive = keep_alive
+        self.num_ctx = num_ctx  # None = الافتراضي في Ollama
+        self.num_predict = num_predict
+        self.scheduler = RequestScheduler(max_in_flight)
+        self.idle_unload_minutes = idle_unload_minutes
+        self.latency_log = latency_log
+
+        self._llm = None
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._warming = False
+        self._last_used = 0.0
+        self._latencies = {"cold": [], "warm": [], "warmup": [], "first_token": []}
+        self._watcher = None
+        self._usage = threading.local()  # آخر استهلاك لكل خيط (الملخص يعمل في خيط آخر)
+
+    @property
+    def llm(self):
+        """إنشاء ChatOllama عند أول حاجة له"""
+        if self._llm is None:
+            with self._lock:
+                if self._llm is None:
+                    from langchain_ollama import ChatOllama
+
+                    self._llm = ChatOllama(
+                        model=self.model,
+                        reasoning=self.reasoning,
+                        temperature=self.temperature,
+                        keep_alive=self.keep_alive,
+                        num_ctx=self.num_ctx,
+                        num_predict=self.num_predict
+                    )
+        return self._llm
+
+    def _merge_options(self, kwargs):
+        """options لكل استدعاء تُضاف فوق الخيارات المضبوطة: ChatOllama يستبدلها كلها إذا مُررت،
+        فيتغير num_ctx ويعيد Ollama تحميل النموذج"""
+        if "options" not in kwargs:
+            return kwargs
+        configured = {"num_ctx": self.num_ctx, "num_predict": self.num_predict, "temperature": self.temperature}
+        options = {key: value for key, value in configured.items() if value is not None}
+        options.update(kwargs["options"])
+        return {**kwargs, "options": options}
+
+    @property
+    def last_usage(self):
+        """رموز وزمن آخر استدعاء في هذا الخيط: prompt_tokens، completion_tokens، prompt_eval_ms، latency_ms"""
+        return getattr(self._usage, "value", {})
+
+    def is_loaded(self):
+        """هل النموذج محمل في ذاكرة Ollama؟ (مع مراعاة انتهاء keep_alive من جهة الخادم)"""
+        if not self._loaded:
+            return False
+        keep_alive_seconds = parse_duration(self.keep_alive)
+        if keep_alive_seconds is not None and time.time() - self._last_used > keep_alive_seconds:
+            self._loaded = False
+        return self._loaded
+
+    def invoke(self, messages, priority=INTERACTIVE, **kwargs):
+        """استدعاء النموذج مع قياس زمن الاستدعاء البارد والدافئ (الطلب المطابق المتزامن يُدمج)"""
+        kwargs = self._merge_options(kwargs)
+        response, usage = self.scheduler.run(request_key(messages, **kwargs),
+                                             lambda: self._invoke(messages, **kwargs), priority)
+        self._usage.value = usage
+        return response
+
+    def _invoke(self, messages, **kwargs):
+        kind = "warm" if self.is_loaded() else "cold"
+        start = time.perf_counter()
+        response = self.llm.invoke(messages, **kwargs)
+        return response, self._record(kind, start, response)
+
+    def stream(self, messages, priority=INTERACTIVE, **kwargs):
+        """توليد الرد على دفعات نصية (للنطق جملة بجملة أثناء التوليد) مع قياس زمن أول دفعة
+
+        المكان محجوز حتى نهاية التوليد أو إغلاق المولد (مقاطعة المستخدم)."""
+        kwargs = self._merge_options(kwargs)
+        with self.scheduler.slot(priority):
+            kind = "warm" if self.is_loaded() else "cold"
+            start = time.perf_counter()
+            response = None
+            for chunk in self.llm.stream(messages, **kwargs):
+                if response is None:
+                    self._latencies["first_token"].append((time.perf_counter() - start) * 1000)
+                    response = chunk
+                else:
+                    response = response + chunk  # الدفعة الأخيرة تحمل response_metadata من Ollama
+                if chunk.content:
+                    yield chunk.content
+            self._record(kind, start, response)
+
+    def warm_up(self):
+        """تحميل النموذج في الخلفية بتوليد قصير جداً (بدون انتظار)"""
+        if self.is_loaded() or self._warming:
+            return
+        self._warming = True
+        threading.Thread(target=self._warm_up, name="llm-warmup", daemon=True).start()
+
+    def _warm_up(self):
+        try:
+            with self.scheduler.slot(BACKGROUND):
+                if self.is_loaded():
+                    return  # طلب المستخدم سبق التسخين وحمّل النموذج
+                print(f"🔥 جاري تسخين النموذج {self.model} في الخلفية...")
+                start = time.perf_counter()
+                response = self.llm.invoke("مرحبا", **self._merge_options({"options": {"num_predict": 1}}))
+                self._record("warmup", start, response)
+            print(f"✅ النموذج جاهز ({self._latencies['warmup'][-1]:.0f} ms)")
+        except Exception as e:
+            print(f"⚠️ فشل تسخين النموذج: {e}")
+        finally:
+            self._warming = False
+
+    def unload(self):
+        """تفريغ النموذج من ذاكرة Ollama لتحرير الذاكرة"""
+        try:
+            from ollama import Client
+
+            Client(host=self.llm.base_url).generate(model=self.model, keep_alive=0)
+            self._loaded = False
+            print(f"💤 تم تفريغ النموذج {self.model} بعد الخمول")
+        except Exception as e:
+            print(f"⚠️ لم يتم تفريغ النموذج: {e}")
+
+    def start_idle_watcher(self, interval=30):
+        """مراقبة الخمول: تفريغ النموذج بعد N دقيقة بدون استخدام"""
+        if not self.idle_unload_minutes or self._watcher is not None:
+            return
+        self._watcher = threading.Thread(target=self._watch_idle, args=(interval,), name="llm-idle", daemon=True)
+        self._watcher.start()
+
+    def _watch_idle(self, interval):
+        while True:
+            time.sleep(interval)
+            if self._loaded and time.time() - self._last_used > self.idle_unload_minutes * 60:
+                self.unload()
+
+    def _record(self, kind, start, response):
+        latency_ms = (time.perf_counter() - start) * 1000
+        self._loaded = True
+        self._last_used = time.time()
+        self._latencies[kind].append(latency_ms)
+
+        # load_duration من Ollama (بالنانوثانية) يوضح زمن تحميل النموذج الفعلي
+        metadata = getattr(response, "response_metadata", None) or {}
+        load_ms = (metadata.get("load_duration") or 0) / 1e6
+        usage = self._usage.value = {
+            "prompt_tokens": metadata.get("prompt_eval_count"),
+            "completion_tokens": metadata.get("eval_count"),
+            "prompt_eval_ms": round((metadata.get("prompt_eval_duration") or 0) / 1e6, 1),
+            "latency_ms": round(latency_ms, 1),
+        }
+
+        try:
+            os.makedirs(os.path.dirname(self.latency_log) or ".", exist_ok=True)
+            with open(self.latency_log, "a", encoding="utf-8") as f:
+                f.write(json.dumps({
+                    "kind": kind,
+                    "latency_ms": round(latency_ms, 1),
+                    "load_ms": round(load_ms, 1),
+                    "keep_alive": self.keep_alive,
+                    "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
+                }, ensure_ascii=False) + "\n")
+        except Exception as e:
+            print(f"⚠️ لم يتم حفظ زمن الاستدعاء: {e}")
+        return usage
+
+    def latency_summary(self):
+        """ملخص الزمن (ms) للاستدعاءات الباردة والدافئة لضبط سياسة keep_alive"""
+        summary = {}
+        for kind, values in self._latencies.items():
+            if values:
+                summary[kind] = {
+                    "count": len(values),
+                    "mean_ms": round(statistics.mean(values), 1),
+                    "median_ms": round(statistics.median(values), 1)
+                }
+        queue = self.scheduler.summary()
+        if queue:
+            summary["queue"] = queue
+        return summary
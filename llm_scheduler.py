@@ -0,0 +1,113 @@
+# tools/llm_scheduler.py
+
+"""
+جدولة الطلبات أمام خادم Ollama المحلي (نموذج واحد على المعالج)
+
+- max_in_flight: عدد التوليدات المتزامنة (Ollama على المعالج يعالج طلباً واحداً بكفاءة،
+  والطلبات الزائدة تتقاسم المعالج فيتأخر الجميع)
+- الأولوية: دور المستخدم (INTERACTIVE) يأخذ أول مكان يفرغ قبل أعمال الخلفية
+  (BACKGROUND: تلخيص الذاكرة، تسخين النموذج)، وبترتيب الوصول داخل نفس الأولوية
+- الدمج: طلب مطابق لطلب قيد التنفيذ (نفس الرسائل والخيارات) ينتظر نفس النتيجة
+  بدلاً من توليد ثانٍ
+
+التوليد الذي بدأ لا يُقاطع: الأولوية تحدد من يبدأ بعده فقط.
+"""
+
+import heapq
+import itertools
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+INTERACTIVE = 0
+BACKGROUND = 1
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BACKGROUND: "background"}
+
+
+def request_key(messages, **kwargs):
+    """مفتاح ثابت للطلب: نوع ومحتوى كل رسالة + خيارات التوليد"""
+    if isinstance(messages, str):
+        serialized = messages
+    else:
+        serialized = [(getattr(m, "type", type(m).__name__), getattr(m, "content", m)) for m in messages]
+    return json.dumps([serialized, kwargs], ensure_ascii=False, sort_keys=True, default=str)
+
+
+class RequestScheduler:
+    """أماكن توليد محدودة بطابور أولويات، ودمج الطلبات المتطابقة المتزامنة"""
+
+    def __init__(self, max_in_flight=1):
+        self.max_in_flight = max(1, max_in_flight)
+        self.coalesced = 0
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._waiting = []  # كومة (الأولوية، رقم الوصول)
+        self._sequence = itertools.count()
+        self._pending = {}  # مفتاح الطلب -> Future للطلب قيد التنفيذ
+        self._waits = {INTERACTIVE: [], BACKGROUND: []}  # زمن الانتظار (ms) لكل أولوية
+
+    @contextmanager
+    def slot(self, priority=INTERACTIVE):
+        """حجز مكان توليد طوال الكتلة (الانتظار حسب الأولوية ثم ترتيب الوصول)"""
+        start = time.perf_counter()
+        ticket = (priority, next(self._sequence))
+        with self._cond:
+            heapq.heappush(self._waiting, ticket)
+            while self._in_flight >= self.max_in_flight or self._waiting[0] != ticket:
+                self._cond.wait()
+            heapq.heappop(self._waiting)
+            self._in_flight += 1
+            self._cond.notify_all()  # قد يتسع مكان للطلب التالي أيضاً
+        wait_ms = (time.perf_counter() - start) * 1000
+        self._waits.setdefault(priority, []).append(wait_ms)
+        if wait_ms > 100:
+            print(f"🚦 انتظر طلب {PRIORITY_NAMES.get(priority, priority)} للنموذج {wait_ms:.0f} ms")
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                self._cond.notify_all()
+
+    def run(self, key, generate, priority=INTERACTIVE):
+        """تنفيذ generate() في مكان توليد - أو انتظار نتيجة طلب مطابق قيد التنفيذ"""
+        with self._cond:
+            future = self._pending.get(key)
+            leader = future is None
+            if leader:
+                future = self._pending[key] = Future()
+            else:
+                self.coalesced += 1
+        if not leader:
+            print("🔗 طلب مطابق قيد التنفيذ، سيتم استخدام نفس الرد")
+            return future.result()
+
+        try:
+            with self.slot(priority):
+                result = generate()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._cond:
+                self._pending.pop(key, None)
+
+    def summary(self):
+        """الانتظار في الطابور لكل أولوية وعدد الطلبات المدمجة"""
+        summary = {}
+        for priority, waits in self._waits.items():
+            if waits:
+                summary[PRIORITY_NAMES.get(priority, priority)] = {
+                    "count": len(waits),
+                    "mean_wait_ms": round(statistics.mean(waits), 1),
+                    "max_wait_ms": round(max(waits), 1)
+                }
+        if self.coalesced:
+            summary["coalesced"] = self.coalesced
+        return summary
@@ -1,27 +1,38 @@
+import argparse
 import logging
 import time
 import json
 import asyncio
-import edge_tts
 import os
+import queue
+import sys
 import tempfile
+import threading
 import uuid
 from dotenv import load_dotenv
 import speech_recognition as sr
-from langchain_ollama import ChatOllama
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.messages import HumanMessage, AIMessage
-import pygame
 import re
 
-# استيراد الأدوات مباشرة - النسخة المحسنة
-from tools.time import get_time
-from tools.web_search import search_google, get_website_info, search_and_read, get_news
-from tools.system_control import (
-    play_music, open_app, show_system_info, list_processes, close_program,
-    create_new_folder, list_files, shutdown_computer, restart_computer,
-    find_files, open_website, set_volume
-)
+# سجل الأدوات الكسول - لا يتم استيراد أي أداة حتى أول استخدام لها
+# (edge_tts و pygame و langchain_ollama تُستورد أيضاً عند الحاجة فقط)
+from tools.registry import tool_registry
+from tools.mic_profiles import NoiseProfileStore
+from tools.llm_manager import ModelManager
+from tools.llm_scheduler import BACKGROUND
+from tools.daemon import DEFAULT_SOCKET_PATH, serve_forever
+from tools.asr import create_backend
+from tools.dialect_recognition import DEFAULT_DIALECTS, DialectRecognizer
+from tools.audio_capture import ContinuousCapture
+from tools.vad import SpectralVAD
+from tools.audio_preprocess import AudioPreprocessor
+from tools.arabic_normalize import normalize_arabic
+from tools.intents import IntentRouter, routing_fingerprint
+from tools.command_cache import CommandCache
+from tools.result_cache import CachedToolRegistry, ResultCache
+from tools.tool_runner import CircuitBreaker, ToolCancelled, ToolRunner
+from tools.sentence_splitter import stream_sentences
+from tools.conversation_memory import SUMMARY_PROMPT, ConversationMemory
+from tools.semantic_cache import SemanticCache
 
 load_dotenv()
 
@@ -45,7 +56,13 @@ def load_mic_config():
         "dynamic_energy_threshold": True,
         "pause_threshold": 0.8,
         "timeout": 8,
-        "phrase_time_limit": 4
+        "phrase_time_limit": 4,
+        "endpointing": "vad",  # vad أو energy (السلوك القديم)
+        "max_phrase_seconds": 15,
+        "preprocess": True,  # كبح الضوضاء وتوحيد الصوت قبل التعرف
+        "barge_in": True,  # مقاطعة رد المساعد بالكلام
+        "barge_in_energy_ratio": 3.0,
+        "wake_word_model": "wake_word.npz"  # أنشئه بـ: python enroll_wake_word.py
     }
 
 
@@ -53,8 +70,33 @@ def load_mic_config():
 MIC_CONFIG = load_mic_config()
 MIC_INDEX = MIC_CONFIG.get("microphone_index", 1)
 TRIGGER_WORD = "ادم"
+TRIGGER_NORMALIZED = normalize_arabic(TRIGGER_WORD)  # يطابق "آدم" و"أدم" أيضاً
 CONVERSATION_TIMEOUT = 30
 
+
+# إعدادات التطبيق من config.json
+def load_app_config():
+    """تحميل config.json أو استخدام الإعدادات الافتراضية"""
+    try:
+        if os.path.exists('config.json'):
+            with open('config.json', 'r', encoding='utf-8') as f:
+                return json.load(f)
+    except Exception as e:
+        print(f"⚠️ خطأ في تحميل config.json: {e}")
+    return {}
+
+
+APP_CONFIG = load_app_config()
+AI_CONFIG = APP_CONFIG.get("ai_model", {})
+ASR_CONFIG = APP_CONFIG.get("asr", {})
+CLASSIFIER_CONFIG = APP_CONFIG.get("intent_classifier", {})
+COMMAND_CACHE_CONFIG = APP_CONFIG.get("command_cache", {})
+RESULT_CACHE_CONFIG = APP_CONFIG.get("result_cache", {})
+TOOLS_CONFIG = APP_CONFIG.get("tools", {})
+STREAM_SPEECH = AI_CONFIG.get("stream_speech", True)  # نطق رد النموذج جملة بجملة أثناء التوليد
+MEMORY_CONFIG = AI_CONFIG.get("memory", {})
+ANSWER_CACHE_CONFIG = AI_CONFIG.get("answer_cache", {})
+
 logging.basicConfig(level=logging.INFO)
 
 # إعداد speech recognizer مع الإعدادات المحسنة
@@ -73,363 +115,345 @@ if not os.path.exists(AUDIO_DIR):
         print(f"⚠️ لم يتم إنشاء مجلد الملفات الصوتية: {e}")
         AUDIO_DIR = tempfile.gettempdir()
 
-# تهيئة pygame mixer
-try:
-    pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
-    print("✅ تم تهيئة pygame mixer بنجاح")
-except Exception as e:
-    print(f"❌ خطأ في تهيئة pygame mixer: {e}")
 
+# تهيئة pygame mixer - مؤجلة حتى أول تشغيل للصوت
+def init_mixer():
+    """تهيئة pygame mixer عند أول تشغيل للصوت"""
+    import pygame
 
-# إعداد الميكروفون مع معالجة أفضل للأخطاء
-def setup_microphone():
-    """إعداد الميكروفون مع معالجة محسنة"""
-    global mic
+    if not pygame.mixer.get_init():
+        try:
+            pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+            print("✅ تم تهيئة pygame mixer بنجاح")
+        except Exception as e:
+            print(f"❌ خطأ في تهيئة pygame mixer: {e}")
+    return pygame
 
-    try:
-        print(f"🎤 محاولة إعداد الميكروفون {MIC_INDEX}...")
 
-        # عرض الميكروفونات المتاحة
-        microphones = sr.Microphone.list_microphone_names()
-        print(f"🎙️ الميكروفونات المتاحة: {len(microphones)}")
+# ملفات الضوضاء المحفوظة لكل ميكروفون - تسمح بإعادة التشغيل بدون ضبط كامل
+noise_profiles = NoiseProfileStore()
+mic_lock = threading.Lock()  # يمنع فتح الميكروفون من خيطين في نفس الوقت
+preprocessor = AudioPreprocessor() if MIC_CONFIG.get("preprocess", True) else None
+mic = None
+mic_device_name = None
 
-        if MIC_INDEX < len(microphones):
-            print(f"🎯 الميكروفون المختار: {MIC_INDEX} - {microphones[MIC_INDEX]}")
 
-        mic = sr.Microphone(device_index=MIC_INDEX)
+def get_device_name(device_index):
+    """اسم الميكروفون (مفتاح ملف الضوضاء)"""
+    if device_index is None:
+        return "default"
+    microphones = sr.Microphone.list_microphone_names()
+    print(f"🎙️ الميكروفونات المتاحة: {len(microphones)}")
+    if device_index < len(microphones):
+        print(f"🎯 الميكروفون المختار: {device_index} - {microphones[device_index]}")
+        return microphones[device_index]
+    return f"device_{device_index}"
 
-        with mic as source:
-            print("🔧 جاري ضبط الميكروفون للضوضاء المحيطة...")
-            recognizer.adjust_for_ambient_noise(source, duration=2)
-            print(f"✅ تم ضبط الميكروفون - مستوى الطاقة: {recognizer.energy_threshold}")
 
-        return True
+def measure_noise_spectrum(source, device_name, duration=0.5):
+    """تسجيل صمت قصير بعد الضبط لحساب طيف الضوضاء"""
+    if preprocessor is None:
+        return
+    chunks = max(1, int(duration * source.SAMPLE_RATE / source.CHUNK))
+    raw = b"".join(source.stream.read(source.CHUNK) for _ in range(chunks))
+    noise_profiles.update_spectrum(device_name, preprocessor.estimate_noise(raw, source.SAMPLE_RATE, source.SAMPLE_WIDTH))
 
-    except Exception as e:
-        print(f"❌ خطأ في إعداد الميكروفون {MIC_INDEX}: {e}")
 
-        # محاولة الميكروفون الافتراضي
+def calibrate_microphone(device_index, cached_name):
+    """ضبط الميكروفون للضوضاء في الخلفية بينما يستمر بدء التشغيل"""
+    global mic, mic_available, mic_device_name
+
+    with mic_lock:
         try:
-            print("🔄 محاولة الميكروفون الافتراضي...")
-            mic = sr.Microphone()
+            device_name = get_device_name(device_index)
+            mic_device_name = device_name
+
+            if device_name == cached_name:
+                print(f"⚡ تم استخدام ملف الضوضاء المحفوظ - مستوى الطاقة: {recognizer.energy_threshold:.0f}")
+                return
 
             with mic as source:
-                recognizer.adjust_for_ambient_noise(source, duration=1)
-                print(f"✅ تم إعداد الميكروفون الافتراضي - مستوى الطاقة: {recognizer.energy_threshold}")
+                print("🔧 جاري ضبط الميكروفون للضوضاء المحيطة (في الخلفية)...")
+                recognizer.adjust_for_ambient_noise(source, duration=2 if device_index is not None else 1)
+                noise_profiles.update(device_name, device_index, recognizer.energy_threshold)
+                measure_noise_spectrum(source, device_name)
+            print(f"✅ تم ضبط الميكروفون - مستوى الطاقة: {recognizer.energy_threshold}")
+
+        except Exception as e:
+            print(f"❌ خطأ في ضبط الميكروفون {device_index}: {e}")
+
+            if device_index is not None:
+                # محاولة الميكروفون الافتراضي
+                try:
+                    print("🔄 محاولة الميكروفون الافتراضي...")
+                    mic = sr.Microphone()
+                    mic_device_name = get_device_name(None)
+
+                    with mic as source:
+                        recognizer.adjust_for_ambient_noise(source, duration=1)
+                        noise_profiles.update(mic_device_name, None, recognizer.energy_threshold)
+                        measure_noise_spectrum(source, mic_device_name)
+                    print(f"✅ تم إعداد الميكروفون الافتراضي - مستوى الطاقة: {recognizer.energy_threshold}")
+                    return
+
+                except Exception as e2:
+                    print(f"❌ فشل في إعداد الميكروفون الافتراضي: {e2}")
+
+            print("💡 سيتم المتابعة بدون ميكروفون - يمكنك استخدام الكتابة")
+            mic = None
+            mic_available = False
 
-            return True
 
+# إعداد الميكروفون مع معالجة أفضل للأخطاء
+def setup_microphone():
+    """إعداد الميكروفون بدون انتظار: الضبط للضوضاء يتم في خيط خلفي"""
+    global mic
+
+    print(f"🎤 محاولة إعداد الميكروفون {MIC_INDEX}...")
+    device_index = MIC_INDEX
+
+    try:
+        mic = sr.Microphone(device_index=MIC_INDEX)
+    except Exception as e:
+        print(f"❌ خطأ في إعداد الميكروفون {MIC_INDEX}: {e}")
+        try:
+            print("🔄 محاولة الميكروفون الافتراضي...")
+            mic = sr.Microphone()
+            device_index = None
         except Exception as e2:
             print(f"❌ فشل في إعداد الميكروفون الافتراضي: {e2}")
             print("💡 سيتم المتابعة بدون ميكروفون - يمكنك استخدام الكتابة")
             mic = None
             return False
 
+    # إعادة التشغيل الدافئة: تطبيق ملف الضوضاء المحفوظ فوراً
+    cached_name, profile = noise_profiles.lookup_index(device_index)
+    if profile:
+        recognizer.energy_threshold = profile["energy_threshold"]
+        if preprocessor is not None:
+            if "noise_spectrum" in profile:
+                preprocessor.set_noise_spectrum(profile["noise_spectrum"])
+            else:
+                preprocessor.noise_from_threshold(recognizer.energy_threshold, recognizer.dynamic_energy_ratio)
+
+    threading.Thread(
+        target=calibrate_microphone,
+        args=(device_index, cached_name),
+        name="mic-calibration",
+        daemon=True
+    ).start()
+    return True
+
 
 # إعداد الميكروفون
 mic_available = setup_microphone()
 
-# تكوين النموذج
-llm = ChatOllama(
-    model="command-r7b-arabic",
-    reasoning=False,
-    temperature=0.1
-)
+# التقاط مستمر: الميكروفون يبقى مفتوحاً والمقاطع تصل عبر طابور مع pre-roll
+# نهاية المقطع يحددها VAD فور اكتشاف الصمت بدلاً من phrase_time_limit الثابت
+USE_VAD = MIC_CONFIG.get("endpointing", "vad") == "vad"
+capture = ContinuousCapture(
+    recognizer,
+    endpointer=SpectralVAD(recognizer, max_hangover=MIC_CONFIG.get("pause_threshold", 0.8)) if USE_VAD else None,
+    pre_roll_seconds=MIC_CONFIG.get("pre_roll_seconds", 0.5),
+    max_phrase_seconds=MIC_CONFIG.get("max_phrase_seconds", 15) if USE_VAD else MIC_CONFIG.get("phrase_time_limit", 4),
+    barge_in_energy_ratio=MIC_CONFIG.get("barge_in_energy_ratio", 3.0)
+) if mic_available else None
+BARGE_IN = MIC_CONFIG.get("barge_in", True)
 
 
-class AdamAssistant:
-    """نظام المساعد الذكي آدم مع تنفيذ مباشر للأدوات"""
+def start_capture():
+    """بدء خيط الالتقاط بعد انتهاء ضبط الميكروفون"""
+    if capture is not None:
+        capture.start(lambda: mic if mic_available else None, mic_lock)
 
-    def __init__(self):
-        # قاموس الأدوات المتاحة
-        self.tools = {
-            'play_music': play_music,
-            'open_app': open_app,
-            'show_system_info': show_system_info,
-            'list_processes': list_processes,
-            'close_program': close_program,
-            'create_new_folder': create_new_folder,
-            'list_files': list_files,
-            'shutdown_computer': shutdown_computer,
-            'restart_computer': restart_computer,
-            'find_files': find_files,
-            'open_website': open_website,
-            'set_volume': set_volume,
-            'get_time': get_time,
-            'search_google': search_google,
-            'get_website_info': get_website_info,
-            'search_and_read': search_and_read,
-            'get_news': get_news
-        }
-
-        # خريطة الكلمات المفتاحية للأدوات
-        self.keyword_to_tool = {
-            # كلمات الموسيقى
-            'شغل': self._handle_music_or_app,
-            'تشغيل': self._handle_music_or_app,
-            'موسيقى': lambda query: self.tools['play_music'](query),
-            'أغنية': lambda query: self.tools['play_music'](query),
-
-            # كلمات التطبيقات
-            'افتح': self._handle_open_command,
-            'فتح': self._handle_open_command,
-
-            # كلمات البحث والإنترنت
-            'ابحث': lambda query: self.tools['search_google'](query),
-            'بحث': lambda query: self.tools['search_google'](query),
-            'أخبار': lambda query="أخبار اليوم": self.tools['get_news'](query),
-            'معلومات': self._handle_info_request,
-
-            # كلمات الطقس والحرارة
-            'درجة الحرارة': self._handle_weather_request,
-            'درجه الحراره': self._handle_weather_request,
-            'الحرارة': self._handle_weather_request,
-            'الحراره': self._handle_weather_request,
-            'الطقس': self._handle_weather_request,
-            'طقس': self._handle_weather_request,
-            'حرارة': self._handle_weather_request,
-            'حراره': self._handle_weather_request,
-            'كم درجة': self._handle_weather_request,
-            'كم درجه': self._handle_weather_request,
-
-            # كلمات النظام
-            'معلومات النظام': lambda: self.tools['show_system_info'](),
-            'العمليات': lambda: self.tools['list_processes'](),
-            'الوقت': lambda city="بغداد": self.tools['get_time'](city),
-
-            # كلمات الإدارة
-            'اطفئ': lambda delay=1: self.tools['shutdown_computer'](delay),
-            'اعد تشغيل': lambda delay=1: self.tools['restart_computer'](delay),
-            'انشئ مجلد': lambda name, location=".": self.tools['create_new_folder'](name, location),
-        }
-
-    def _handle_music_or_app(self, command):
-        """معالجة أوامر الموسيقى أو التطبيقات"""
-        if any(word in command.lower() for word in ['موسيقى', 'أغنية', 'نغمة']):
-            # استخراج اسم الأغنية أو الفنان
-            music_query = self._extract_music_query(command)
-            return self.tools['play_music'].invoke({"query": music_query})
-        else:
-            # تطبيق
-            app_name = self._extract_app_name(command)
-            return self.tools['open_app'].invoke({"app_name": app_name})
-
-    def _handle_open_command(self, command):
-        """معالجة أوامر الفتح"""
-        if 'موقع' in command.lower():
-            url = self._extract_url(command)
-            return self.tools['open_website'].invoke({"url": url})
-        else:
-            app_name = self._extract_app_name(command)
-            return self.tools['open_app'].invoke({"app_name": app_name})
 
-    def _handle_weather_request(self, command):
-        """معالجة طلبات الطقس ودرجة الحرارة"""
-        try:
-            # استخراج اسم المدينة من الأمر
-            city = self._extract_city_from_command(command)
+# محرك التعرف على الكلام (google / vosk / fake) من config.json
+asr_backend = create_backend(ASR_CONFIG, recognizer)
+print(f"🗣️ محرك التعرف على الكلام: {asr_backend.name}")
 
-            # البحث عن معلومات الطقس
-            if city:
-                weather_query = f"طقس {city} اليوم درجة الحرارة"
-            else:
-                weather_query = "طقس بغداد اليوم درجة الحرارة"
+# التعرف المتزامن على اللهجات العربية
+dialect_recognizer = DialectRecognizer(asr_backend, ASR_CONFIG.get("dialects", DEFAULT_DIALECTS))
 
-            print(f"🌤️ البحث عن معلومات الطقس: {weather_query}")
-            return self.tools['search_google'](weather_query)
 
-        except Exception as e:
-            return f"عذراً، حدث خطأ في البحث عن معلومات الطقس: {str(e)}"
+def load_wake_word_detector():
+    """تحميل نموذج كلمة التفعيل المحلي إن وُجد (يتطلب numpy)"""
+    model_path = MIC_CONFIG.get("wake_word_model", "wake_word.npz")
+    if not model_path or not os.path.exists(model_path):
+        return None
+    try:
+        from tools.wake_word import WakeWordDetector
 
-    def _handle_info_request(self, command):
-        """معالجة طلبات المعلومات العامة"""
-        try:
-            # استخراج موضوع البحث
-            search_query = command.replace('معلومات', '').replace('عن', '').strip()
+        detector = WakeWordDetector.load(model_path)
+        print(f"✅ تم تحميل نموذج كلمة التفعيل المحلي ({len(detector.templates)} قوالب)")
+        return detector
+    except Exception as e:
+        print(f"⚠️ خطأ في تحميل نموذج كلمة التفعيل: {e}")
+        return None
 
-            if not search_query:
-                search_query = "معلومات عامة"
 
-            print(f"🔍 البحث عن معلومات: {search_query}")
-            return self.tools['search_google'](search_query)
+# رصد كلمة التفعيل محلياً بدلاً من إرسال كل صوت إلى Google
+wake_word_detector = load_wake_word_detector()
 
-        except Exception as e:
-            return f"عذراً، حدث خطأ في البحث عن المعلومات: {str(e)}"
-
-    def _extract_city_from_command(self, command):
-        """استخراج اسم المدينة من أمر الطقس"""
-        cities = {
-            'بغداد': 'بغداد',
-            'القاهرة': 'القاهرة',
-            'الرياض': 'الرياض',
-            'دبي': 'دبي',
-            'الكويت': 'الكويت',
-            'بيروت': 'بيروت',
-            'عمان': 'عمان',
-            'الدوحة': 'الدوحة',
-            'أبوظبي': 'أبوظبي',
-            'مكة': 'مكة',
-            'المدينة': 'المدينة المنورة',
-            'جدة': 'جدة',
-            'الإسكندرية': 'الإسكندرية',
-            'دمشق': 'دمشق',
-            'حلب': 'حلب'
-        }
-
-        command_lower = command.lower()
-        for city_key, city_name in cities.items():
-            if city_key.lower() in command_lower:
-                return city_name
-
-        # إذا لم نجد مدينة محددة، استخدم بغداد كافتراضي
-        return 'بغداد'
-
-    def _extract_music_query(self, command):
-        """استخراج استعلام الموسيقى من الأمر"""
-        # البحث عن أسماء فنانين أو أنواع موسيقية
-        artists = ['باخ', 'بيتهوفن', 'موتسارت', 'عمرو دياب', 'فيروز', 'أم كلثوم']
-        genres = ['كلاسيك', 'جاز', 'روك', 'بوب', 'حزين', 'سعيد', 'هادئ']
-
-        command_lower = command.lower()
-
-        for artist in artists:
-            if artist in command_lower:
-                return artist
-
-        for genre in genres:
-            if genre in command_lower:
-                return genre
-
-        return ""  # بحث عام
-
-    def _extract_app_name(self, command):
-        """استخراج اسم التطبيق من الأمر مع معالجة محسنة"""
-        app_mapping = {
-            'حاسبة': 'calculator',
-            'حاسب': 'calculator',
-            'حاس': 'calculator',
-            'مفكرة': 'notepad',
-            'مفكره': 'notepad',
-            'رسام': 'paint',
-            'الرسام': 'paint',
-            'متصفح': 'chrome',
-            'كروم': 'chrome',
-            'فايرفوكس': 'firefox',
-            'اكسبلورر': 'explorer',
-            'مستكشف': 'explorer',
-            'مدير المهام': 'task manager'
-        }
-
-        command_lower = command.lower().strip()
-
-        # البحث المباشر
-        for arabic_name, english_name in app_mapping.items():
-            if arabic_name in command_lower:
-                print(f"🎯 تم تحديد التطبيق: {arabic_name} → {english_name}")
-                return english_name
-
-        # البحث الجزئي
-        for arabic_name, english_name in app_mapping.items():
-            if any(part in command_lower for part in arabic_name.split()):
-                print(f"🎯 تطابق جزئي: {arabic_name} → {english_name}")
-                return english_name
-
-        # استخراج الكلمة بعد "افتح" أو "شغل"
-        words = command.split()
-        for i, word in enumerate(words):
-            if word in ['افتح', 'شغل', 'فتح']:
-                if i + 1 < len(words):
-                    extracted_name = words[i + 1]
-                    # البحث في الخريطة مرة أخرى
-                    for arabic_name, english_name in app_mapping.items():
-                        if arabic_name in extracted_name.lower():
-                            return english_name
-                    return extracted_name
-
-        return command  # إرجاع الأمر كاملاً كاسم التطبيق
-
-    def _extract_url(self, command):
-        """استخراج الرابط من الأمر"""
-        sites = {
-            'جوجل': 'google.com',
-            'يوتيوب': 'youtube.com',
-            'فيسبوك': 'facebook.com',
-            'تويتر': 'twitter.com',
-            'انستقرام': 'instagram.com'
-        }
-
-        command_lower = command.lower()
-        for site_name, url in sites.items():
-            if site_name in command_lower:
-                return url
-
-        return "google.com"  # افتراضي
-
-    def process_command(self, command):
-        """معالجة الأمر وتنفيذ الأداة المناسبة مباشرة"""
+
+# تكوين النموذج - يتم إنشاؤه عند أول حاجة له ويُفرغ من الذاكرة بعد الخمول
+llm_manager = ModelManager(
+    model=AI_CONFIG.get("model_name", "command-r7b-arabic"),
+    reasoning=AI_CONFIG.get("reasoning", False),
+    temperature=AI_CONFIG.get("temperature", 0.1),
+    keep_alive=AI_CONFIG.get("keep_alive", "30m"),
+    idle_unload_minutes=AI_CONFIG.get("idle_unload_minutes", 20),
+    num_ctx=AI_CONFIG.get("num_ctx"),
+    num_predict=AI_CONFIG.get("num_predict", AI_CONFIG.get("max_tokens")),
+    max_in_flight=AI_CONFIG.get("max_in_flight", 1)
+)
+
+
+class AdamAssistant:
+    """نظام المساعد الذكي آدم مع تنفيذ مباشر للأدوات"""
+
+    def __init__(self):
+        # قاموس الأدوات المتاحة (سجل كسول يستورد الوحدة عند أول استدعاء)
+        self.tools = tool_registry
+        # نتائج أدوات البحث والأخبار ومعلومات النظام تُعاد من الذاكرة خلال مدة صلاحيتها
+        self.result_cache = None
+        if RESULT_CACHE_CONFIG.get("enabled", True):
+            self.result_cache = ResultCache(
+                max_entries=RESULT_CACHE_CONFIG.get("max_entries", 256),
+                max_bytes=RESULT_CACHE_CONFIG.get("max_kb", 2048) * 1024,
+                disk_path=RESULT_CACHE_CONFIG.get("disk_path") if RESULT_CACHE_CONFIG.get("disk", False) else None,
+                ttl_overrides=RESULT_CACHE_CONFIG.get("ttl_seconds", {})
+            )
+            self.tools = CachedToolRegistry(tool_registry, self.result_cache)
+        # النوايا مُعرّفة بجانب الأدوات في tools/intents.py وتُبنى مرة واحدة
+        # الأوامر المكررة تنتقل مباشرة إلى الأداة (قرارات محفوظة بين مرات التشغيل)
+        self.command_cache = None
+        if COMMAND_CACHE_CONFIG.get("enabled", True):
+            self.command_cache = CommandCache(
+                max_entries=COMMAND_CACHE_CONFIG.get("max_entries", 500),
+                ttl=COMMAND_CACHE_CONFIG.get("ttl_hours", 168) * 3600,
+                version=routing_fingerprint()
+            )
+        self.router = IntentRouter(cache=self.command_cache)
+        # الأدوات تعمل على مجموعة خيوط محدودة بمهلة لكل أداة (الأوامر المركبة بالتوازي)
+        self.runner = ToolRunner(
+            self.tools,
+            max_workers=TOOLS_CONFIG.get("max_workers", 4),
+            default_timeout=TOOLS_CONFIG.get("default_timeout", 20),
+            ack_after=TOOLS_CONFIG.get("acknowledge_after", 2.0),
+            breaker=CircuitBreaker(TOOLS_CONFIG.get("failure_threshold", 3),
+                                   TOOLS_CONFIG.get("breaker_reset_seconds", 120))
+        )
+        self.acknowledge = None  # نطق عبارة الانتظار للأدوات الطويلة (تُعين في وضع الصوت)
+        # سياق المحادثة للنموذج: موجه ثابت + ملخص + آخر الأدوار ضمن ميزانية رموز
+        self.memory = ConversationMemory(
+            summarize=self.summarize_turns,
+            token_budget=MEMORY_CONFIG.get("token_budget", 1200),
+            max_turn_chars=MEMORY_CONFIG.get("max_turn_chars", 400)
+        )
+        # إجابات الأسئلة العامة المتكررة تُعاد من القرص بدون توليد
+        self.answers = None
+        if ANSWER_CACHE_CONFIG.get("enabled", True):
+            self.answers = SemanticCache(
+                threshold=ANSWER_CACHE_CONFIG.get("threshold", 0.85),
+                length_mismatch_threshold=ANSWER_CACHE_CONFIG.get("length_mismatch_threshold", 0.95),
+                ttl=ANSWER_CACHE_CONFIG.get("ttl_days", 30) * 24 * 3600,
+                max_entries=ANSWER_CACHE_CONFIG.get("max_entries", 2000)
+            )
+        if CLASSIFIER_CONFIG.get("enabled", True):
+            threading.Thread(target=self.train_classifier, daemon=True).start()
+
+    def shutdown(self):
+        """حفظ الذاكرة المؤقتة وطباعة إحصائياتها عند الإغلاق"""
+        if self.command_cache is not None:
+            self.command_cache.save()
+            if self.command_cache.summary():
+                print(f"⚡ ذاكرة الأوامر: {self.command_cache.summary()}")
+        if self.result_cache is not None and self.result_cache.summary():
+            print(f"⚡ ذاكرة نتائج الأدوات: {self.result_cache.summary()}")
+        if self.answers is not None:
+            self.answers.save()
+            if self.answers.summary():
+                print(f"💡 ذاكرة الإجابات: {self.answers.summary()}")
+        if self.memory.stats_summary():
+            print(f"🧮 سياق المحادثة: {self.memory.stats_summary()}")
+        self.runner.shutdown()
+
+    def remember(self, command, response):
+        """إضافة الدور المكتمل إلى سياق المحادثة"""
+        if isinstance(response, str):
+            self.memory.add_turn(command, response)
+
+    def summarize_turns(self, summary, turns):
+        """تلخيص الأدوار القديمة بالنموذج (يعمل في الخلفية)"""
+        from langchain_core.messages import HumanMessage, SystemMessage
+
+        lines = [f"ملخص سابق: {summary}"] if summary else []
+        for user, assistant in turns:
+            lines.append(f"المستخدم: {user}")
+            lines.append(f"آدم: {assistant}")
+        response = llm_manager.invoke([SystemMessage(content=SUMMARY_PROMPT), HumanMessage(content="\n".join(lines))],
+                                      priority=BACKGROUND, options={"num_predict": 200})
+        return response.content
+
+    def cancel(self, session=None):
+        """إلغاء انتظار الأمر الحالي (المستخدم بدأ أمراً جديداً) - لجلسة واحدة في وضع الخدمة"""
+        if self.runner.cancel(session):
+            print("⏹️ تم إلغاء الأمر السابق")
+
+    def train_classifier(self):
+        """تدريب مصنف النوايا في الخلفية (من الأمثلة اليدوية وسجل المحادثات)"""
         try:
-            print(f"🔍 تحليل الأمر: {command}")
+            from tools.intent_classifier import train
 
-            command_lower = command.lower()
-
-            # فحص خاص للطقس ودرجة الحرارة
-            weather_keywords = ['درجة الحرارة', 'درجه الحراره', 'الحرارة', 'الحراره', 'الطقس', 'طقس', 'حرارة', 'حراره']
-            if any(keyword in command_lower for keyword in weather_keywords):
-                print("🌤️ تم تحديد طلب طقس ودرجة حرارة")
-                return self._handle_weather_request(command)
-
-            # فحص خاص للأسئلة التي تبدأ بـ "كم"
-            if command_lower.startswith('كم') or 'كم درجة' in command_lower or 'كم درجه' in command_lower:
-                print("❓ تم تحديد سؤال كمي - البحث في الإنترنت")
-                search_query = command.replace('كم', '').strip()
-                return self.tools['search_google'](search_query)
-
-            # البحث عن الكلمة المفتاحية المناسبة
-            for keyword, handler in self.keyword_to_tool.items():
-                if keyword in command_lower:
-                    print(f"🎯 تم تحديد الإجراء: {keyword}")
-
-                    # تنفيذ الأداة مباشرة
-                    if callable(handler):
-                        try:
-                            if keyword in ['موسيقى', 'أغنية']:
-                                query = self._extract_music_query(command)
-                                result = handler(query)
-                            elif keyword in ['شغل', 'تشغيل']:
-                                result = handler(command)
-                            elif keyword in ['افتح', 'فتح']:
-                                result = handler(command)
-                            elif keyword in ['ابحث', 'بحث']:
-                                # استخراج كلمات البحث
-                                search_words = command_lower.replace('ابحث', '').replace('عن', '').strip()
-                                result = handler(search_words)
-                            elif keyword == 'أخبار':
-                                result = handler()
-                            elif keyword == 'معلومات':
-                                result = handler(command)
-                            elif keyword in weather_keywords:
-                                result = handler(command)
-                            elif keyword in ['معلومات النظام', 'العمليات', 'الوقت']:
-                                result = handler()
-                            else:
-                                result = handler(command)
+            classifier = train(self.router,
+                               threshold=CLASSIFIER_CONFIG.get("threshold", 0.3),
+                               margin=CLASSIFIER_CONFIG.get("margin", 0.05))
+            self.router.classifier = classifier
+            print(f"🧠 مصنف النوايا جاهز ({len(classifier)} نية)")
+        except Exception as e:
+            print(f"⚠️ تعذر تدريب مصنف النوايا، الأوامر غير المطابقة ستذهب للنموذج: {e}")
 
-                            print(f"✅ تم تنفيذ الأداة بنجاح")
-                            return result
+    def process_command(self, command, stream=False, session=None):
+        """معالجة الأمر وتنفيذ الأداة المناسبة مباشرة - None إذا أُلغي بأمر جديد
 
-                        except Exception as e:
-                            error_msg = f"❌ خطأ في تنفيذ الأداة: {str(e)}"
-                            print(error_msg)
-                            return error_msg
+        stream=True: رد النموذج يُرجع كمولد جمل (للنطق أثناء التوليد) بدلاً من نص كامل
+        session: الجلسة التي يمكن لأمرها التالي إلغاء هذا الأمر (وضع الخدمة)"""
+        try:
+            print(f"🔍 تحليل الأمر: {command}")
 
-            # إذا لم نجد أداة مطابقة، فحص إضافي للاستفسارات العامة
-            if any(word in command_lower for word in ['ما', 'متى', 'أين', 'لماذا', 'كيف', 'هل']):
-                print("❓ تم تحديد سؤال عام - البحث في الإنترنت")
-                return self.tools['search_google'](command)
+            parts = self.router.split(command)
+            if len(parts) > 1:
+                return self.process_parts(parts, session)
+
+            spec, args = self.router.route(command)
+            if spec is not None:
+                print(f"🎯 تم تحديد الإجراء: {spec.name} → {spec.tool}({args})")
+                try:
+                    result = self.runner.run(spec.tool, args, self.acknowledge, session)
+                except ToolCancelled:
+                    return None
+                except Exception as e:
+                    error_msg = f"❌ خطأ في تنفيذ الأداة: {str(e)}"
+                    print(error_msg)
+                    return error_msg
+
+                print(f"✅ تم تنفيذ الأداة بنجاح")
+                return result
 
             # استخدام النموذج للرد العام كخيار أخير
+            answer = self.answers.lookup(command) if self.answers is not None else None
+            if answer is not None:
+                return answer
+            if stream:
+                return self.stream_llm(command)
             try:
-                response = llm.invoke([HumanMessage(content=command)])
+                estimated = self.memory.estimated_tokens(command)
+                start = time.perf_counter()
+                response = llm_manager.invoke(self.memory.messages(command))
+                latency_ms = (time.perf_counter() - start) * 1000
+                self.memory.record(estimated, latency_ms, llm_manager.last_usage)
+                if self.answers is not None:
+                    self.answers.store(command, response.content, latency_ms)
                 return response.content
             except Exception as e:
                 return f"عذراً، لم أتمكن من فهم طلبك: {command}"
@@ -439,19 +463,83 @@ class AdamAssistant:
             print(error_msg)
             return error_msg
 
+    def stream_llm(self, command):
+        """جمل رد النموذج واحدة تلو الأخرى أثناء التوليد"""
+        try:
+            estimated = self.memory.estimated_tokens(command)
+            start = time.perf_counter()
+            sentences = []
+            for sentence in stream_sentences(llm_manager.stream(self.memory.messages(command))):
+                sentences.append(sentence)
+                yield sentence
+            latency_ms = (time.perf_counter() - start) * 1000
+            self.memory.record(estimated, latency_ms, llm_manager.last_usage)
+            if self.answers is not None:
+                self.answers.store(command, " ".join(sentences), latency_ms)
+        except Exception as e:
+            print(f"❌ خطأ في توليد الرد: {e}")
+            yield f"عذراً، لم أتمكن من فهم طلبك: {command}"
+
+    def process_parts(self, parts, session=None):
+        """تنفيذ أوامر فرعية بالتوازي وجمع نتائجها بترتيب ذكرها (الزمن = أبطأ أداة وليس مجموعها)"""
+        print(f"🔀 أمر مركب: {len(parts)} أوامر فرعية")
+        start = time.perf_counter()
+        calls = []
+        for part in parts:
+            spec, args = self.router.route(part)
+            if spec is not None:
+                print(f"🎯 تم تحديد الإجراء: {spec.name} → {spec.tool}({args})")
+            calls.append((part, spec, self.runner.submit(spec.tool, args, session) if spec is not None else None))
+
+        acknowledged = []
+
+        def acknowledge_once(text):
+            # عبارة انتظار واحدة للأمر المركب كله
+            if not acknowledged and self.acknowledge is not None:
+                acknowledged.append(text)
+                self.acknowledge(text)
+
+        responses = []
+        for part, spec, call in calls:
+            if spec is None:
+                responses.append(f"عذراً، لم أتمكن من فهم: {part}")
+                continue
+            if call is None:
+                responses.append(ToolRunner.unavailable(spec.tool))
+                continue
+            try:
+                result = self.runner.wait(call, acknowledge_once)
+            except ToolCancelled:
+                self.runner.cancel(session)
+                return None
+            except Exception as e:
+                result = f"❌ خطأ في تنفيذ الأداة: {str(e)}"
+                print(result)
+            responses.append(str(result))
+
+        print(f"✅ تم تنفيذ {len(parts)} أدوات في {(time.perf_counter() - start) * 1000:.0f} ms")
+        return "\n\n".join(responses)
+
 
 # إنشاء مثيل المساعد
 adam = AdamAssistant()
 
 
-def play_audio_with_pygame(audio_file_path):
-    """تشغيل الملف الصوتي باستخدام pygame"""
+def play_audio_with_pygame(audio_file_path, interrupted=None):
+    """تشغيل الملف الصوتي باستخدام pygame - يتوقف فوراً إذا بدأ المستخدم بالكلام (ويُضبط interrupted)"""
+    if interrupted is None:
+        interrupted = threading.Event()
+    barge_in = BARGE_IN and capture is not None and capture.running
     try:
-        if not pygame.mixer.get_init():
-            pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+        pygame = init_mixer()
 
         pygame.mixer.music.load(audio_file_path)
         pygame.mixer.music.play()
+        if barge_in:
+            # الالتقاط يستمر أثناء التشغيل، ومقطع المقاطعة يذهب إلى طابور الأوامر
+            capture.begin_playback(interrupted.set)
+        elif capture is not None:
+            capture.mute()  # لا نعتبر صوت المساعد نفسه أمراً جديداً
 
         print("🎵 بدء تشغيل الصوت باستخدام pygame...")
 
@@ -459,11 +547,14 @@ def play_audio_with_pygame(audio_file_path):
         timeout = 30
 
         while pygame.mixer.music.get_busy():
+            if interrupted.wait(0.05):
+                print("✋ قاطع المستخدم الرد - إيقاف الصوت")
+                pygame.mixer.music.stop()
+                return True
             if time.time() - start_time > timeout:
                 print("⏰ انتهت مهلة التشغيل، إيقاف الصوت")
                 pygame.mixer.music.stop()
                 break
-            time.sleep(0.1)
 
         print("✅ انتهى تشغيل الصوت بنجاح")
         return True
@@ -471,49 +562,137 @@ def play_audio_with_pygame(audio_file_path):
     except Exception as e:
         print(f"❌ خطأ في تشغيل الصوت: {e}")
         return False
+    finally:
+        if capture is not None:
+            capture.end_playback()
+            capture.unmute()
 
 
-async def speak_arabic(text: str):
-    """نظام النطق"""
+def remove_audio_file(audio_file_path):
+    """حذف الملف الصوتي المؤقت بعد أن يحرره نظام التشغيل"""
     try:
-        # تنظيف النص من markdown أو رموز غريبة
-        clean_text = text.replace('`', '').replace('```', '').replace('play_music', '')
-        clean_text = re.sub(r'\([^)]*\)', '', clean_text)  # إزالة النص داخل الأقواس
-        clean_text = clean_text.strip()
+        time.sleep(0.5)
+        if os.path.exists(audio_file_path):
+            os.remove(audio_file_path)
+            print("🗑️ تم حذف الملف الصوتي المؤقت")
+    except Exception as delete_error:
+        print(f"⚠️ لم يتم حذف الملف المؤقت: {delete_error}")
 
-        if not clean_text:
-            clean_text = "تم تنفيذ المهمة"
 
-        unique_filename = f"response_{uuid.uuid4().hex[:8]}.mp3"
-        audio_file_path = os.path.join(AUDIO_DIR, unique_filename)
+async def synthesize_speech(text: str):
+    """تحويل النص إلى ملف صوتي بـ edge-tts وإرجاع مساره (أو None)"""
+    # تنظيف النص من markdown أو رموز غريبة
+    clean_text = text.replace('`', '').replace('```', '').replace('play_music', '')
+    clean_text = re.sub(r'\([^)]*\)', '', clean_text)  # إزالة النص داخل الأقواس
+    clean_text = clean_text.strip()
 
-        print(f"🔊 جاري إنشاء الملف الصوتي للنص: {clean_text[:50]}...")
+    if not clean_text:
+        clean_text = "تم تنفيذ المهمة"
 
-        communicate = edge_tts.Communicate(text=clean_text, voice="ar-IQ-BasselNeural")
-        await communicate.save(audio_file_path)
+    unique_filename = f"response_{uuid.uuid4().hex[:8]}.mp3"
+    audio_file_path = os.path.join(AUDIO_DIR, unique_filename)
 
-        if os.path.exists(audio_file_path):
-            print(f"✅ تم إنشاء الملف الصوتي بنجاح")
+    print(f"🔊 جاري إنشاء الملف الصوتي للنص: {clean_text[:50]}...")
 
-            if play_audio_with_pygame(audio_file_path):
-                print("🎵 تم تشغيل الصوت بنجاح باستخدام pygame")
+    import edge_tts
 
-            # حذف الملف
-            try:
-                time.sleep(1)
-                pygame.mixer.music.unload()
-                time.sleep(0.5)
+    communicate = edge_tts.Communicate(text=clean_text, voice="ar-IQ-BasselNeural")
+    await communicate.save(audio_file_path)
+
+    if os.path.exists(audio_file_path):
+        print(f"✅ تم إنشاء الملف الصوتي بنجاح")
+        return audio_file_path
+    return None
+
+
+def play_and_remove(audio_file_path, interrupted=None):
+    """تشغيل الملف الصوتي ثم حذفه في الخلفية"""
+    if play_audio_with_pygame(audio_file_path, interrupted):
+        print("🎵 تم تشغيل الصوت بنجاح باستخدام pygame")
+
+    # حذف الملف في الخلفية حتى لا يتأخر الاستماع للأمر التالي (أو للمقاطعة)
+    try:
+        init_mixer().mixer.music.unload()
+    except Exception as unload_error:
+        print(f"⚠️ لم يتم تحرير الملف الصوتي: {unload_error}")
+    threading.Thread(target=remove_audio_file, args=(audio_file_path,), daemon=True).start()
 
-                if os.path.exists(audio_file_path):
-                    os.remove(audio_file_path)
-                    print("🗑️ تم حذف الملف الصوتي المؤقت")
-            except Exception as delete_error:
-                print(f"⚠️ لم يتم حذف الملف المؤقت: {delete_error}")
 
+async def speak_arabic(text: str):
+    """نظام النطق"""
+    try:
+        audio_file_path = await synthesize_speech(text)
+        if audio_file_path:
+            play_and_remove(audio_file_path)
     except Exception as e:
         print(f"❌ خطأ في نطق النص: {e}")
 
 
+def _pipe(items, output, stop, transform=None):
+    """نقل عناصر مولد إلى طابور (مع تحويل اختياري) حتى نهايته أو حتى الإيقاف، ثم None"""
+    try:
+        for item in items:
+            if stop.is_set():
+                break
+            item = transform(item) if transform else item
+            if item is not None:
+                output.put(item)
+    except Exception as e:
+        print(f"❌ خطأ أثناء النطق المتدفق: {e}")
+    finally:
+        output.put(None)
+
+
+def _iterate(source):
+    """مولد من طابور حتى None"""
+    while True:
+        item = source.get()
+        if item is None:
+            return
+        yield item
+
+
+def speak_stream(sentences, started=None):
+    """نطق الجمل أثناء توليدها وإرجاع النص الكامل
+
+    ثلاث مراحل متوازية: النموذج يولد الجمل، edge-tts يركب الجملة التالية،
+    والتشغيل يعمل على الجملة الحالية. زمن أول صوت = زمن الجملة الأولى فقط.
+    المقاطعة بالكلام توقف التشغيل والتوليد معاً."""
+    started = started or time.perf_counter()
+    stop = threading.Event()
+    spoken = []
+    sentence_queue = queue.Queue()
+    audio_queue = queue.Queue(maxsize=2)  # لا نركب أكثر من جملتين قبل تشغيلهما
+
+    def collect(sentence):
+        spoken.append(sentence)
+        print(f"📝 جملة: {sentence}")
+        return sentence
+
+    def synthesize_all():
+        loop = asyncio.new_event_loop()
+        try:
+            _pipe(_iterate(sentence_queue), audio_queue, stop,
+                  lambda sentence: loop.run_until_complete(synthesize_speech(sentence)))
+        finally:
+            loop.close()
+
+    threading.Thread(target=_pipe, args=(sentences, sentence_queue, stop, collect), daemon=True).start()
+    threading.Thread(target=synthesize_all, daemon=True).start()
+
+    first = True
+    for audio_file_path in _iterate(audio_queue):
+        if stop.is_set():
+            threading.Thread(target=remove_audio_file, args=(audio_file_path,), daemon=True).start()
+            continue
+        if first:
+            print(f"⏱️ زمن أول صوت: {(time.perf_counter() - started) * 1000:.0f} ms")
+            first = False
+        play_and_remove(audio_file_path, stop)
+
+    return " ".join(spoken)
+
+
 def speak_text(text: str):
     """تشغيل النطق"""
     try:
@@ -525,41 +704,89 @@ def speak_text(text: str):
 
 def listen_for_audio(timeout=5, phrase_timeout=1):
     """الاستماع للصوت مع معالجة محسنة للأخطاء"""
-    if not mic_available or mic is None:
-        print("❌ الميكروفون غير متاح")
-        return None
+    timeout = MIC_CONFIG.get("timeout", 8)
+    phrase_timeout = MIC_CONFIG.get("phrase_time_limit", 4)
+
+    if capture is not None and capture.active:
+        # المقطع التالي من الالتقاط المستمر - بدون إعادة فتح الجهاز
+        print("🎤 جاري الاستماع...")
+        audio = capture.get_utterance(timeout=timeout)
+        if audio is None:
+            print("⌛ انتهت مهلة الانتظار")
+        if recognizer.dynamic_energy_threshold:
+            noise_profiles.refine(mic_device_name, recognizer.energy_threshold)
+        return audio
+
+    # ينتظر انتهاء ضبط الميكروفون في الخلفية إن كان لا يزال جارياً
+    with mic_lock:
+        if not mic_available or mic is None:
+            print("❌ الميكروفون غير متاح")
+            return None
 
-    try:
-        timeout = MIC_CONFIG.get("timeout", 8)
-        phrase_timeout = MIC_CONFIG.get("phrase_time_limit", 4)
-
-        with mic as source:
-            print("🎤 جاري الاستماع...")
-            audio = recognizer.listen(source, timeout=timeout, phrase_time_limit=phrase_timeout)
-            return audio
-    except sr.WaitTimeoutError:
-        print("⌛ انتهت مهلة الانتظار")
-        return None
-    except Exception as e:
-        print(f"❌ خطأ في الاستماع: {e}")
-        return None
+        try:
+            with mic as source:
+                print("🎤 جاري الاستماع...")
+                audio = recognizer.listen(source, timeout=timeout, phrase_time_limit=phrase_timeout)
+                return audio
+        except sr.WaitTimeoutError:
+            print("⌛ انتهت مهلة الانتظار")
+            return None
+        except Exception as e:
+            print(f"❌ خطأ في الاستماع: {e}")
+            return None
+        finally:
+            # العتبة الديناميكية تتكيف أثناء إطارات الصمت - نحفظها تدريجياً
+            if recognizer.dynamic_energy_threshold:
+                noise_profiles.refine(mic_device_name, recognizer.energy_threshold)
+
+
+def wait_for_wake_word(timeout=10):
+    """انتظار كلمة التفعيل على إطارات الميكروفون الخام - بدون أي اتصال بالشبكة"""
+    if capture is not None and capture.active:
+        frames = capture.subscribe()
+        try:
+            wake_word_detector.reset()
+            deadline = time.time() + timeout
+            while time.time() < deadline:
+                try:
+                    chunk = frames.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                wake_word_detector.energy_threshold = recognizer.energy_threshold
+                if wake_word_detector.accept(chunk, capture.sample_rate, capture.sample_width):
+                    capture.clear()  # مقطع كلمة التفعيل نفسه لا يُعتبر أمراً
+                    return True
+        finally:
+            capture.unsubscribe(frames)
+        return False
+
+    with mic_lock:
+        if not mic_available or mic is None:
+            return False
+
+        try:
+            with mic as source:
+                wake_word_detector.reset()
+                deadline = time.time() + timeout
+                while time.time() < deadline:
+                    chunk = source.stream.read(source.CHUNK)
+                    wake_word_detector.energy_threshold = recognizer.energy_threshold
+                    if wake_word_detector.accept(chunk, source.SAMPLE_RATE, source.SAMPLE_WIDTH):
+                        return True
+        except Exception as e:
+            print(f"❌ خطأ في رصد كلمة التفعيل: {e}")
+        return False
 
 
 def recognize_speech(audio, language="ar-SA"):
-    """التعرف على الكلام مع محاولات متعددة"""
-    languages_to_try = ["ar-IQ", "ar-SA", "ar-EG"]
-    for lang in languages_to_try:
+    """التعرف على الكلام بكل اللهجات في نفس الوقت (الترتيب يتكيف مع نجاح كل لهجة)"""
+    if preprocessor is not None:
         try:
-            text = recognizer.recognize_google(audio, language=lang)
-            print(f"✅ تم التعرف على النص ({lang}): {text}")
-            return text
-        except sr.UnknownValueError:
-            continue
-        except sr.RequestError as e:
-            print(f"❌ خطأ في طلب التعرف على الكلام: {e}")
-            continue
-    print("❌ لم يتم التعرف على أي نص")
-    return None
+            audio = preprocessor.process(audio)
+        except Exception as e:
+            print(f"⚠️ تعذرت معالجة الصوت، سيتم إرسال التسجيل الخام: {e}")
+    text, _ = dialect_recognizer.recognize(audio)
+    return text
 
 
 def save_conversation(input_text: str, response_text: str):
@@ -584,6 +811,7 @@ def save_conversation(input_text: str, response_text: str):
 
 def display_capabilities():
     """عرض قدرات المساعد"""
+    # الأمثلة نفسها في CAPABILITY_EXAMPLES بـ tools/intents.py (تحقق: python -m tools.intents check)
     print("""
 🚀 المساعد الذكي آدم - النظام المُحسن بالتنفيذ المباشر
 
@@ -623,6 +851,86 @@ def get_text_input():
         return None
 
 
+def split_wake_word(transcript):
+    """النص بعد كلمة التفعيل: None إذا لم تُذكر، و"" إذا قيلت وحدها"""
+    words = transcript.split()
+    normalized = [normalize_arabic(word).strip("،,.!?؟") for word in words]
+    if TRIGGER_NORMALIZED not in normalized:
+        return None
+    rest = words[normalized.index(TRIGGER_NORMALIZED) + 1:]
+    if rest and normalize_arabic(rest[0]) == "يا":
+        rest = rest[1:]
+    return " ".join(rest).strip(" ،,.!?؟")
+
+
+def command_after_local_wake_word():
+    """هل استمر الكلام بعد كلمة التفعيل في نفس المقطع؟ نتعرف عليه مرة واحدة بدلاً من الترحيب والاستماع من جديد"""
+    if capture is None or not capture.active:
+        return ""
+    # المهلة القصيرة لبدء الكلام فقط: الأمر الطويل الجاري يُنتظر حتى نهايته
+    audio = capture.wait_for_utterance(start_timeout=capture.endpointer.end_silence_seconds() + 0.7)
+    if audio is None:
+        return ""
+    duration = len(audio.frame_data) / (audio.sample_rate * audio.sample_width)
+    wake_word_only = capture.pre_roll_seconds + wake_word_detector.window_seconds / 2 + capture.endpointer.end_silence_seconds()
+    if duration < wake_word_only + 0.4:
+        return ""
+    transcript = recognize_speech(audio, "ar-IQ")
+    if not transcript:
+        return ""
+    command = split_wake_word(transcript)
+    # إذا لم يكتب المحرك كلمة التفعيل بنفس الشكل نعتبر المقطع كله أمراً
+    return transcript.strip() if command is None else command
+
+
+def watch_for_new_command():
+    """أثناء تنفيذ الأداة: كلام المستخدم يلغي انتظارها ويُلتقط كأمر جديد"""
+    if BARGE_IN and capture is not None and capture.running:
+        capture.begin_watch(adam.cancel)
+
+
+def speak_acknowledgement(text):
+    """عبارة الانتظار للأدوات الطويلة ("لحظة، أبحث لك...")"""
+    speak_text(text)  # المقاطعة أثناء العبارة تلغي الأداة أيضاً (begin_watch لا ينتهي بانتهاء الصوت)
+
+
+def respond(command):
+    """تنفيذ الأمر ونطق الرد وحفظ المحادثة"""
+    print(f"📥 الأمر المستلم: {command}")
+    print("🤖 جاري معالجة الطلب...")
+    started = time.perf_counter()
+
+    try:
+        # استخدام النظام الجديد للمعالجة المباشرة
+        watch_for_new_command()
+        try:
+            response = adam.process_command(command, stream=STREAM_SPEECH)
+        finally:
+            if capture is not None:
+                capture.end_watch()
+
+        if response is None:
+            print("⏹️ أُلغي الأمر، الاستماع للأمر الجديد")
+            return True
+
+        if isinstance(response, str):
+            print(f"✅ رد المساعد: {response}")
+            speak_text(response)
+        else:
+            # رد النموذج: كل جملة تُنطق فور اكتمالها
+            response = speak_stream(response, started)
+            print(f"✅ رد المساعد: {response}")
+        save_conversation(command, response)
+        adam.remember(command, response)
+        return True
+
+    except Exception as e:
+        error_msg = "عذراً، حدث خطأ في معالجة طلبك"
+        print(f"❌ خطأ في المعالجة: {e}")
+        speak_text(error_msg)
+        return False
+
+
 def main():
     conversation_mode = False
     last_interaction_time = None
@@ -635,12 +943,32 @@ def main():
         print("💡 لإصلاح الميكروفون، شغل: python mic_fix.py")
 
     display_capabilities()
+    adam.acknowledge = speak_acknowledgement
+
+    # تسخين النموذج في الخلفية حتى لا يدفع أول سؤال زمن التحميل
+    if AI_CONFIG.get("warm_up_on_start", True):
+        llm_manager.warm_up()
+    llm_manager.start_idle_watcher()
+    start_capture()
 
     try:
         while True:
             try:
                 if not conversation_mode:
-                    if mic_available:
+                    if mic_available and wake_word_detector is not None:
+                        print(f"\n🔍 في انتظار كلمة التفعيل '{TRIGGER_WORD}' (رصد محلي)...")
+                        if wait_for_wake_word():
+                            print(f"🎉 تم تفعيل المساعد (رصد محلي، المسافة {wake_word_detector.last_score:.2f})")
+                            llm_manager.warm_up()
+                            conversation_mode = True
+                            last_interaction_time = time.time()
+                            command = command_after_local_wake_word()
+                            if command:
+                                respond(command)
+                                last_interaction_time = time.time()
+                            else:
+                                speak_text("نعم، كيف يمكنني مساعدتك؟")
+                    elif mic_available:
                         print(f"\n🔍 في انتظار كلمة التفعيل '{TRIGGER_WORD}'...")
                         audio = listen_for_audio(timeout=10, phrase_timeout=3)
                         if audio is None:
@@ -648,10 +976,16 @@ def main():
                         transcript = recognize_speech(audio, "ar-IQ")
                         if transcript is None:
                             continue
-                        if transcript and TRIGGER_WORD.lower() in transcript.lower():
+                        command = split_wake_word(transcript)
+                        if command is not None:
                             print(f"🎉 تم تفعيل المساعد بواسطة: {transcript}")
-                            speak_text("نعم، كيف يمكنني مساعدتك؟")
+                            llm_manager.warm_up()
                             conversation_mode = True
+                            if command:
+                                # "ادم افتح الحاسبة": الأمر في نفس المقطع - بدون ترحيب أو استماع ثانٍ
+                                respond(command)
+                            else:
+                                speak_text("نعم، كيف يمكنني مساعدتك؟")
                             last_interaction_time = time.time()
                         else:
                             print(f"🔄 لم يتم العثور على كلمة التفعيل. سمعت: '{transcript}'")
@@ -661,10 +995,15 @@ def main():
                         text_input = get_text_input()
                         if text_input is None:
                             break
-                        if TRIGGER_WORD.lower() in text_input.lower():
+                        command = split_wake_word(text_input)
+                        if command is not None:
                             print(f"🎉 تم تفعيل المساعد")
-                            speak_text("نعم، كيف يمكنني مساعدتك؟")
+                            llm_manager.warm_up()
                             conversation_mode = True
+                            if command:
+                                respond(command)
+                            else:
+                                speak_text("نعم، كيف يمكنني مساعدتك؟")
                             last_interaction_time = time.time()
                 else:
                     if mic_available:
@@ -685,23 +1024,9 @@ def main():
                         if command is None:
                             break
 
-                    print(f"📥 الأمر المستلم: {command}")
-                    print("🤖 جاري معالجة الطلب...")
-
-                    try:
-                        # استخدام النظام الجديد للمعالجة المباشرة
-                        response = adam.process_command(command)
-
-                        print(f"✅ رد المساعد: {response}")
-                        speak_text(response)
-                        save_conversation(command, response)
+                    if respond(command):
                         last_interaction_time = time.time()
 
-                    except Exception as e:
-                        error_msg = "عذراً، حدث خطأ في معالجة طلبك"
-                        print(f"❌ خطأ في المعالجة: {e}")
-                        speak_text(error_msg)
-
                     if time.time() - last_interaction_time > CONVERSATION_TIMEOUT:
                         print("⌛ انتهت مهلة المحادثة")
                         speak_text("تم انتهاء الجلسة. قل كلمة التفعيل للبدء من جديد.")
@@ -717,12 +1042,65 @@ def main():
     except Exception as e:
         print(f"❌ خطأ حرج في البرنامج: {e}")
     finally:
+        if capture is not None:
+            capture.stop()
+        if preprocessor is not None:
+            noise_profiles.update_spectrum(mic_device_name, preprocessor.noise_spectrum)
+            if preprocessor.timings:
+                print(f"⏱️ زمن معالجة الصوت: {sum(preprocessor.timings) / len(preprocessor.timings):.1f} ms لكل مقطع")
+        noise_profiles.save()
+        adam.shutdown()
+        dialect_recognizer.stats.save()
+        if asr_backend.latency_summary():
+            print(f"⏱️ زمن التعرف على الكلام: {asr_backend.latency_summary()}")
+        latency = llm_manager.latency_summary()
+        if latency:
+            print(f"⏱️ زمن استدعاءات النموذج: {latency}")
         try:
-            pygame.mixer.quit()
-            print("🧹 تم تنظيف pygame mixer")
+            if 'pygame' in sys.modules:
+                sys.modules['pygame'].mixer.quit()
+                print("🧹 تم تنظيف pygame mixer")
         except:
             pass
 
 
+def run_daemon(socket_path):
+    """تشغيل آدم كخدمة مقيمة: الأوامر تصل عبر Unix socket بدلاً من الميكروفون"""
+    print("🛰️ تشغيل المساعد آدم في وضع الخدمة المقيمة")
+
+    if AI_CONFIG.get("warm_up_on_start", True):
+        llm_manager.warm_up()
+    llm_manager.start_idle_watcher()
+
+    def handle_command(command, speak=False, session=None):
+        print(f"📥 أمر عبر الخدمة: {command}")
+        response = adam.process_command(command, session=session)
+        if response is None:
+            return "⏹️ أُلغي الأمر بأمر أحدث"
+        save_conversation(command, response)
+        adam.remember(command, response)
+        if speak:
+            speak_text(response)
+        return response
+
+    try:
+        serve_forever(handle_command, socket_path, cancel=adam.cancel)
+    except KeyboardInterrupt:
+        print("\n👋 تم إيقاف خدمة آدم")
+    except Exception as e:
+        print(f"❌ خطأ في خدمة آدم: {e}")
+    finally:
+        noise_profiles.save()
+        adam.shutdown()
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="المساعد الصوتي آدم")
+    parser.add_argument("--daemon", action="store_true", help="تشغيل كخدمة مقيمة عبر Unix socket")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH, help="مسار Unix socket لوضع الخدمة")
+    args = parser.parse_args()
+
+    if args.daemon:
+        run_daemon(args.socket)
+    else:
+        main()
\ No newline at end of file
@@ -1,9 +1,40 @@
 # mic_fix.py - إصلاح وإعداد الميكروفون
 
 import speech_recognition as sr
+import json
+import os
 import time
 import threading
 
+from tools.asr import GoogleBackend, VoskBackend, compare_backends, create_backend
+
+
+def load_asr_config():
+    """قراءة قسم asr من config.json"""
+    try:
+        if os.path.exists('config.json'):
+            with open('config.json', 'r', encoding='utf-8') as f:
+                return json.load(f).get("asr", {})
+    except Exception as e:
+        print(f"⚠️ خطأ في تحميل config.json: {e}")
+    return {}
+
+
+ASR_CONFIG = load_asr_config()
+asr_backend = create_backend(ASR_CONFIG)
+
+
+def compare_asr_engines(audio):
+    """مقارنة زمن المحركات المتاحة على نفس التسجيل لاختيار الأسرع لهذا الجهاز"""
+    backends = [GoogleBackend()]
+    vosk_model_path = ASR_CONFIG.get("vosk_model_path", "")
+    if vosk_model_path and os.path.isdir(vosk_model_path):
+        backends.append(VoskBackend(vosk_model_path))
+
+    print("⏱️ مقارنة محركات التعرف على الكلام:")
+    for name, text, confidence, latency_ms in compare_backends(audio, backends):
+        print(f"   {name:8s} {latency_ms or 0:8.0f} ms  {text or '—'}")
+
 
 def test_specific_microphone(mic_index):
     """اختبار ميكروفون محدد"""
@@ -34,8 +65,9 @@ def test_specific_microphone(mic_index):
             print("✅ تم التقاط الصوت!")
 
             # محاولة التعرف
-            text = recognizer.recognize_google(audio, language="ar-SA")
-            print(f"✅ النص: {text}")
+            text, _ = asr_backend.recognize(audio, "ar-SA")
+            print(f"✅ النص ({asr_backend.name}، {asr_backend.last_latency_ms:.0f} ms): {text}")
+            compare_asr_engines(audio)
             return True
 
     except sr.WaitTimeoutError:
@@ -102,8 +134,8 @@ def test_with_adjusted_settings():
             print("✅ تم التقاط الصوت!")
 
             # محاولة التعرف
-            text = recognizer.recognize_google(audio, language="ar-SA")
-            print(f"✅ النص: {text}")
+            text, _ = asr_backend.recognize(audio, "ar-SA")
+            print(f"✅ النص ({asr_backend.name}، {asr_backend.last_latency_ms:.0f} ms): {text}")
             return True
 
     except Exception as e:
@@ -0,0 +1,99 @@
+# tools/mic_profiles.py
+
+import json
+import os
+import threading
+import time
+
+
+class NoiseProfileStore:
+    """حفظ مستوى الطاقة وطيف الضوضاء (ملف الضوضاء) لكل ميكروفون حسب اسمه بين مرات التشغيل"""
+
+    def __init__(self, path="mic_profiles.json", smoothing=0.1, save_interval=60):
+        self.path = path
+        self.smoothing = smoothing  # وزن القراءة الجديدة عند التحسين التدريجي
+        self.save_interval = save_interval
+        self._lock = threading.Lock()
+        self._last_save = 0.0
+        self._dirty = False
+        self.profiles = self._load()
+
+    def _load(self):
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"⚠️ خطأ في تحميل ملفات الضوضاء: {e}")
+        return {}
+
+    def save(self):
+        """كتابة الملفات إلى القرص (إذا تغيرت)"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps(self.profiles, ensure_ascii=False, indent=2)
+            self._dirty = False
+            self._last_save = time.time()
+
+        try:
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"⚠️ لم يتم حفظ ملفات الضوضاء: {e}")
+
+    def get(self, device_name):
+        """إرجاع الملف المحفوظ لميكروفون معين"""
+        return self.profiles.get(device_name)
+
+    def lookup_index(self, device_index):
+        """البحث عن آخر ملف محفوظ لرقم الجهاز - بدون تعداد الميكروفونات"""
+        for name, profile in self.profiles.items():
+            if profile.get("index") == device_index:
+                return name, profile
+        return None, None
+
+    def update(self, device_name, device_index, energy_threshold):
+        """تخزين نتيجة ضبط كامل للضوضاء"""
+        with self._lock:
+            previous = self.profiles.get(device_name, {})
+            self.profiles[device_name] = {
+                "index": device_index,
+                "energy_threshold": float(energy_threshold),
+                "updated": time.strftime("%Y-%m-%d %H:%M:%S")
+            }
+            if "noise_spectrum" in previous:
+                self.profiles[device_name]["noise_spectrum"] = previous["noise_spectrum"]
+            self._dirty = True
+        self.save()
+
+    def update_spectrum(self, device_name, noise_spectrum):
+        """تخزين طيف الضوضاء (لكبح الضوضاء قبل التعرف على الكلام)"""
+        if not device_name or noise_spectrum is None:
+            return
+        with self._lock:
+            profile = self.profiles.get(device_name)
+            if profile is None:
+                return
+            profile["noise_spectrum"] = [float(f"{v:.4g}") for v in noise_spectrum]
+            self._dirty = True
+
+    def refine(self, device_name, energy_threshold):
+        """تحسين تدريجي من إطارات الصمت (متوسط متحرك أسي)"""
+        if not device_name:
+            return
+
+        with self._lock:
+            profile = self.profiles.get(device_name)
+            if profile is None:
+                return
+            old = profile["energy_threshold"]
+            profile["energy_threshold"] = (1 - self.smoothing) * old + self.smoothing * float(energy_threshold)
+            profile["updated"] = time.strftime("%Y-%m-%d %H:%M:%S")
+            self._dirty = True
+            due = time.time() - self._last_save > self.save_interval
+
+        if due:
+            self.save()
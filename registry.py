@@ -0,0 +1,118 @@
+# tools/registry.py
+
+import importlib
+import threading
+from collections.abc import Mapping
+
+
+class ToolFailure(str):
+    """نتيجة أداة فشلت (شبكة، خطأ مؤقت): تُعرض كنص عادي، لكنها لا تُحفظ في ذاكرة النتائج
+    ويحسبها قاطع الدائرة إخفاقاً"""
+
+
+class ToolEntry:
+    """وصف أداة واحدة: الاسم، النية (المجموعة) ومسار الاستيراد
+
+    cache_ttl: مدة صلاحية النتيجة بالثواني (None = لا تُحفظ، tools/result_cache.py)
+    side_effects: الأداة تغير شيئاً (تفتح، تطفئ، تنشئ) - نتائجها لا تُحفظ أبداً
+    timeout: أقصى زمن انتظار بالثواني (None = الافتراضي، tools/tool_runner.py)
+    acknowledgement: عبارة الانتظار الخاصة بالأداة إذا تأخرت ("لحظة، أبحث لك...")
+    """
+
+    __slots__ = ('name', 'intent', 'module', 'cache_ttl', 'side_effects', 'timeout', 'acknowledgement')
+
+    def __init__(self, name, intent, module, cache_ttl=None, side_effects=False, timeout=None,
+                 acknowledgement=None):
+        self.name = name
+        self.intent = intent
+        self.module = module
+        self.cache_ttl = cache_ttl
+        self.side_effects = side_effects
+        self.timeout = timeout
+        self.acknowledgement = acknowledgement
+
+    def __repr__(self):
+        return f"ToolEntry({self.name!r}, {self.intent!r}, {self.module!r})"
+
+
+# جدول الأدوات - لا يتم استيراد أي وحدة هنا
+TOOL_ENTRIES = (
+    # أدوات الوقت
+    ToolEntry('get_time', 'time', '.time', timeout=5),
+
+    # أدوات البحث والإنترنت (مهلة الطلب في web_search.py عشر ثوانٍ)
+    ToolEntry('search_google', 'web', '.web_search', cache_ttl=600, timeout=15,
+              acknowledgement="لحظة، أبحث لك..."),
+    ToolEntry('get_website_info', 'web', '.web_search', cache_ttl=900, timeout=15,
+              acknowledgement="لحظة، أقرأ الموقع..."),
+    ToolEntry('search_and_read', 'web', '.web_search', cache_ttl=900, timeout=25,
+              acknowledgement="لحظة، أبحث وأقرأ النتائج..."),
+    ToolEntry('get_news', 'web', '.web_search', cache_ttl=900, timeout=15,
+              acknowledgement="لحظة، أجمع لك آخر الأخبار..."),
+
+    # أدوات التحكم في النظام
+    ToolEntry('play_music', 'system', '.system_control', side_effects=True, timeout=15),
+    ToolEntry('open_app', 'system', '.system_control', side_effects=True, timeout=10),
+    ToolEntry('show_system_info', 'system', '.system_control', cache_ttl=5, timeout=5),
+    ToolEntry('list_processes', 'system', '.system_control', timeout=5),
+    ToolEntry('close_program', 'system', '.system_control', side_effects=True, timeout=10),
+    ToolEntry('create_new_folder', 'system', '.system_control', side_effects=True, timeout=5),
+    ToolEntry('list_files', 'system', '.system_control', timeout=10),
+    ToolEntry('shutdown_computer', 'system', '.system_control', side_effects=True, timeout=5),
+    ToolEntry('restart_computer', 'system', '.system_control', side_effects=True, timeout=5),
+    ToolEntry('find_files', 'system', '.system_control', timeout=30,
+              acknowledgement="لحظة، أبحث عن الملفات..."),
+    ToolEntry('open_website', 'system', '.system_control', side_effects=True, timeout=10),
+    ToolEntry('set_volume', 'system', '.system_control', side_effects=True, timeout=5),
+)
+
+
+class LazyToolRegistry(Mapping):
+    """سجل أدوات كسول: لا يستورد وحدة الأداة إلا عند أول استدعاء لها"""
+
+    def __init__(self, entries=TOOL_ENTRIES):
+        self._entries = {entry.name: entry for entry in entries}
+        self._loaded = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name):
+        tool = self._loaded.get(name)
+        if tool is not None:
+            return tool
+
+        entry = self._entries[name]
+        with self._lock:
+            tool = self._loaded.get(name)
+            if tool is None:
+                module = importlib.import_module(entry.module, __package__)
+                tool = getattr(module, entry.name)
+                self._loaded[name] = tool
+        return tool
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    def entry(self, name):
+        """إرجاع وصف الأداة بدون استيرادها"""
+        return self._entries[name]
+
+    def is_loaded(self, name):
+        """هل تم استيراد الأداة بالفعل؟"""
+        return name in self._loaded
+
+    def by_intent(self):
+        """تجميع أسماء الأدوات حسب النية"""
+        groups = {}
+        for entry in self._entries.values():
+            groups.setdefault(entry.intent, []).append(entry.name)
+        return groups
+
+
+# السجل المشترك
+tool_registry = LazyToolRegistry()
@@ -0,0 +1,206 @@
+# tools/result_cache.py
+
+"""
+ذاكرة مؤقتة لنتائج الأدوات التي لا تغير شيئاً (بحث، أخبار، قراءة موقع، معلومات النظام)
+
+المستخدم يكرر السؤال كثيراً (خصوصاً عندما يخطئ التعرف على الكلام)، ونفس البحث
+كان يُعاد من الإنترنت كل مرة. مدة الصلاحية تُعلن لكل أداة في registry.py
+(دقائق للأخبار والبحث، ثوانٍ لمعلومات النظام) ويمكن تعديلها من config.json.
+الأدوات ذات الأثر (side_effects) لا تُحفظ نتائجها أبداً مهما كانت الإعدادات.
+
+طبقتان: ذاكرة محدودة الحجم (LRU بعدد العناصر والبايتات) وطبقة قرص اختيارية
+(ملف JSON لكل نتيجة) تبقى بين مرات التشغيل.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+
+from .registry import ToolFailure
+
+
+class ResultCache:
+    """نتائج الأدوات حسب (الأداة، المعاملات) مع مدة صلاحية لكل أداة"""
+
+    def __init__(self, max_entries=256, max_bytes=2 * 1024 * 1024, disk_path=None,
+                 disk_max_entries=1000, ttl_overrides=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_path = disk_path
+        self.disk_max_entries = disk_max_entries
+        self.ttl_overrides = dict(ttl_overrides or {})  # {اسم الأداة: ثوانٍ}
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # {المفتاح: (وقت الانتهاء، النتيجة، الحجم)}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        if disk_path:
+            os.makedirs(disk_path, exist_ok=True)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def ttl(self, entry):
+        """مدة الصلاحية للأداة بالثواني، أو None إذا كانت لا تُحفظ"""
+        if entry.side_effects:
+            return None
+        ttl = self.ttl_overrides.get(entry.name, entry.cache_ttl)
+        return ttl if ttl and ttl > 0 else None
+
+    @staticmethod
+    def key(name, args):
+        return name + ":" + json.dumps(args, ensure_ascii=False, sort_keys=True, default=str)
+
+    def _disk_file(self, key):
+        return os.path.join(self.disk_path, hashlib.sha1(key.encode('utf-8')).hexdigest() + ".json")
+
+    def get(self, key):
+        """النتيجة المحفوظة أو None (الذاكرة أولاً ثم القرص)"""
+        now = time.time()
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                if cached[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return cached[1]
+                self._remove(key)
+
+        if self.disk_path:
+            try:
+                with open(self._disk_file(key), 'r', encoding='utf-8') as f:
+                    content = json.load(f)
+                if content["key"] == key and content["expires"] > now:
+                    self._store(key, content["result"], content["expires"])
+                    with self._lock:
+                        self.disk_hits += 1
+                    return content["result"]
+            except (OSError, ValueError, KeyError):
+                pass
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, result, ttl):
+        # نتائج الفشل (ToolFailure) لا تُحفظ حتى تُعاد المحاولة في المرة القادمة
+        if not isinstance(result, str) or isinstance(result, ToolFailure):
+            return
+        expires = time.time() + ttl
+        self._store(key, result, expires)
+        if self.disk_path:
+            self._write_disk(key, result, expires)
+
+    def _store(self, key, result, expires):
+        size = len(result.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (expires, result, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        cached = self._entries.pop(key, None)
+        if cached is not None:
+            self._bytes -= cached[2]
+
+    def _write_disk(self, key, result, expires):
+        try:
+            path = self._disk_file(key)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"key": key, "expires": expires, "result": result}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+
+            files = glob.glob(os.path.join(self.disk_path, "*.json"))
+            if len(files) > self.disk_max_entries:
+                files.sort(key=os.path.getmtime)
+                for old in files[:len(files) - self.disk_max_entries]:
+                    os.remove(old)
+        except OSError as e:
+            print(f"⚠️ لم يتم حفظ نتيجة الأداة على القرص: {e}")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def summary(self):
+        """ملخص الإصابات لطباعته عند الإغلاق"""
+        total = self.hits + self.disk_hits + self.misses
+        if not total:
+            return ""
+        return (f"{self.hits + self.disk_hits}/{total} إصابة (القرص {self.disk_hits})، "
+                f"{len(self)} نتيجة، {self._bytes / 1024:.0f} KB")
+
+
+class CachedTool:
+    """غلاف حول أداة: invoke يرجع النتيجة المحفوظة إذا كانت صالحة"""
+
+    __slots__ = ('tool', 'name', 'ttl', 'cache')
+
+    def __init__(self, tool, name, ttl, cache):
+        self.tool = tool
+        self.name = name
+        self.ttl = ttl
+        self.cache = cache
+
+    def invoke(self, args, *rest, **kwargs):
+        key = self.cache.key(self.name, args)
+        result = self.cache.get(key)
+        if result is not None:
+            print(f"⚡ نتيجة محفوظة: {self.name}")
+            return result
+        result = self.tool.invoke(args, *rest, **kwargs)
+        self.cache.put(key, result, self.ttl)
+        return result
+
+    def __getattr__(self, attribute):
+        return getattr(self.tool, attribute)
+
+
+class CachedToolRegistry(Mapping):
+    """سجل الأدوات مع ذاكرة النتائج - الأدوات تبقى كسولة، والأدوات غير المعلنة تُرجع كما هي"""
+
+    def __init__(self, registry, cache):
+        self.registry = registry
+        self.cache = cache
+        self._wrapped = {}
+
+    def __getitem__(self, name):
+        wrapped = self._wrapped.get(name)
+        if wrapped is not None:
+            return wrapped
+        tool = self.registry[name]
+        ttl = self.cache.ttl(self.registry.entry(name))
+        if ttl is None:
+            return tool
+        wrapped = self._wrapped[name] = CachedTool(tool, name, ttl, self.cache)
+        return wrapped
+
+    def __iter__(self):
+        return iter(self.registry)
+
+    def __len__(self):
+        return len(self.registry)
+
+    def __contains__(self, name):
+        return name in self.registry
+
+    def entry(self, name):
+        return self.registry.entry(name)
+
+    def is_loaded(self, name):
+        return self.registry.is_loaded(name)
+
+    def by_intent(self):
+        return self.registry.by_intent()
@@ -0,0 +1,258 @@
+# tools/semantic_cache.py
+
+"""
+ذاكرة دائمة لإجابات النموذج على الأسئلة العامة ("ما هو الذكاء الاصطناعي")
+
+السؤال الموحد يُمثل بمتجه أجزاء حروف (2-4) مجزأة (hashing) بطول ثابت، والبحث
+مقارنة جيب التمام مع كل الأسئلة المحفوظة بضرب مصفوفة واحد في NumPy
+(آلاف الأسئلة = أجزاء من الملي ثانية، بدون نموذج تضمين).
+الصياغات المختلفة لنفس السؤال ("ما فوائد الشاي الاخضر" / "ما هي فوائد الشاي الأخضر")
+تتشابه فوق 0.85، والأسئلة المختلفة بكلمة ("عاصمة فرنسا" / "عاصمة ألمانيا") تحت 0.65.
+
+السؤال الأضيق يشبه الأعم كثيراً ("الذكاء الاصطناعي التوليدي" / "الذكاء الاصطناعي" = 0.87)،
+لذلك إذا اختلف عدد الكلمات (بدون أدوات الاستفهام والجر) تُطلب عتبة أعلى (0.95).
+
+الأسئلة القصيرة أو التي تبدأ بحرف عطف ("وبكرة؟") تعتمد على سياق المحادثة فلا تُحفظ،
+وكذلك الأسئلة التي تتغير إجابتها مع الوقت ("من هو رئيس امريكا"، "سعر الذهب اليوم").
+الملف JSON فيه الأسئلة والإجابات فقط، والمتجهات تُحسب عند التحميل.
+
+الاستخدام من سطر الأوامر:
+    python -m tools.semantic_cache report [semantic_cache.json]
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from .arabic_normalize import normalize_arabic, normalized_words
+from .intent_classifier import char_ngrams
+
+DIMENSIONS = 4096
+LENGTH_MISMATCH_THRESHOLD = 0.95
+
+FUNCTION_WORDS = frozenset(normalize_arabic("ما ماذا هو هي هل من مين في عن على إلى لي يا شنو شو ايش").split())
+# كلمات تدل على أن الإجابة تتغير مع التاريخ أو مع من يشغل المنصب الآن
+TIME_SENSITIVE_WORDS = frozenset(normalize_arabic(
+    "اليوم الآن حاليا الحالي الحالية هسه الحين أمس البارحة غدا بكرة باجر "
+    "آخر أحدث مؤخرا سعر أسعار نتيجة مباراة الطقس أخبار "
+    "رئيس رئيسة وزير وزيرة ملك ملكة أمير حاكم محافظ مدرب أمين"
+).split())
+
+
+def question_key(question):
+    """السؤال بعد توحيد الكتابة وحذف علامات الترقيم"""
+    return " ".join(normalized_words(question))
+
+
+def embed(question, dimensions=DIMENSIONS):
+    """متجه أجزاء الحروف المجزأة (crc32 ثابت بين مرات التشغيل) بطول 1"""
+    vector = np.zeros(dimensions, dtype=np.float32)
+    grams = char_ngrams(question_key(question))
+    if grams:
+        indices = np.fromiter((zlib.crc32(g.encode('utf-8')) % dimensions for g in grams), dtype=np.int64)
+        np.add.at(vector, indices, 1.0)
+        vector = np.sqrt(vector)  # تكرار الجزء لا يطغى على التشابه
+        vector /= np.linalg.norm(vector)
+    return vector
+
+
+def _bare(word):
+    """الكلمة بدون حرف العطف/الجر و"ال" ("والرئيس" ← "رئيس")"""
+    if len(word) > 3 and word[0] in "وفبل":
+        word = word[1:]
+    if len(word) > 3 and word.startswith("ال"):
+        word = word[2:]
+    return word
+
+
+def content_words(question):
+    """عدد كلمات السؤال بدون أدوات الاستفهام والجر"""
+    return sum(1 for word in question_key(question).split() if word not in FUNCTION_WORDS)
+
+
+def is_time_sensitive(question):
+    """هل تتغير الإجابة مع الوقت (التاريخ، الأسعار، من يشغل منصباً)؟"""
+    return any(word in TIME_SENSITIVE_WORDS or _bare(word) in TIME_SENSITIVE_WORDS
+               for word in question_key(question).split())
+
+
+def is_standalone(question, min_words=3):
+    """هل يُفهم السؤال بدون سياق المحادثة؟"""
+    words = question_key(question).split()
+    return len(words) >= min_words and words[0][0] not in "وف"
+
+
+class SemanticCache:
+    """سؤال ← إجابة بالتشابه، مع مدة صلاحية وحد أقصى للحجم (يُحذف الأقل استخداماً)"""
+
+    def __init__(self, path="semantic_cache.json", threshold=0.85, ttl=30 * 24 * 3600,
+                 max_entries=2000, save_interval=60, length_mismatch_threshold=LENGTH_MISMATCH_THRESHOLD):
+        self.path = path
+        self.threshold = threshold
+        self.length_mismatch_threshold = max(threshold, length_mismatch_threshold)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.save_interval = save_interval
+        self.hits = 0
+        self.misses = 0
+        self.saved_ms = 0.0  # زمن التوليد الذي وُفر في هذه الجلسة
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._last_save = time.time()
+        self._entries = []  # [{"question", "answer", "created", "last_used", "hits", "generation_ms"}]
+        self._vectors = np.zeros((0, DIMENSIONS), dtype=np.float32)
+        self._lengths = np.zeros(0, dtype=np.int32)  # content_words لكل سؤال محفوظ
+        self._load()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _load(self):
+        try:
+            if self.path and os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    entries = json.load(f).get("entries", [])
+                now = time.time()
+                self._entries = [e for e in entries
+                                 if now - e["created"] < self.ttl and not is_time_sensitive(e["question"])]
+                if self._entries:
+                    self._vectors = np.stack([embed(e["question"]) for e in self._entries])
+                    self._lengths = np.array([content_words(e["question"]) for e in self._entries], dtype=np.int32)
+        except Exception as e:
+            print(f"⚠️ خطأ في تحميل ذاكرة الإجابات: {e}")
+
+    def save(self):
+        """كتابة الذاكرة إلى القرص (إذا تغيرت)"""
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps({"entries": self._entries}, ensure_ascii=False)
+            self._dirty = False
+            self._last_save = time.time()
+
+        try:
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"⚠️ لم يتم حفظ ذاكرة الإجابات: {e}")
+
+    def _save_if_due(self):
+        if time.time() - self._last_save > self.save_interval:
+            self.save()
+
+    def _best(self, vector, length):
+        """(فهرس أقرب سؤال يتجاوز عتبته، التشابه) أو (None, 0) - العتبة أعلى إذا اختلف عدد الكلمات"""
+        if not self._entries:
+            return None, 0.0
+        similarities = self._vectors @ vector
+        required = np.where(self._lengths == length, self.threshold, self.length_mismatch_threshold)
+        similarities = np.where(similarities >= required, similarities, -1.0)
+        best = int(np.argmax(similarities))
+        return (best, float(similarities[best])) if similarities[best] >= 0 else (None, 0.0)
+
+    def lookup(self, question):
+        """الإجابة المحفوظة لأقرب سؤال فوق العتبة، أو None"""
+        if not is_standalone(question) or is_time_sensitive(question):
+            return None
+        vector = embed(question)
+        now = time.time()
+        with self._lock:
+            best, similarity = self._best(vector, content_words(question))
+            entry = self._entries[best] if best is not None else None
+            if entry is None or now - entry["created"] >= self.ttl:
+                self.misses += 1
+                return None
+            entry["last_used"] = now
+            entry["hits"] = entry.get("hits", 0) + 1
+            self.hits += 1
+            self.saved_ms += entry.get("generation_ms", 0.0)
+            self._dirty = True
+        print(f"💡 إجابة محفوظة ({similarity:.2f}): {entry['question']}")
+        self._save_if_due()
+        return entry["answer"]
+
+    def store(self, question, answer, generation_ms=0.0):
+        """حفظ إجابة النموذج (الأسئلة المعتمدة على السياق أو الوقت والأخطاء لا تُحفظ)"""
+        if not answer or not is_standalone(question) or is_time_sensitive(question) \
+                or answer.startswith(("عذراً", "❌", "خطأ")):
+            return
+        vector = embed(question)
+        length = content_words(question)
+        now = time.time()
+        entry = {"question": question, "answer": answer, "created": now, "last_used": now,
+                 "hits": 0, "generation_ms": round(generation_ms, 1)}
+        with self._lock:
+            best, _ = self._best(vector, length)
+            if best is not None:
+                # نفس السؤال بصياغة أخرى: إجابة أحدث بدلاً من تكرار
+                self._entries[best] = entry
+                self._vectors[best] = vector
+                self._lengths[best] = length
+                self._dirty = True
+                return
+            self._entries.append(entry)
+            self._vectors = np.vstack([self._vectors, vector[None, :]])
+            self._lengths = np.append(self._lengths, np.int32(length))
+            self._evict(now)
+            self._dirty = True
+        self._save_if_due()
+
+    def _evict(self, now):
+        keep = [i for i, e in enumerate(self._entries) if now - e["created"] < self.ttl]
+        if len(keep) > self.max_entries:
+            keep = sorted(keep, key=lambda i: self._entries[i]["last_used"])[-self.max_entries:]
+            keep.sort()
+        if len(keep) != len(self._entries):
+            self._entries = [self._entries[i] for i in keep]
+            self._vectors = self._vectors[keep]
+            self._lengths = self._lengths[keep]
+
+    def summary(self):
+        """نسبة الإصابة والزمن الموفر في هذه الجلسة"""
+        total = self.hits + self.misses
+        if not total:
+            return ""
+        return (f"{self.hits}/{total} إصابة ({self.hits / total * 100:.0f}%)، "
+                f"وُفر {self.saved_ms / 1000:.1f} ثانية توليد، {len(self)} إجابة محفوظة")
+
+
+def _main(argv):
+    if not argv or argv[0] != "report":
+        print(__doc__)
+        return 1
+
+    cache = SemanticCache(argv[1] if len(argv) > 1 else "semantic_cache.json")
+    entries = cache._entries
+    if not entries:
+        print("📭 لا توجد إجابات محفوظة")
+        return 0
+
+    hits = sum(e.get("hits", 0) for e in entries)
+    saved = sum(e.get("hits", 0) * e.get("generation_ms", 0.0) for e in entries) / 1000
+    lookups = hits + len(entries)  # كل إجابة محفوظة كانت إخفاقاً واحداً على الأقل
+    print(f"💡 {len(entries)} إجابة محفوظة، {hits} إصابة من {lookups} سؤالاً ({hits / lookups * 100:.0f}%)")
+    print(f"⏱️ زمن التوليد الموفر: {saved:.1f} ثانية "
+          f"(متوسط التوليد {np.mean([e.get('generation_ms', 0.0) for e in entries]):.0f} ms)")
+
+    start = time.perf_counter()
+    for entry in entries[:200]:
+        cache._vectors @ embed(entry["question"])
+    lookup_ms = (time.perf_counter() - start) * 1000 / min(len(entries), 200)
+    print(f"🔎 زمن البحث: {lookup_ms:.2f} ms لكل سؤال")
+
+    for entry in sorted(entries, key=lambda e: e.get("hits", 0), reverse=True)[:10]:
+        print(f"   {entry.get('hits', 0):4d} × {entry['question']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main(sys.argv[1:]))
@@ -0,0 +1,76 @@
+# tools/sentence_splitter.py
+
+"""
+تقسيم نص يصل على دفعات (من النموذج أثناء التوليد) إلى جمل جاهزة للنطق
+
+الجملة تنتهي عند ". ؟ ? ! سطر جديد"، وعند "، ؛" إذا طالت الجملة بما يكفي
+(الفواصل القصيرة تُبقى مع ما بعدها حتى لا يتقطع الصوت). العلامة في آخر الدفعة
+تنتظر الدفعة التالية: قد تكون نقطة عشرية ("3.5") أو بداية "..." أو "؟!".
+"""
+
+TERMINATORS = ".؟?!\n"
+CLAUSE_BREAKS = "،؛,;"
+
+
+class SentenceSplitter:
+    """feed(نص) يرجع الجمل المكتملة، flush() يرجع الباقي في النهاية"""
+
+    def __init__(self, min_chars=3, clause_chars=40):
+        self.min_chars = min_chars  # أقصر جملة تُنطق وحدها ("1." تبقى مع ما بعدها)
+        self.clause_chars = clause_chars  # طول الجملة الذي يسمح بالقطع عند الفاصلة
+        self._buffer = ""
+        self._scan = 0  # موضع أول حرف لم يُفحص بعد
+
+    def feed(self, text):
+        self._buffer += text
+        sentences = []
+        buffer = self._buffer
+        start = 0
+        i = max(self._scan, 0)
+        while i < len(buffer):
+            char = buffer[i]
+            is_terminator = char in TERMINATORS
+            if not is_terminator and not (char in CLAUSE_BREAKS and i + 1 - start >= self.clause_chars):
+                i += 1
+                continue
+
+            # علامات متتالية ("؟!"، "...") تُضم للجملة نفسها
+            end = i + 1
+            while end < len(buffer) and buffer[end] in TERMINATORS + CLAUSE_BREAKS:
+                end += 1
+            if end == len(buffer):
+                break  # ننتظر الدفعة التالية: قد تكمل العلامة ("؟!") أو الرقم ("3.5")
+            if char == "." and buffer[i - 1:i].isdigit() and buffer[end:end + 1].isdigit():
+                i = end
+                continue
+
+            sentence = buffer[start:end].strip()
+            if len(sentence) >= self.min_chars:
+                sentences.append(sentence)
+                start = end
+            i = end
+
+        self._buffer = buffer[start:]
+        self._scan = i - start
+        return sentences
+
+    def flush(self):
+        """ما تبقى بعد انتهاء التوليد"""
+        rest = self._buffer.strip()
+        self._buffer = ""
+        self._scan = 0
+        return [rest] if rest else []
+
+
+def split_sentences(text, **kwargs):
+    """تقسيم نص كامل إلى جمل"""
+    splitter = SentenceSplitter(**kwargs)
+    return splitter.feed(text) + splitter.flush()
+
+
+def stream_sentences(chunks, **kwargs):
+    """مولد جمل من مولد دفعات نصية (مثل ModelManager.stream)"""
+    splitter = SentenceSplitter(**kwargs)
+    for chunk in chunks:
+        yield from splitter.feed(chunk)
+    yield from splitter.flush()
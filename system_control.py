@@ -12,6 +12,9 @@ import json
 import time
 import webbrowser
 
+from .gazetteer import get_gazetteer
+from .registry import ToolFailure
+
 # استيراد مشروط لـ winreg (فقط على Windows)
 try:
     import winreg
@@ -114,25 +117,9 @@ class SystemController:
             ]
         }
 
-        # الترجمات العربية
-        arabic_to_english = {
-            'كروم': 'chrome',
-            'فايرفوكس': 'firefox',
-            'ايدج': 'edge',
-            'المفكرة': 'notepad',
-            'الحاسبة': 'calculator',
-            'الرسام': 'paint',
-            'مستكشف الملفات': 'explorer',
-            'مدير المهام': 'task manager',
-            'لوحة التحكم': 'control panel',
-            'وورد': 'word',
-            'اكسل': 'excel'
-        }
-
-        # تحويل الاسم العربي إلى إنجليزي
-        app_key = app_name.lower()
-        if app_key in arabic_to_english:
-            app_key = arabic_to_english[app_key]
+        # تحويل الاسم العربي إلى إنجليزي من قاموس التطبيقات (data/gazetteers/app.json)
+        entity = get_gazetteer().get(app_name, 'app')
+        app_key = entity.value if entity is not None else app_name.lower()
 
         # البحث في الأسماء الشائعة
         for key in common_apps:
@@ -474,9 +461,9 @@ def play_music(query: str = "") -> str:
                 music_files = system_controller.find_music_files("")
 
             if not music_files:
-                return f"❌ لم أجد أي ملفات موسيقية في المجلدات المتاحة.\n\n📁 المجلدات المفحوصة:\n" + \
+                return ToolFailure(f"❌ لم أجد أي ملفات موسيقية في المجلدات المتاحة.\n\n📁 المجلدات المفحوصة:\n" + \
                     "\n".join([f"• {folder}" for folder in system_controller.common_music_dirs]) + \
-                    "\n\n💡 تأكد من وجود ملفات موسيقية بصيغ: " + ", ".join(system_controller.music_extensions)
+                    "\n\n💡 تأكد من وجود ملفات موسيقية بصيغ: " + ", ".join(system_controller.music_extensions))
 
         # اختيار أول ملف مناسب
         selected_file = music_files[0]
@@ -505,7 +492,7 @@ def play_music(query: str = "") -> str:
 
             return result
         else:
-            return f"❌ فشل في تشغيل الملف: {filename}\n\n💡 تأكد من وجود مشغل موسيقى في النظام"
+            return ToolFailure(f"❌ فشل في تشغيل الملف: {filename}\n\n💡 تأكد من وجود مشغل موسيقى في النظام")
 
     except Exception as e:
         error_msg = f"❌ خطأ في تشغيل الموسيقى: {str(e)}"
@@ -522,9 +509,9 @@ def open_app(app_name: str) -> str:
         if system_controller.open_application(app_name):
             return f"✅ تم فتح {app_name} بنجاح"
         else:
-            return f"❌ لم أتمكن من فتح {app_name}.\n\n💡 تأكد من أن التطبيق مثبت أو جرب:\n• افتح كروم\n• افتح فايرفوكس\n• افتح الحاسبة\n• افتح المفكرة"
+            return ToolFailure(f"❌ لم أتمكن من فتح {app_name}.\n\n💡 تأكد من أن التطبيق مثبت أو جرب:\n• افتح كروم\n• افتح فايرفوكس\n• افتح الحاسبة\n• افتح المفكرة")
     except Exception as e:
-        return f"❌ خطأ في فتح التطبيق: {str(e)}"
+        return ToolFailure(f"❌ خطأ في فتح التطبيق: {str(e)}")
 
 
 @tool
@@ -537,7 +524,7 @@ def show_system_info() -> str:
             result += f"{key}: {value}\n"
         return result
     except Exception as e:
-        return f"خطأ في الحصول على معلومات النظام: {str(e)}"
+        return ToolFailure(f"خطأ في الحصول على معلومات النظام: {str(e)}")
 
 
 @tool
@@ -550,7 +537,7 @@ def list_processes() -> str:
             result += f"{i}. {proc['name']} (PID: {proc['pid']}) - CPU: {proc['cpu_percent']}%\n"
         return result
     except Exception as e:
-        return f"خطأ في عرض العمليات: {str(e)}"
+        return ToolFailure(f"خطأ في عرض العمليات: {str(e)}")
 
 
 @tool
@@ -561,9 +548,9 @@ def close_program(program_name: str) -> str:
         if killed:
             return f"✅ تم إغلاق: {', '.join(killed)}"
         else:
-            return f"❌ لم أجد برنامج باسم '{program_name}' للإغلاق"
+            return ToolFailure(f"❌ لم أجد برنامج باسم '{program_name}' للإغلاق")
     except Exception as e:
-        return f"خطأ في إغلاق البرنامج: {str(e)}"
+        return ToolFailure(f"خطأ في إغلاق البرنامج: {str(e)}")
 
 
 @tool
@@ -574,9 +561,9 @@ def create_new_folder(folder_name: str, location: str = ".") -> str:
         if system_controller.create_folder(folder_path):
             return f"✅ تم إنشاء المجلد: {folder_path}"
         else:
-            return f"❌ فشل في إنشاء المجلد: {folder_name}"
+            return ToolFailure(f"❌ فشل في إنشاء المجلد: {folder_name}")
     except Exception as e:
-        return f"خطأ في إنشاء المجلد: {str(e)}"
+        return ToolFailure(f"خطأ في إنشاء المجلد: {str(e)}")
 
 
 @tool
@@ -593,7 +580,7 @@ def list_files(directory: str = ".") -> str:
 
         return result
     except Exception as e:
-        return f"خطأ في عرض محتويات المجلد: {str(e)}"
+        return ToolFailure(f"خطأ في عرض محتويات المجلد: {str(e)}")
 
 
 @tool
@@ -603,9 +590,9 @@ def shutdown_computer(delay_minutes: int = 1) -> str:
         if system_controller.shutdown_system(delay_minutes):
             return f"⚠️ سيتم إيقاف تشغيل الحاسوب خلال {delay_minutes} دقيقة"
         else:
-            return "❌ فشل في جدولة إيقاف التشغيل"
+            return ToolFailure("❌ فشل في جدولة إيقاف التشغيل")
     except Exception as e:
-        return f"خطأ في إيقاف التشغيل: {str(e)}"
+        return ToolFailure(f"خطأ في إيقاف التشغيل: {str(e)}")
 
 
 @tool
@@ -615,9 +602,9 @@ def restart_computer(delay_minutes: int = 1) -> str:
         if system_controller.restart_system(delay_minutes):
             return f"⚠️ سيتم إعادة تشغيل الحاسوب خلال {delay_minutes} دقيقة"
         else:
-            return "❌ فشل في جدولة إعادة التشغيل"
+            return ToolFailure("❌ فشل في جدولة إعادة التشغيل")
     except Exception as e:
-        return f"خطأ في إعادة التشغيل: {str(e)}"
+        return ToolFailure(f"خطأ في إعادة التشغيل: {str(e)}")
 
 
 @tool
@@ -643,10 +630,10 @@ def find_files(filename: str, search_directory: str = None) -> str:
                 result += f"{i}. {os.path.basename(file_path)}\n   📂 {os.path.dirname(file_path)}\n\n"
             return result
         else:
-            return f"❌ لم أجد أي ملفات تحتوي على '{filename}'"
+            return ToolFailure(f"❌ لم أجد أي ملفات تحتوي على '{filename}'")
 
     except Exception as e:
-        return f"خطأ في البحث عن الملفات: {str(e)}"
+        return ToolFailure(f"خطأ في البحث عن الملفات: {str(e)}")
 
 
 @tool
@@ -662,7 +649,7 @@ def open_website(url: str) -> str:
         webbrowser.open(url)
         return f"✅ تم فتح الموقع: {url}"
     except Exception as e:
-        return f"خطأ في فتح الموقع: {str(e)}"
+        return ToolFailure(f"خطأ في فتح الموقع: {str(e)}")
 
 
 @tool
@@ -670,7 +657,7 @@ def set_volume(volume_level: int) -> str:
     """تغيير مستوى الصوت (من 0 إلى 100)."""
     try:
         if not 0 <= volume_level <= 100:
-            return "❌ مستوى الصوت يجب أن يكون بين 0 و 100"
+            return ToolFailure("❌ مستوى الصوت يجب أن يكون بين 0 و 100")
 
         if system_controller.system == "windows":
             # استخدام pycaw لنظام ويندوز
@@ -686,9 +673,9 @@ def set_volume(volume_level: int) -> str:
 
                 return f"🔊 تم تغيير مستوى الصوت إلى {volume_level}%"
             except ImportError:
-                return "❌ يجب تثبيت pycaw: pip install pycaw"
+                return ToolFailure("❌ يجب تثبيت pycaw: pip install pycaw")
         else:
-            return "❌ تغيير الصوت متاح حالياً فقط لنظام ويندوز"
+            return ToolFailure("❌ تغيير الصوت متاح حالياً فقط لنظام ويندوز")
 
     except Exception as e:
-        return f"خطأ في تغيير مستوى الصوت: {str(e)}"
\ No newline at end of file
+        return ToolFailure(f"خطأ في تغيير مستوى الصوت: {str(e)}")
\ No newline at end of file
@@ -4,42 +4,34 @@ from langchain.tools import tool
 from datetime import datetime
 import pytz
 
+from .gazetteer import get_gazetteer
+from .registry import ToolFailure
+
+
+def find_timezone(city):
+    """المنطقة الزمنية لمدينة من القاموس، أو من أسماء مدن قاعدة tz (مثل "paris" أو "new york")"""
+    entity = get_gazetteer().get(city, 'city')
+    if entity is not None and entity.data.get("timezone"):
+        return entity.data["timezone"]
+    return _tz_cities().get(city.lower().strip().replace(" ", "_"))
+
+
+_TZ_CITIES = None
+
+
+def _tz_cities():
+    global _TZ_CITIES
+    if _TZ_CITIES is None:
+        _TZ_CITIES = {name.rsplit("/", 1)[-1].lower(): name for name in pytz.common_timezones if "/" in name}
+    return _TZ_CITIES
+
 
 @tool
 def get_time(city: str = "baghdad") -> str:
     """إرجاع الوقت الحالي في مدينة معينة. إذا لم تحدد مدينة، سيتم عرض وقت بغداد."""
     try:
-        city_timezones = {
-            "بغداد": "Asia/Baghdad",
-            "baghdad": "Asia/Baghdad",
-            "نيويورك": "America/New_York",
-            "new york": "America/New_York",
-            "لندن": "Europe/London",
-            "london": "Europe/London",
-            "طوكيو": "Asia/Tokyo",
-            "tokyo": "Asia/Tokyo",
-            "سيدني": "Australia/Sydney",
-            "sydney": "Australia/Sydney",
-            "دبي": "Asia/Dubai",
-            "dubai": "Asia/Dubai",
-            "الرياض": "Asia/Riyadh",
-            "riyadh": "Asia/Riyadh",
-            "القاهرة": "Africa/Cairo",
-            "cairo": "Africa/Cairo",
-            "مكة": "Asia/Riyadh",
-            "mecca": "Asia/Riyadh",
-            "الكويت": "Asia/Kuwait",
-            "kuwait": "Asia/Kuwait"
-        }
-
-        city_key = city.lower().strip()
-        timezone_name = None
-
-        # البحث عن المدينة
-        for key, tz in city_timezones.items():
-            if key.lower() == city_key:
-                timezone_name = tz
-                break
+        # البحث عن المدينة ("القاهره" و"القاهرة" و"cairo" نفس الكيان)
+        timezone_name = find_timezone(city)
 
         if not timezone_name:
             return f"عذراً، لا أعرف المنطقة الزمنية لمدينة {city}. المدن المتاحة: بغداد، نيويورك، لندن، طوكيو، دبي، الرياض، القاهرة، الكويت"
@@ -73,4 +65,4 @@ def get_time(city: str = "baghdad") -> str:
         return f"الوقت الحالي في {city} هو {time_12h} {am_pm}, {day_ar} {now.day} {month_ar} {now.year}"
 
     except Exception as e:
-        return f"عذراً، حدث خطأ في الحصول على الوقت: {str(e)}"
\ No newline at end of file
+        return ToolFailure(f"عذراً، حدث خطأ في الحصول على الوقت: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,181 @@
+# tools/tool_runner.py
+
+"""
+تنفيذ الأدوات على مجموعة خيوط محدودة مع مهلة لكل أداة وإلغاء وقواطع دائرة
+
+- المهلة وعبارة الانتظار تُعلن لكل أداة في registry.py (timeout، acknowledgement)
+- الأداة التي تتأخر أكثر من ack_after ثانية تُنطق لها عبارة انتظار (النطق متزامن،
+  لذلك لا تُنطق للأداة التي تنتهي قبل ذلك - مثل نتيجة من الذاكرة المؤقتة)
+- cancel(session): أمر جديد يلغي انتظار الأمر السابق من نفس الجلسة (الأدوات التي لم تبدأ لا تُنفذ)
+- قاطع الدائرة: أداة تفشل أو تتجاوز مهلتها عدة مرات متتالية تُتخطى لفترة ثم تُجرب من جديد
+
+بايثون لا يستطيع إيقاف خيط أثناء التنفيذ: الأداة المتأخرة تكمل في الخلفية
+ونتيجتها تُهمل، لذلك القاطع يمنع تراكم أداة عالقة على كل الخيوط.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .registry import ToolFailure
+
+DEFAULT_TIMEOUT = 20.0  # للأدوات التي لم تُعلن مهلتها
+DEFAULT_ACKNOWLEDGEMENT = "لحظة من فضلك..."
+
+
+class ToolCancelled(Exception):
+    """أُلغي انتظار الأداة بأمر جديد من المستخدم"""
+
+
+class CircuitBreaker:
+    """عداد الإخفاقات المتتالية لكل أداة: مفتوح = تُتخطى الأداة حتى انتهاء فترة التهدئة"""
+
+    def __init__(self, failure_threshold=3, reset_seconds=120):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = {}
+        self._opened_at = {}
+        self._lock = threading.Lock()
+
+    def allow(self, name):
+        """هل يمكن تشغيل الأداة؟ بعد فترة التهدئة تُسمح محاولة واحدة (half-open)"""
+        with self._lock:
+            opened_at = self._opened_at.get(name)
+            if opened_at is None:
+                return True
+            if time.monotonic() - opened_at < self.reset_seconds:
+                return False
+            self._opened_at[name] = time.monotonic()  # محاولة واحدة ثم انتظار فترة أخرى إذا فشلت
+            return True
+
+    def record_success(self, name):
+        with self._lock:
+            self._failures.pop(name, None)
+            if self._opened_at.pop(name, None) is not None:
+                print(f"🔌 عادت الأداة {name} للعمل")
+
+    def record_failure(self, name):
+        with self._lock:
+            self._failures[name] = self._failures.get(name, 0) + 1
+            if self._failures[name] >= self.failure_threshold and name not in self._opened_at:
+                self._opened_at[name] = time.monotonic()
+                print(f"🔌 إيقاف الأداة {name} مؤقتاً بعد {self._failures[name]} إخفاقات متتالية")
+
+    def open_tools(self):
+        with self._lock:
+            return sorted(self._opened_at)
+
+
+class ToolCall:
+    """استدعاء أداة واحد على مجموعة الخيوط"""
+
+    __slots__ = ('name', 'entry', 'future', 'deadline', 'session', 'done', 'cancelled')
+
+    def __init__(self, name, entry, future, deadline, session=None):
+        self.name = name
+        self.entry = entry
+        self.future = future
+        self.deadline = deadline
+        self.session = session  # من طلب الأداة (اتصال أو جلسة في وضع الخدمة، None للميكروفون)
+        self.done = threading.Event()
+        self.cancelled = False
+
+
+class ToolRunner:
+    """مجموعة خيوط محدودة للأدوات مع مهلة لكل أداة ورد فوري وإلغاء وقواطع دائرة"""
+
+    def __init__(self, tools, max_workers=4, default_timeout=DEFAULT_TIMEOUT, ack_after=2.0, breaker=None):
+        self.tools = tools  # سجل الأدوات (يدعم entry(name))
+        self.default_timeout = default_timeout
+        self.ack_after = ack_after
+        self.breaker = breaker or CircuitBreaker()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="adam-tool")
+        self._active = set()
+        self._lock = threading.Lock()
+        self.timeouts = 0
+
+    def _timeout(self, entry):
+        return entry.timeout if entry is not None and entry.timeout else self.default_timeout
+
+    def _invoke(self, name, args):
+        # الاستيراد الكسول للأداة يحدث هنا أيضاً (خارج الخيط الرئيسي)
+        return self.tools[name].invoke(args)
+
+    def submit(self, name, args, session=None):
+        """بدء الأداة في الخلفية - أو None إذا كان قاطعها مفتوحاً"""
+        if not self.breaker.allow(name):
+            return None
+        entry = self.tools.entry(name) if hasattr(self.tools, "entry") else None
+        future = self.executor.submit(self._invoke, name, args)
+        call = ToolCall(name, entry, future, time.monotonic() + self._timeout(entry), session)
+        future.add_done_callback(lambda _: call.done.set())
+        with self._lock:
+            self._active.add(call)
+        return call
+
+    def wait(self, call, on_acknowledge=None):
+        """انتظار النتيجة حتى مهلة الأداة - ترفع ToolCancelled إذا أُلغي الأمر"""
+        try:
+            # عبارة الانتظار بعد ack_after لكل الأدوات: النطق يؤخر النتيجة، والأداة السريعة لا تحتاج "لحظة"
+            acknowledgement = call.entry.acknowledgement if call.entry is not None else None
+            if not call.done.wait(self.ack_after) and not call.cancelled:
+                self._acknowledge(on_acknowledge, acknowledgement or DEFAULT_ACKNOWLEDGEMENT)
+            call.done.wait(max(0.0, call.deadline - time.monotonic()))
+
+            if call.cancelled:
+                raise ToolCancelled(call.name)
+            if not call.future.done():
+                self.timeouts += 1
+                self.breaker.record_failure(call.name)
+                print(f"⏱️ تجاوزت الأداة {call.name} مهلتها ({self._timeout(call.entry):.0f} ثانية)")
+                return ToolFailure(f"❌ لم تكتمل {call.name} في الوقت المحدد، حاول مرة أخرى لاحقاً")
+
+            try:
+                result = call.future.result()
+            except Exception:
+                self.breaker.record_failure(call.name)
+                raise
+            if isinstance(result, ToolFailure):
+                self.breaker.record_failure(call.name)
+            else:
+                self.breaker.record_success(call.name)
+            return result
+        finally:
+            with self._lock:
+                self._active.discard(call)
+
+    def run(self, name, args, on_acknowledge=None, session=None):
+        """تشغيل أداة واحدة وانتظار نتيجتها"""
+        call = self.submit(name, args, session)
+        if call is None:
+            return self.unavailable(name)
+        return self.wait(call, on_acknowledge)
+
+    @staticmethod
+    def unavailable(name):
+        """الرد عندما يكون قاطع الأداة مفتوحاً"""
+        return ToolFailure(f"❌ الأداة {name} متوقفة مؤقتاً بعد أخطاء متكررة، حاول لاحقاً")
+
+    def cancel(self, session=None):
+        """إلغاء الاستدعاءات المنتظرة للجلسة (الأمر الجديد يحل محل القديم) - كلها إذا كانت session=None"""
+        with self._lock:
+            calls = [call for call in self._active if session is None or call.session == session]
+            self._active.difference_update(calls)
+        for call in calls:
+            call.cancelled = True
+            call.future.cancel()  # ينجح فقط إذا لم تبدأ الأداة بعد
+            call.done.set()
+        return len(calls)
+
+    @staticmethod
+    def _acknowledge(on_acknowledge, text):
+        if on_acknowledge is None:
+            return
+        try:
+            on_acknowledge(text)
+        except Exception as e:
+            print(f"⚠️ خطأ في عبارة الانتظار: {e}")
+
+    def shutdown(self):
+        self.cancel()
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,138 @@
+# tools/vad.py
+
+"""
+كشف النشاط الصوتي (VAD) لتحديد نهاية الكلام إطاراً بإطار
+
+يجمع بين الطاقة مقارنة بأرضية ضوضاء متكيفة والسمات الطيفية (التسطح الطيفي
+ونسبة طاقة نطاق الكلام 300-3400 Hz)، محسوبة دفعة واحدة لكل الإطارات بـ NumPy.
+مدة الصمت التي تنهي المقطع (hangover) تتكيف مع وقفات المتحدث داخل الجملة.
+"""
+
+import collections
+
+import numpy as np
+
+FRAME_MS = 20
+
+
+class SpectralVAD:
+    """نقطة نهاية الكلام بالطاقة والسمات الطيفية مع hangover متكيف"""
+
+    def __init__(self, recognizer=None, snr_db=6.0, flatness_threshold=0.45, band_ratio_threshold=0.6,
+                 min_hangover=0.25, max_hangover=0.8, initial_hangover=0.8, noise_adaptation=0.05, min_pauses=8):
+        self.recognizer = recognizer  # لمشاركة أرضية الضوضاء مع energy_threshold
+        self.snr_db = snr_db
+        self.flatness_threshold = flatness_threshold
+        self.band_ratio_threshold = band_ratio_threshold
+        self.min_hangover = min_hangover
+        self.max_hangover = max_hangover
+        self.hangover = min(initial_hangover, max_hangover)
+        self.noise_adaptation = noise_adaptation
+        self.min_pauses = min_pauses  # عدد الوقفات قبل تقصير hangover عن القيمة الابتدائية
+
+        self.sample_rate = 16000
+        self.noise_db = None
+        self._pauses = collections.deque(maxlen=30)
+        self._clock = 0.0
+        self._in_speech = False
+        self._gap = 0.0
+        self._ended_at = None
+        self._band = None
+
+    def prepare(self, sample_rate):
+        """تهيئة حسب معدل عينات الميكروفون"""
+        self.sample_rate = sample_rate
+        frame_len = sample_rate * FRAME_MS // 1000
+        freqs = np.fft.rfftfreq(frame_len, 1.0 / sample_rate)
+        self._window = np.hanning(frame_len).astype(np.float32)
+        self._frame_len = frame_len
+        self._speech_band = (freqs >= 300) & (freqs <= 3400)
+        self._band = (freqs >= 100) & (freqs <= 4000)
+
+        if self.noise_db is None and self.recognizer is not None:
+            # البدء من ملف الضوضاء المحفوظ (energy_threshold = RMS الضوضاء × dynamic_energy_ratio)
+            noise_rms = self.recognizer.energy_threshold / self.recognizer.dynamic_energy_ratio / 32768
+            self.noise_db = 20 * np.log10(max(noise_rms, 1e-6))
+
+    def frame_features(self, samples):
+        """سمات كل إطار: الطاقة (dB)، التسطح الطيفي ونسبة نطاق الكلام"""
+        n_frames = max(1, len(samples) // self._frame_len)
+        samples = samples[:n_frames * self._frame_len]
+        if len(samples) < self._frame_len:
+            samples = np.pad(samples, (0, self._frame_len - len(samples)))
+        frames = samples.reshape(n_frames, self._frame_len) * self._window
+
+        power = np.abs(np.fft.rfft(frames, axis=1)) ** 2 + 1e-12
+        energy_db = 10 * np.log10(power.mean(axis=1))
+        band = power[:, self._band]
+        flatness = np.exp(np.log(band).mean(axis=1)) / band.mean(axis=1)
+        band_ratio = power[:, self._speech_band].sum(axis=1) / power.sum(axis=1)
+        return energy_db, flatness, band_ratio
+
+    def is_speech(self, chunk, seconds):
+        if self._band is None:
+            self.prepare(self.sample_rate)
+
+        samples = np.frombuffer(chunk, dtype=np.int16).astype(np.float32) / 32768
+        energy_db, flatness, band_ratio = self.frame_features(samples)
+
+        if self.noise_db is None:
+            self.noise_db = float(energy_db.min())
+
+        voiced = (energy_db > self.noise_db + self.snr_db) & (
+            (flatness < self.flatness_threshold) | (band_ratio > self.band_ratio_threshold))
+        speech = bool(voiced.mean() >= 0.5)
+
+        if not speech:
+            self._adapt_noise(float(np.median(energy_db)), seconds)
+
+        self._track_pauses(speech, seconds)
+        self._clock += seconds
+        return speech
+
+    def _adapt_noise(self, level_db, seconds):
+        """تتبع أرضية الضوضاء: تنزل بسرعة وتصعد ببطء، ولا تتأثر بأطراف الكلام الخافتة"""
+        if level_db < self.noise_db:
+            rate = min(1.0, 5 * self.noise_adaptation * seconds / 0.1)
+        elif level_db < self.noise_db + self.snr_db:
+            rate = min(1.0, self.noise_adaptation * seconds / 0.1)
+        else:
+            return
+        self.noise_db += rate * (level_db - self.noise_db)
+        if self.recognizer is not None:
+            noise_rms = 10 ** (self.noise_db / 20) * 32768
+            self.recognizer.energy_threshold = noise_rms * self.recognizer.dynamic_energy_ratio
+
+    def _track_pauses(self, speech, seconds):
+        """تعلم طول وقفات المتحدث داخل الجملة لضبط hangover"""
+        if speech:
+            if self._in_speech and self._gap > 0:
+                self._learn_pause(self._gap)
+            elif not self._in_speech and self._ended_at is not None:
+                # عاد الكلام بعد إنهاء المقطع بقليل: كانت وقفة داخل الجملة وقطعناها مبكراً
+                gap = self._clock - self._ended_at
+                if gap < self.max_hangover * 2:
+                    self._learn_pause(gap)
+                self._ended_at = None
+            self._in_speech = True
+            self._gap = 0.0
+        elif self._in_speech:
+            self._gap += seconds
+
+    def _learn_pause(self, pause):
+        # الوقفات الطويلة داخل الجملة هي التي تسبب القص - نعتمد على المئين 90 لآخر الوقفات
+        self._pauses.append(pause)
+        if len(self._pauses) < self.min_pauses:
+            return
+        longest = float(np.percentile(self._pauses, 90))
+        self.hangover = float(np.clip(longest + 0.15, self.min_hangover, self.max_hangover))
+
+    def end_silence_seconds(self):
+        """مدة الصمت التي تنهي المقطع (متكيفة مع المتحدث)"""
+        return self.hangover
+
+    def reset(self):
+        """نهاية مقطع"""
+        self._in_speech = False
+        self._gap = 0.0
+        self._ended_at = self._clock - self.hangover  # بداية الصمت الذي أنهى المقطع
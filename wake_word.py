@@ -0,0 +1,261 @@
+# tools/wake_word.py
+
+"""
+رصد كلمة التفعيل محلياً (بدون إنترنت)
+
+يعتمد على مطابقة قوالب MFCC مسجلة من صوت المستخدم باستخدام DTW جزئي
+(subsequence DTW) على نافذة متحركة من إطارات الميكروفون الخام.
+لا يُرسل أي صوت للتعرف على الكلام إلا بعد رصد كلمة التفعيل.
+
+الاستخدام من سطر الأوامر:
+    python -m tools.wake_word enroll wake_word.npz sample1.wav sample2.wav sample3.wav
+    python -m tools.wake_word test wake_word.npz recording.wav ...
+"""
+
+import sys
+import wave
+from functools import lru_cache
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+FRAME_MS = 25
+HOP_MS = 10
+N_FFT = 512
+N_MELS = 26
+N_MFCC = 13
+DEFAULT_THRESHOLD = 3.0
+STRETCH_PENALTY = 1.0  # تكلفة إضافية لتمطيط القالب على إطار واحد
+
+
+def load_wav(path):
+    """قراءة ملف WAV (PCM) وإرجاع إشارة أحادية float32 في [-1, 1] ومعدل العينات"""
+    with wave.open(str(path), 'rb') as wav:
+        rate = wav.getframerate()
+        channels = wav.getnchannels()
+        width = wav.getsampwidth()
+        raw = wav.readframes(wav.getnframes())
+    return pcm_to_float(raw, width, channels), rate
+
+
+def pcm_to_float(raw, sample_width=2, channels=1):
+    """تحويل بايتات PCM إلى float32 أحادي القناة"""
+    dtypes = {1: np.uint8, 2: np.int16, 4: np.int32}
+    data = np.frombuffer(raw, dtype=dtypes[sample_width]).astype(np.float32)
+    if sample_width == 1:
+        data = (data - 128.0) / 128.0
+    else:
+        data /= float(2 ** (8 * sample_width - 1))
+    if channels > 1:
+        data = data[:len(data) - len(data) % channels].reshape(-1, channels).mean(axis=1)
+    return data
+
+
+def resample(signal, rate, target_rate=SAMPLE_RATE):
+    """إعادة أخذ العينات بالاستيفاء الخطي"""
+    if rate == target_rate or len(signal) == 0:
+        return signal
+    duration = len(signal) / rate
+    target_len = int(round(duration * target_rate))
+    positions = np.linspace(0, len(signal) - 1, target_len)
+    return np.interp(positions, np.arange(len(signal)), signal).astype(np.float32)
+
+
+@lru_cache(maxsize=4)
+def _mel_filterbank(rate, n_fft, n_mels):
+    def hz_to_mel(hz):
+        return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+    def mel_to_hz(mel):
+        return 700.0 * (10 ** (mel / 2595.0) - 1.0)
+
+    mel_points = np.linspace(hz_to_mel(0), hz_to_mel(rate / 2), n_mels + 2)
+    bins = np.floor((n_fft + 1) * mel_to_hz(mel_points) / rate).astype(int)
+
+    bank = np.zeros((n_mels, n_fft // 2 + 1), dtype=np.float32)
+    for m in range(1, n_mels + 1):
+        left, center, right = bins[m - 1], bins[m], bins[m + 1]
+        if center > left:
+            bank[m - 1, left:center] = (np.arange(left, center) - left) / (center - left)
+        if right > center:
+            bank[m - 1, center:right] = (right - np.arange(center, right)) / (right - center)
+    return bank
+
+
+@lru_cache(maxsize=4)
+def _dct_matrix(n_mels, n_mfcc):
+    n = np.arange(n_mels)
+    k = np.arange(n_mfcc)[:, None]
+    matrix = np.cos(np.pi * k * (2 * n + 1) / (2 * n_mels)) * np.sqrt(2.0 / n_mels)
+    matrix[0] /= np.sqrt(2.0)
+    return matrix.astype(np.float32)
+
+
+def frame_signal(signal, frame_len, hop):
+    """تقطيع الإشارة إلى إطارات متداخلة (بدون حلقات)"""
+    if len(signal) < frame_len:
+        signal = np.pad(signal, (0, frame_len - len(signal)))
+    n_frames = 1 + (len(signal) - frame_len) // hop
+    index = np.arange(frame_len)[None, :] + hop * np.arange(n_frames)[:, None]
+    return signal[index]
+
+
+def mfcc(signal, rate=SAMPLE_RATE):
+    """حساب معاملات MFCC (بدون c0 حتى لا تتأثر بمستوى الصوت)"""
+    frame_len = rate * FRAME_MS // 1000
+    hop = rate * HOP_MS // 1000
+
+    emphasized = np.append(signal[:1], signal[1:] - 0.97 * signal[:-1])
+    frames = frame_signal(emphasized, frame_len, hop) * np.hamming(frame_len).astype(np.float32)
+    power = np.abs(np.fft.rfft(frames, N_FFT)) ** 2 / N_FFT
+    mel = power @ _mel_filterbank(rate, N_FFT, N_MELS).T
+    # أرضية نسبية (50 dB) حتى لا تهيمن النطاقات الصامتة تماماً على المسافة
+    log_mel = np.log(np.maximum(mel, mel.max() * 1e-5 + 1e-10))
+    return (log_mel @ _dct_matrix(N_MELS, N_MFCC).T)[:, 1:]
+
+
+def trim_silence(signal, rate=SAMPLE_RATE, ratio=0.1):
+    """إزالة الصمت من بداية ونهاية التسجيل"""
+    hop = rate * HOP_MS // 1000
+    rms = np.sqrt((frame_signal(signal, hop, hop) ** 2).mean(axis=1))
+    voiced = np.nonzero(rms > rms.max() * ratio)[0]
+    if len(voiced) == 0:
+        return signal
+    return signal[voiced[0] * hop:(voiced[-1] + 1) * hop]
+
+
+def subsequence_dtw(template, window):
+    """أقل مسافة DTW للقالب داخل أي جزء من النافذة، مطبّعة بطول القالب
+
+    الخطوات المسموحة لكل إطار من القالب: تقدم إطار أو إطارين في النافذة،
+    أو البقاء على نفس الإطار مع تكلفة STRETCH_PENALTY. هذا يسمح بحساب كل صف
+    من مصفوفة التراكم دفعة واحدة باستخدام NumPy.
+    """
+    cost = np.sqrt(((template[:, None, :] - window[None, :, :]) ** 2).sum(axis=-1))
+    acc = cost[0].copy()
+    for i in range(1, len(template)):
+        best = acc + STRETCH_PENALTY
+        best[1:] = np.minimum(best[1:], acc[:-1])
+        best[2:] = np.minimum(best[2:], acc[:-2])
+        acc = cost[i] + best
+    return float(acc.min()) / len(template)
+
+
+class WakeWordDetector:
+    """رصد كلمة التفعيل على دفق PCM من الميكروفون"""
+
+    def __init__(self, templates, threshold=DEFAULT_THRESHOLD, energy_threshold=None, hop_seconds=0.1):
+        self.templates = [np.asarray(t, dtype=np.float32) for t in templates]
+        self.threshold = threshold
+        self.energy_threshold = energy_threshold  # بنفس وحدات recognizer.energy_threshold (RMS لعينات int16)
+        self.hop_seconds = hop_seconds
+
+        longest = max(len(t) for t in self.templates)
+        self.window_seconds = 2.0 * longest * HOP_MS / 1000
+        self.reset()
+
+    def reset(self):
+        """تفريغ النافذة المتحركة"""
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._since_check = 0.0
+        self.last_score = None
+
+    # ------------------------------------------------------------------
+    # التسجيل والحفظ
+
+    @classmethod
+    def enroll(cls, signals, threshold=None):
+        """إنشاء كاشف من تسجيلات المستخدم: قائمة من (الإشارة، معدل العينات)"""
+        templates = [mfcc(trim_silence(resample(signal, rate))) for signal, rate in signals]
+        if not templates:
+            raise ValueError("يلزم تسجيل واحد على الأقل لكلمة التفعيل")
+
+        if threshold is None:
+            threshold = DEFAULT_THRESHOLD
+            if len(templates) > 1:
+                # العتبة من أسوأ تطابق بين تسجيلات المستخدم نفسها مع هامش
+                pairwise = [subsequence_dtw(a, b) for i, a in enumerate(templates)
+                            for j, b in enumerate(templates) if i != j]
+                threshold = max(pairwise) * 1.2
+        return cls(templates, threshold)
+
+    @classmethod
+    def enroll_wav(cls, paths, threshold=None):
+        """إنشاء كاشف من ملفات WAV"""
+        return cls.enroll([load_wav(path) for path in paths], threshold)
+
+    def save(self, path):
+        arrays = {f"template_{i}": t for i, t in enumerate(self.templates)}
+        np.savez(path, threshold=self.threshold, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            names = sorted((k for k in data.files if k.startswith("template_")), key=lambda k: int(k.split("_")[1]))
+            return cls([data[k] for k in names], float(data["threshold"]))
+
+    # ------------------------------------------------------------------
+    # الرصد
+
+    def score(self, signal, rate=SAMPLE_RATE):
+        """أفضل مسافة بين النافذة وقوالب كلمة التفعيل (أقل = أقرب)"""
+        features = mfcc(resample(signal, rate))
+        return min(subsequence_dtw(template, features) for template in self.templates)
+
+    def accept(self, chunk, rate=SAMPLE_RATE, sample_width=2):
+        """إضافة إطارات PCM (بايتات أو مصفوفة float) وإرجاع True عند رصد كلمة التفعيل"""
+        samples = pcm_to_float(chunk, sample_width) if isinstance(chunk, (bytes, bytearray)) else chunk
+        window_len = int(self.window_seconds * rate)
+        self._buffer = np.concatenate([self._buffer, samples])[-window_len:]
+        self._since_check += len(samples) / rate
+
+        if self._since_check < self.hop_seconds or len(self._buffer) < window_len // 2:
+            return False
+        self._since_check = 0.0
+
+        # بوابة طاقة رخيصة: لا حاجة لـ DTW أثناء الصمت
+        if self.energy_threshold is not None:
+            rms = float(np.sqrt(np.mean(self._buffer ** 2))) * 32768
+            peak = float(np.abs(self._buffer).max()) * 32768
+            if rms < self.energy_threshold and peak < self.energy_threshold * 3:
+                return False
+
+        score = self.score(self._buffer, rate)
+        if score <= self.threshold:
+            self.reset()
+            self.last_score = score  # تبقى مسافة الرصد بعد تفريغ النافذة
+            return True
+        self.last_score = score
+        return False
+
+    def detect_in_wav(self, path, chunk_seconds=0.05):
+        """تشغيل ملف WAV كدفق ميكروفون (للاختبار بدون شبكة)"""
+        signal, rate = load_wav(path)
+        self.reset()
+        step = max(1, int(rate * chunk_seconds))
+        for start in range(0, len(signal), step):
+            if self.accept(signal[start:start + step], rate):
+                return True
+        return False
+
+
+def _main(argv):
+    if len(argv) < 3 or argv[0] not in ("enroll", "test"):
+        print(__doc__)
+        return 1
+
+    action, model_path, wav_paths = argv[0], argv[1], argv[2:]
+    if action == "enroll":
+        detector = WakeWordDetector.enroll_wav(wav_paths)
+        detector.save(model_path)
+        print(f"✅ تم حفظ نموذج كلمة التفعيل ({len(detector.templates)} قوالب، العتبة {detector.threshold:.2f}): {model_path}")
+    else:
+        detector = WakeWordDetector.load(model_path)
+        for path in wav_paths:
+            detected = detector.detect_in_wav(path)
+            print(f"{'🎉' if detected else '—'} {path} (آخر مسافة: {detector.last_score})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main(sys.argv[1:]))
@@ -7,6 +7,8 @@ import urllib.parse
 import json
 import time
 
+from .registry import ToolFailure
+
 
 class WebSearcher:
     def __init__(self):
@@ -96,7 +98,7 @@ class WebSearcher:
 
         except Exception as e:
             print(f"خطأ في استخراج محتوى الموقع {url}: {e}")
-            return f"لم أتمكن من الوصول إلى محتوى الموقع: {str(e)}"
+            return ToolFailure(f"لم أتمكن من الوصول إلى محتوى الموقع: {str(e)}")
 
 
 # إنشاء مثيل من فئة البحث
@@ -110,7 +112,7 @@ def search_google(query: str, num_results: int = 3) -> str:
         results = web_searcher.google_search(query, num_results)
 
         if not results:
-            return f"لم أجد نتائج للبحث عن: {query}"
+            return ToolFailure(f"لم أجد نتائج للبحث عن: {query}")
 
         response = f"نتائج البحث عن '{query}':\n\n"
 
@@ -123,7 +125,7 @@ def search_google(query: str, num_results: int = 3) -> str:
         return response
 
     except Exception as e:
-        return f"خطأ في البحث: {str(e)}"
+        return ToolFailure(f"خطأ في البحث: {str(e)}")
 
 
 @tool
@@ -134,10 +136,11 @@ def get_website_info(url: str) -> str:
             url = 'https://' + url
 
         content = web_searcher.get_website_content(url)
-        return f"محتوى الموقع {url}:\n\n{content}"
+        response = f"محتوى الموقع {url}:\n\n{content}"
+        return ToolFailure(response) if isinstance(content, ToolFailure) else response
 
     except Exception as e:
-        return f"خطأ في قراءة الموقع: {str(e)}"
+        return ToolFailure(f"خطأ في قراءة الموقع: {str(e)}")
 
 
 @tool
@@ -148,9 +151,10 @@ def search_and_read(query: str, read_first: bool = True) -> str:
         results = web_searcher.google_search(query, 3)
 
         if not results:
-            return f"لم أجد نتائج للبحث عن: {query}"
+            return ToolFailure(f"لم أجد نتائج للبحث عن: {query}")
 
         response = f"بحثت عن '{query}' ووجدت:\n\n"
+        failed = False
 
         if read_first and results:
             # قراءة أول نتيجة
@@ -160,6 +164,7 @@ def search_and_read(query: str, read_first: bool = True) -> str:
 
             content = web_searcher.get_website_content(first_result['link'])
             response += f"المحتوى:\n{content}\n\n"
+            failed = isinstance(content, ToolFailure)
 
             # عرض باقي النتائج
             if len(results) > 1:
@@ -175,10 +180,11 @@ def search_and_read(query: str, read_first: bool = True) -> str:
                     response += f"   {result['snippet']}\n"
                 response += f"   {result['link']}\n\n"
 
-        return response
+        # النتائج مفيدة للمستخدم، لكن المحتوى الناقص لا يُحفظ
+        return ToolFailure(response) if failed else response
 
     except Exception as e:
-        return f"خطأ في البحث والقراءة: {str(e)}"
+        return ToolFailure(f"خطأ في البحث والقراءة: {str(e)}")
 
 
 @tool
@@ -193,7 +199,7 @@ def get_news(topic: str = "أخبار اليوم", language: str = "ar") -> str:
         results = web_searcher.google_search(search_query, 5)
 
         if not results:
-            return f"لم أجد أخباراً حول: {topic}"
+            return ToolFailure(f"لم أجد أخباراً حول: {topic}")
 
         response = f"آخر الأخبار حول '{topic}':\n\n"
 
@@ -206,4 +212,4 @@ def get_news(topic: str = "أخبار اليوم", language: str = "ar") -> str:
         return response
 
     except Exception as e:
-        return f"خطأ في جلب الأخبار: {str(e)}"
\ No newline at end of file
+        return ToolFailure(f"خطأ في جلب الأخبار: {str(e)}")
\ No newline at end of file